@@ -11,12 +11,14 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from apps.events.forms import NewEventForm
 from apps.societies.models import Society, Membership, MembershipRole, MembershipStatus
+from apps.societies.middleware import MANAGING_ROLES, memberships_of
 from django.urls import reverse
 from apps.news.forms import NewsForm
 from apps.news.models import News
 from django.forms import modelformset_factory
 from django.utils import timezone
 from config.filters import EventFilter
+from apps.search.results import load_result_set, page_url, parse_cursor, result_page
 import requests
 from django.http import JsonResponse
 import stripe
@@ -28,32 +30,22 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 
 
 
-def user_can_delete_event(user, event):
-    """Return True if user is superuser or has manager/co_manager/editor role for any society of the event."""
-    if user.is_superuser:
+def user_can_delete_event(request, event):
+    """Return True if the request's user is superuser or has manager/co_manager/editor role for any society of the event."""
+    if request.user.is_superuser:
         return True
 
-    societies = event.society.all()
-    allowed_roles = [MembershipRole.MANAGER, MembershipRole.CO_MANAGER, MembershipRole.EDITOR]
-
-    for soc in societies:
-        membership = Membership.objects.filter(
-            society=soc,
-            user=user,
-            status=MembershipStatus.APPROVED
-        ).first()
-        if membership and membership.role in allowed_roles:
-            return True
-
-    return False
+    return memberships_of(request).has_any_role(event.society.all(), MANAGING_ROLES)
 
 @login_required
 def delete_event(request, event_id):
     """Delete an event if user is manager/co_manager/editor or superuser."""
     event = get_object_or_404(Event, id=event_id)
+    # the membership that lets the user manage one of the hosting societies, if any
+    request.user_membership = memberships_of(request).membership_with_role(event.society.all(), MANAGING_ROLES)
 
     # Check permission
-    if not (request.user.is_superuser or (hasattr(request, 'user_membership') and request.user_membership.role in ['manager', 'co_manager', 'editor'])):
+    if not (request.user.is_superuser or (request.user_membership and request.user_membership.role in MANAGING_ROLES)):
         return redirect('eventspage')
 
     event.delete()
@@ -71,13 +63,15 @@ def eventspage(request):
     else:
         events = Event.objects.all()
 
-    search_type = request.session.get('search_type', None)
-    search_ids = request.session.get('search_ids', [])  
-
-    if search_type == 'events' and search_ids:
-        events = events.filter(id__in=search_ids)
-
     events = EventFilter(request.GET, queryset=events, request=request).qs
+
+    # Search results arrive as a token for the ranking stored by ai_search
+    result_set = load_result_set(request.GET.get("results"), "events")
+    next_url = None
+    if result_set is not None:
+        events, next_after = result_page(events, result_set.ids, parse_cursor(request.GET.get("after")))
+        if next_after is not None:
+            next_url = page_url(request.path, request.GET, result_set.token, next_after)
     news_list = News.objects.filter(is_published=True).order_by('-date_posted')[:10]
 
     page_title = "My Events" if my_events_filter else "All Events"
@@ -86,6 +80,8 @@ def eventspage(request):
         "news_list": news_list, 
         "events": events,
         "page_title": page_title,
+        "results_token": result_set.token if result_set else None,
+        "next_url": next_url,
     })
 
 class EventListAPIView(generics.ListAPIView):
@@ -140,14 +136,7 @@ def create_event(request, society_id):
     """
     society = get_object_or_404(Society, id=society_id)
 
-    membership = Membership.objects.filter(
-        society=society,
-        user=request.user,
-        status=MembershipStatus.APPROVED
-    ).first()
-
-    allowed_roles = [MembershipRole.MANAGER, MembershipRole.CO_MANAGER, MembershipRole.EDITOR]
-    if not (request.user.is_superuser or (membership and membership.role in allowed_roles)):
+    if not (request.user.is_superuser or memberships_of(request).has_role(society, MANAGING_ROLES)):
         messages.error(request, "You do not have permission to create an event.")
         return redirect('society_page', society_id=society.id)
 
@@ -8,6 +8,7 @@ from .forms import NewsForm
 from config.filters import NewsFilter
 from config.constants import SOCIETY_TYPE_CHOICES
 from apps.societies.models import Society, Membership, MembershipRole, MembershipStatus
+from apps.societies.middleware import MANAGING_ROLES, memberships_of
 from django.utils import timezone
 
 def newspage(request):
@@ -95,14 +96,7 @@ def create_news_for_society(request, society_id):
     """Create a news post for a given society."""
     society = get_object_or_404(Society, id=society_id)
 
-    membership = Membership.objects.filter(
-        society=society,
-        user=request.user,
-        status=MembershipStatus.APPROVED
-    ).first()
-
-    allowed_roles = [MembershipRole.MANAGER, MembershipRole.CO_MANAGER, MembershipRole.EDITOR]
-    if not (request.user.is_superuser or (membership and membership.role in allowed_roles)):
+    if not (request.user.is_superuser or memberships_of(request).has_role(society, MANAGING_ROLES)):
         messages.error(request, "You are not authorized to post news for this society.")
         return redirect("society_page", society_id=society.id)
 
@@ -146,11 +140,7 @@ def news_detail(request, news_id):
 
     user_membership = None
     if request.user.is_authenticated:
-        user_membership = Membership.objects.filter(
-            society=news.society,
-            user=request.user,
-            status=MembershipStatus.APPROVED
-        ).first()
+        user_membership = memberships_of(request).approved_membership(news.society_id)
 
     context = {
         "news": news,
@@ -161,8 +151,9 @@ def news_detail(request, news_id):
 @login_required
 def delete_news(request, news_id):
     news_item = get_object_or_404(News, id=news_id)
-    # Example permission check: only allow if the user is a manager, co_manager, editor for the society or is superuser.
-    if not (request.user.is_superuser or (hasattr(request, 'user_membership') and request.user_membership.role in ['manager', 'co_manager', 'editor'])):
+    request.user_membership = memberships_of(request).approved_membership(news_item.society_id)
+    # only allow if the user is a manager, co_manager, editor for the society or is superuser.
+    if not (request.user.is_superuser or (request.user_membership and request.user_membership.role in MANAGING_ROLES)):
         return redirect('news_detail', news_id=news_id)
     news_item.delete()
     return redirect('home')
\ No newline at end of file
@@ -9,6 +9,7 @@ from django.http import HttpResponseForbidden
 from django.utils.timezone import now
 from apps.panels.models import Match, MemberRating, HallOfFame
 from apps.societies.models import Society, Membership, MembershipRole
+from apps.societies.middleware import MANAGING_ROLES, memberships_of
 from django.contrib.auth import get_user_model
 
 
@@ -305,24 +306,16 @@ def toggle_like_comment(request, society_id, comment_id):
 
 User = get_user_model()
 
-def has_society_permission(user, society):
-    if user.is_superuser:
+def has_society_permission(request, society):
+    if request.user.is_superuser:
         return True
-    try:
-        membership = Membership.objects.get(user=user, society=society)
-        return membership.role in [
-            MembershipRole.MANAGER,
-            MembershipRole.CO_MANAGER,
-            MembershipRole.EDITOR
-        ]
-    except Membership.DoesNotExist:
-        return False
+    return memberships_of(request).has_role(society, MANAGING_ROLES)
 
 @login_required
 def record_match(request, society_id):
     society = get_object_or_404(Society, id=society_id)
 
-    if not has_society_permission(request.user, society):
+    if not has_society_permission(request, society):
         return HttpResponseForbidden("You do not have permission.")
 
     members = society.approved_members()
@@ -0,0 +1,168 @@
+'''offline prefix completion of search queries'''
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+from apps.events.models import Event
+from apps.societies.models import Society
+from config.constants import EVENT_TYPE_CHOICES, SOCIETY_TYPE_CHOICES
+from .resources import get_sym_spell, register
+from .versioning import bump_version, get_version
+
+CORPUS_VERSION = "autocomplete_corpus"
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def words(text):
+    return WORD_RE.findall((text or "").lower())
+
+
+class PrefixIndex:
+    """
+    Terms kept in a sorted array so the completions of a prefix are one
+    contiguous slice found with bisect. The best completion of every short
+    prefix is precomputed because those slices are the widest.
+    """
+
+    SHORT_PREFIX_LENGTH = 3
+
+    def __init__(self, counts):
+        self.terms = sorted(counts)
+        self.counts = [counts[term] for term in self.terms]
+        self._known = set(self.terms)
+        self._best_short = {}
+        for position, term in enumerate(self.terms):
+            for length in range(1, min(len(term), self.SHORT_PREFIX_LENGTH) + 1):
+                prefix = term[:length]
+                best = self._best_short.get(prefix)
+                if best is None or self.counts[position] > self.counts[best]:
+                    self._best_short[prefix] = position
+
+    def __contains__(self, term):
+        return term in self._known
+
+    def __len__(self):
+        return len(self.terms)
+
+    def complete(self, prefix):
+        """Most frequent term starting with prefix, or None."""
+        if not prefix:
+            return None
+        if len(prefix) <= self.SHORT_PREFIX_LENGTH:
+            best = self._best_short.get(prefix)
+            return self.terms[best] if best is not None else None
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        if start == end:
+            return None
+        best = max(range(start, end), key=self.counts.__getitem__)
+        return self.terms[best]
+
+
+def object_terms(kind, obj):
+    """Completion terms contributed by one society or event: its words and its full name."""
+    if kind == "society":
+        if obj.status != "approved":
+            return []
+        texts = [obj.name, obj.society_type]
+    else:
+        texts = [obj.name, obj.keyword, obj.event_type]
+    terms = [word for text in texts for word in words(text)]
+    name = " ".join(words(obj.name))
+    return terms + [name] if " " in name else terms
+
+
+class CorpusIndex:
+    """
+    Completion terms taken from live societies and events. Signals apply
+    changes to this process's copy and bump a shared version so other
+    workers reload theirs on their next lookup.
+    """
+
+    def __init__(self):
+        self.terms = {}
+        self.version = None
+        self._words = None
+        self._phrases = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        terms = {}
+        for society in Society.objects.filter(status="approved").only("id", "name", "society_type", "status"):
+            terms[("society", society.id)] = object_terms("society", society)
+        for event in Event.objects.only("id", "name", "keyword", "event_type"):
+            terms[("event", event.id)] = object_terms("event", event)
+        self.terms = terms
+
+    def _build(self):
+        counts = Counter(words(" ".join(label for choices in (SOCIETY_TYPE_CHOICES, EVENT_TYPE_CHOICES)
+                                        for _, label in choices)))
+        for entry in self.terms.values():
+            counts.update(entry)
+        self._words = PrefixIndex({term: count for term, count in counts.items() if " " not in term})
+        self._phrases = PrefixIndex({term: count for term, count in counts.items() if " " in term})
+
+    def current(self):
+        """(word index, phrase index) for the current corpus version."""
+        version = get_version(CORPUS_VERSION)
+        with self._lock:
+            if version != self.version:
+                self._load()
+                self.version = version
+                self._words = None
+            if self._words is None:
+                self._build()
+            return self._words, self._phrases
+
+    def _apply(self, key, terms):
+        with self._lock:
+            if self.version is not None and self.terms.get(key, []) == terms:
+                return
+            previous = self.version
+            version = bump_version(CORPUS_VERSION)
+            if previous is None or version != previous + 1:
+                # another worker changed the corpus too; reload it all on next lookup
+                self.version = None
+                return
+            if terms:
+                self.terms[key] = terms
+            else:
+                self.terms.pop(key, None)
+            self.version = version
+            self._words = None
+
+    def update(self, kind, obj):
+        self._apply((kind, obj.pk), object_terms(kind, obj))
+
+    def remove(self, kind, object_id):
+        self._apply((kind, object_id), [])
+
+
+corpus_index = CorpusIndex()
+
+dictionary_index = register("dictionary_prefix_index", lambda: PrefixIndex(get_sym_spell().words))
+
+
+def complete_query(query):
+    """
+    Complete the last word of the query, preferring society and event
+    vocabulary over the English dictionary. Words that are already
+    complete are left alone.
+    """
+    tokens = query.split()
+    if not tokens:
+        return query
+    last = tokens[-1]
+    corpus_words, corpus_phrases = corpus_index.current()
+    dictionary = dictionary_index.get()
+    if last in corpus_words or last in dictionary:
+        return query
+    if len(tokens) > 1:
+        phrase = corpus_phrases.complete(" ".join(tokens))
+        if phrase:
+            return phrase
+    completion = corpus_words.complete(last) or dictionary.complete(last)
+    if completion is None:
+        return query
+    return " ".join(tokens[:-1] + [completion])
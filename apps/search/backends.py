@@ -0,0 +1,92 @@
+'''embedding backends: how query and description text is turned into vectors'''
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .resources import get_model
+
+
+class EmbeddingBackend:
+    """
+    Turns texts into L2-normalised float32 vectors, one row per text.
+    `key` identifies the vector space; it is stored with every embedding
+    so vectors from different backends are never compared.
+    """
+
+    name = None
+
+    @property
+    def key(self):
+        return self.name
+
+    def encode(self, texts):
+        raise NotImplementedError
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """
+    The MiniLM sentence transformer: best matches, but needs torch (~1 GB per
+    worker). SEARCH_INFERENCE_PRECISION="int8" runs it quantized on the CPU;
+    its vectors stay close enough to be compared with float32 ones.
+    """
+
+    name = "minilm"
+
+    @property
+    def key(self):
+        return f"{self.name}:{getattr(settings, 'SEARCH_MODEL_NAME', 'all-MiniLM-L6-v2')}"
+
+    def encode(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = get_model().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Hashed character n-grams (scikit-learn's HashingVectorizer). Nothing is
+    trained or downloaded and torch is never imported, so it suits small
+    instances; matches are lexical rather than by meaning.
+    """
+
+    name = "hashing"
+
+    def __init__(self, n_features=None):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.n_features = n_features or getattr(settings, "SEARCH_HASHING_FEATURES", 512)
+        self.vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            analyzer="char_wb",
+            ngram_range=(3, 4),
+            alternate_sign=False,
+            norm="l2",
+        )
+
+    @property
+    def key(self):
+        return f"{self.name}:{self.n_features}"
+
+    def encode(self, texts):
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.empty((0, self.n_features), dtype=np.float32)
+        return self.vectorizer.transform(texts).astype(np.float32).toarray()
+
+
+BACKENDS = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    HashingBackend.name: HashingBackend,
+}
+
+
+def load_backend(name=None):
+    """The backend named by settings.SEARCH_EMBEDDING_BACKEND (or `name`)."""
+    name = name or getattr(settings, "SEARCH_EMBEDDING_BACKEND", SentenceTransformerBackend.name)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown SEARCH_EMBEDDING_BACKEND {name!r}; choose one of {', '.join(sorted(BACKENDS))}."
+        )
@@ -0,0 +1,136 @@
+'''micro-batching of query encodings from concurrent requests'''
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from .index import encode_texts
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Query encodings are queued and a single worker thread runs them
+    together: it takes the first waiting text, collects the texts of the
+    other encode calls already under way, waiting up to `max_wait` seconds
+    for them (up to `max_batch_size` texts), and encodes the lot in one
+    call. A lone request, the only kind a sync gunicorn worker serves, is
+    encoded straight away. Requests block until their vector is ready.
+    """
+
+    def __init__(self, encode=encode_texts, max_batch_size=None, max_wait=None):
+        self.encode_batch = encode
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        # encode calls whose text the worker has not taken off the queue yet
+        self._incoming = 0
+        self._worker = None
+        self._pid = os.getpid()
+        self.batch_sizes = Counter()
+
+    @property
+    def max_batch_size(self):
+        if self._max_batch_size is not None:
+            return self._max_batch_size
+        return getattr(settings, "SEARCH_BATCH_MAX_SIZE", 32)
+
+    @property
+    def max_wait(self):
+        if self._max_wait is not None:
+            return self._max_wait
+        return getattr(settings, "SEARCH_BATCH_MAX_WAIT_MS", 5) / 1000
+
+    def _ensure_worker(self):
+        # threads do not survive a fork, so a preloaded gunicorn worker starts its own
+        if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._incoming = 0
+                self._pid = os.getpid()
+                self._worker = None
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="search-embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def encode(self, text):
+        """Vector for one text, encoded together with other waiting texts."""
+        if self.max_batch_size <= 1:
+            return self.encode_batch([text])[0]
+        self._ensure_worker()
+        future = Future()
+        with self._lock:
+            self._incoming += 1
+        self._queue.put((text, future))
+        return future.result()
+
+    def _take(self, timeout=None):
+        item = self._queue.get(timeout=timeout)
+        with self._lock:
+            self._incoming -= 1
+        return item
+
+    def _collect(self):
+        batch = [self._take()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            with self._lock:
+                others = self._incoming
+            remaining = deadline - time.monotonic()
+            # only wait for texts that other encode calls are about to queue
+            if not others or remaining <= 0:
+                break
+            try:
+                batch.append(self._take(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.encode_batch(texts)
+                if len(vectors) != len(batch):
+                    raise RuntimeError(f"Encoded {len(vectors)} vectors for {len(batch)} queries")
+            except Exception as error:
+                logger.exception("Could not encode a batch of %d queries", len(batch))
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            with self._lock:
+                self.batch_sizes[len(batch)] += 1
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self):
+        with self._lock:
+            batches = sum(self.batch_sizes.values())
+            encoded = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": batches,
+                "encoded": encoded,
+                "mean_batch_size": encoded / batches if batches else 0.0,
+                "largest_batch": max(self.batch_sizes, default=0),
+                "batch_sizes": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+                "config": {"max_batch_size": self.max_batch_size, "max_wait": self.max_wait},
+            }
+
+
+batcher = EmbeddingBatcher()
+
+
+def encode_query(text):
+    """Embedding of a search query, batched with concurrent requests."""
+    return batcher.encode(text)
@@ -0,0 +1,136 @@
+'''cache of ranked search results, invalidated whenever searchable rows change'''
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .versioning import get_version
+
+RESULTS_VERSION = "search_results"
+# Lookup counters, kept in the shared cache so every worker adds to the same totals
+HITS_KEY = "search:results:hits"
+MISSES_KEY = "search:results:misses"
+
+
+def normalize_query(query):
+    return " ".join((query or "").lower().split())
+
+
+class SearchResultCache:
+    """
+    Ranked result IDs per (normalized query, search type). Every key
+    includes the current results version, so bumping the version (on any
+    Society/Event/News change) retires all cached results at once.
+    Hits and misses are counted in each process and added to totals in the
+    shared cache every SEARCH_CACHE_STATS_FLUSH_EVERY lookups and whenever
+    the stats are read, so a lookup does not write to the cache.
+    """
+
+    def __init__(self):
+        self._unflushed = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        return getattr(settings, "SEARCH_RESULTS_CACHE_TIMEOUT", 600)
+
+    def key(self, query, search_type):
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"search:results:{get_version(RESULTS_VERSION)}:{search_type}:{digest}"
+
+    def _count(self, key):
+        with self._lock:
+            self._unflushed[key] += 1
+            due = sum(self._unflushed.values()) >= getattr(settings, "SEARCH_CACHE_STATS_FLUSH_EVERY", 100)
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add this process's hits and misses since the last flush to the shared totals."""
+        with self._lock:
+            counts, self._unflushed = self._unflushed, Counter()
+        for key, count in counts.items():
+            cache.add(key, 0, timeout=None)
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                # evicted between the add and the incr
+                cache.add(key, count, timeout=None)
+
+    @property
+    def hits(self):
+        self.flush_stats()
+        return cache.get(HITS_KEY, 0)
+
+    @property
+    def misses(self):
+        self.flush_stats()
+        return cache.get(MISSES_KEY, 0)
+
+    def get(self, query, search_type):
+        """Cached (ids, suggestion) or None, counting the hit or miss."""
+        entry = cache.get(self.key(query, search_type))
+        self._count(MISSES_KEY if entry is None else HITS_KEY)
+        return entry
+
+    def set(self, query, search_type, ids, suggestion):
+        cache.set(self.key(query, search_type), (ids, suggestion), self.timeout)
+
+    def stats(self):
+        """
+        Hits, misses and hit rate of every worker since the counters were last
+        cleared; other workers' latest lookups count once they next flush.
+        """
+        self.flush_stats()
+        counts = cache.get_many([HITS_KEY, MISSES_KEY])
+        hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "version": get_version(RESULTS_VERSION),
+            "timeout": self.timeout,
+        }
+
+
+result_cache = SearchResultCache()
+
+
+def cached_search(query, search_type, search, model):
+    """
+    Run search(query) through the result cache. Returns the ranked model
+    instances, the suggestion, and whether the cache was hit.
+    """
+    entry = result_cache.get(query, search_type)
+    if entry is None:
+        results, suggestion = search(query)
+        result_cache.set(query, search_type, [obj.id for obj in results], suggestion)
+        return results, suggestion, False
+
+    ids, suggestion = entry
+    objects = model.objects.in_bulk(ids)
+    return [objects[object_id] for object_id in ids if object_id in objects], suggestion, True
+
+
+def cached_grouped_search(query, search_type, search, models):
+    """
+    cached_search for a search returning ({group: results}, suggestion),
+    with `models` mapping each group to its model.
+    """
+    entry = result_cache.get(query, search_type)
+    if entry is None:
+        groups, suggestion = search(query)
+        result_cache.set(query, search_type, {
+            group: [obj.id for obj in results] for group, results in groups.items()
+        }, suggestion)
+        return groups, suggestion, False
+
+    ids, suggestion = entry
+    groups = {}
+    for group, group_ids in ids.items():
+        objects = models[group].objects.in_bulk(group_ids)
+        groups[group] = [objects[object_id] for object_id in group_ids if object_id in objects]
+    return groups, suggestion, True
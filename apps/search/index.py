@@ -0,0 +1,241 @@
+'''stored text embeddings used to rank search results'''
+import hashlib
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+from apps.events.models import Event
+from apps.news.models import News
+from apps.societies.models import Society
+from .ivf import IVFIndex, top_k
+from .models import SearchEmbedding
+from .resources import get_backend
+from .versioning import bump_version, get_version
+
+SEARCHABLE_MODELS = {
+    "society": Society,
+    "event": Event,
+    "news": News,
+}
+
+# Field holding the text that is embedded for each kind
+TEXT_FIELDS = {
+    "society": "description",
+    "event": "description",
+    "news": "content",
+}
+
+# numpy dtypes description vectors can be stored and held in memory as
+VECTOR_DTYPES = ("float16", "float32")
+ENCODE_BATCH_SIZE = 64
+# Candidates fetched from the nearest-neighbour search before filtering
+NEAREST_K = 50
+
+
+def text_hash(text):
+    """Fingerprint of the text an embedding was computed from."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+def object_text(kind, obj):
+    return getattr(obj, TEXT_FIELDS[kind])
+
+
+def encode_texts(texts):
+    """Encode texts into L2-normalised float32 vectors (one row per text)."""
+    return get_backend().encode(list(texts))
+
+
+def vector_dtype():
+    """dtype description vectors are stored and held in memory as (settings.SEARCH_VECTOR_DTYPE)."""
+    dtype = getattr(settings, "SEARCH_VECTOR_DTYPE", "float16")
+    if dtype not in VECTOR_DTYPES:
+        raise ImproperlyConfigured(
+            f"Unknown SEARCH_VECTOR_DTYPE {dtype!r}; choose one of {', '.join(VECTOR_DTYPES)}."
+        )
+    return dtype
+
+
+def stored_embeddings(kind):
+    """Embeddings of this kind made by the current backend."""
+    return SearchEmbedding.objects.filter(backend=get_backend().key, kind=kind)
+
+
+def _version_name(kind):
+    return f"embeddings:{kind}"
+
+
+def embeddings_changed(kind):
+    """
+    Tell every worker to reload its matrix of this kind, once the current
+    transaction (if any) has committed the embeddings that changed.
+    """
+    transaction.on_commit(lambda: bump_version(_version_name(kind)))
+
+
+def forget_objects(kind, object_ids):
+    """Delete the stored embeddings of these objects; returns how many there were."""
+    deleted, _ = SearchEmbedding.objects.filter(kind=kind, object_id__in=list(object_ids)).delete()
+    if deleted:
+        embeddings_changed(kind)
+    return deleted
+
+
+def index_objects(kind, objects, batch_size=ENCODE_BATCH_SIZE):
+    """Encode the text of the given objects and store their embeddings."""
+    objects = list(objects)
+    backend = get_backend().key
+    dtype = vector_dtype()
+    stored = 0
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start:start + batch_size]
+        vectors = encode_texts([object_text(kind, obj) for obj in batch])
+        stored_embeddings(kind).filter(object_id__in=[obj.id for obj in batch]).delete()
+        SearchEmbedding.objects.bulk_create([
+            SearchEmbedding(
+                backend=backend,
+                kind=kind,
+                object_id=obj.id,
+                text_hash=text_hash(object_text(kind, obj)),
+                vector=vector.astype(dtype).tobytes(),
+                dtype=dtype,
+            )
+            for obj, vector in zip(batch, vectors)
+        ])
+        stored += len(batch)
+    if stored:
+        embeddings_changed(kind)
+    return stored
+
+
+def index_missing(kind):
+    """
+    Embed every object of this kind that has no stored embedding yet, such
+    as rows added with bulk_create, which sends no post_save. Run by
+    rebuild_search_index and warm_caches, never on a search.
+    """
+    model = SEARCHABLE_MODELS[kind]
+    indexed_ids = stored_embeddings(kind).values("object_id")
+    missing = model.objects.exclude(id__in=indexed_ids).only("id", TEXT_FIELDS[kind])
+    return index_objects(kind, missing)
+
+
+def rebuild(kind):
+    """Drop and re-embed every object of this kind."""
+    stored_embeddings(kind).delete()
+    embeddings_changed(kind)
+    return index_missing(kind)
+
+
+class EmbeddingIndex:
+    """
+    In-memory matrix of the stored embeddings for one kind of object.
+    The matrix is reloaded only when the kind's version, shared by every
+    worker through the cache and bumped whenever its embeddings are
+    written, has moved; checking it costs one cache read. Above
+    SEARCH_IVF_MIN_ROWS rows, nearest-neighbour lookups go through an IVF
+    index instead of scoring every row, and the matrix is held in
+    SEARCH_VECTOR_DTYPE.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.positions = {}
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.ivf = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _stamp_now(self):
+        return get_backend().key, vector_dtype(), get_version(_version_name(self.kind))
+
+    def refresh(self):
+        """Reload the matrix if the stored embeddings changed since it was loaded."""
+        stamp = self._stamp_now()
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            rows = stored_embeddings(self.kind).values_list("object_id", "vector", "dtype")
+            positions = {}
+            vectors = []
+            for object_id, vector, stored_dtype in rows:
+                positions[object_id] = len(vectors)
+                vectors.append(np.frombuffer(vector, dtype=stored_dtype))
+            use_ivf = len(vectors) >= getattr(settings, "SEARCH_IVF_MIN_ROWS", 5000)
+            # A float16 matrix takes half the memory, but every row scored is first cast to
+            # float32; only the IVF, which scores a few lists per query, keeps it that way.
+            dtype = vector_dtype() if use_ivf else np.float32
+            matrix = np.vstack(vectors).astype(dtype, copy=False) if vectors else np.empty((0, 0), dtype=dtype)
+            ivf = None
+            if use_ivf:
+                ivf = self.ivf.reuse(matrix) if self.ivf is not None else IVFIndex(matrix)
+            self.matrix, self.ivf = matrix, ivf
+            self.ids = np.fromiter(positions, dtype=np.int64, count=len(positions))
+            self.positions = positions
+            self._stamp = stamp
+
+    def scores(self, query_vector, object_ids):
+        """Cosine similarity between the query and each object, in the given order."""
+        object_ids = list(object_ids)
+        matrix, positions = self.matrix, self.positions
+        rows = [positions.get(object_id, -1) for object_id in object_ids]
+        result = np.full(len(object_ids), -1.0, dtype=np.float32)
+        known = [i for i, row in enumerate(rows) if row >= 0]
+        if known:
+            result[known] = matrix[[rows[i] for i in known]] @ np.asarray(query_vector, dtype=np.float32)
+        return result
+
+    def search(self, query_vector, k):
+        """IDs and cosine scores of the k objects nearest to the query, nearest first."""
+        ids, matrix, ivf = self.ids, self.matrix, self.ivf
+        if not len(ids):
+            return [], []
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if ivf is None:
+            scores = matrix @ query_vector
+            rows = top_k(scores, k)
+            scores = scores[rows]
+        else:
+            rows, scores = ivf.search(query_vector, k, getattr(settings, "SEARCH_IVF_PROBES", 8))
+        return ids[rows].tolist(), scores.tolist()
+
+    def rank(self, query_vector, objects):
+        """Sort objects by how well their text matches the query."""
+        objects = list(objects)
+        scores = self.scores(query_vector, [obj.id for obj in objects])
+        order = np.argsort(-scores, kind="stable")
+        return [objects[i] for i in order]
+
+
+_indexes = {kind: EmbeddingIndex(kind) for kind in SEARCHABLE_MODELS}
+
+
+def get_index(kind):
+    """Return the process-wide index for this kind, reloaded if its embeddings changed."""
+    index = _indexes[kind]
+    index.refresh()
+    return index
+
+
+def nearest(kind, query_vector, queryset, k=NEAREST_K, min_score=None):
+    """
+    Up to k objects from queryset whose text is nearest to the query,
+    nearest first. The queryset's filters (status, visibility...) are
+    applied to the index's candidates afterwards; more candidates are
+    fetched while too many of them are filtered out.
+    """
+    index = get_index(kind)
+    fetch = k
+    while True:
+        ids, scores = index.search(query_vector, fetch)
+        if min_score is not None:
+            ids = [object_id for object_id, score in zip(ids, scores) if score >= min_score]
+        objects = queryset.in_bulk(ids)
+        found = [objects[object_id] for object_id in ids if object_id in objects]
+        if len(found) >= k or len(ids) < fetch or fetch >= len(index.ids):
+            return found[:k]
+        fetch *= 4
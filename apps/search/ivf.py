@@ -0,0 +1,89 @@
+'''inverted-file (IVF) index for approximate top-k cosine search over NumPy vectors'''
+import numpy as np
+
+# Rows collected per centroid when training on a sample of the matrix
+TRAINING_ROWS_PER_LIST = 32
+TRAINING_ITERATIONS = 10
+ASSIGN_CHUNK_ROWS = 8192
+
+
+def top_k(scores, k):
+    """Positions of the k highest scores, best first (ties keep their order)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+def train_centroids(matrix, n_lists, seed=0):
+    """Spherical k-means on a sample of the (normalised) rows."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(matrix), n_lists * TRAINING_ROWS_PER_LIST)
+    # a float16 matrix is trained in float32 (numpy has no fast float16 matmul)
+    sample = np.asarray(matrix[rng.choice(len(matrix), sample_size, replace=False)], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(TRAINING_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        # an empty list keeps its previous centroid
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return centroids
+
+
+def assign_lists(matrix, centroids):
+    """Row numbers of the matrix grouped by their nearest centroid."""
+    assignment = np.concatenate([
+        np.argmax(matrix[start:start + ASSIGN_CHUNK_ROWS] @ centroids.T, axis=1)
+        for start in range(0, len(matrix), ASSIGN_CHUNK_ROWS)
+    ])
+    order = np.argsort(assignment, kind="stable")
+    counts = np.bincount(assignment, minlength=len(centroids))
+    return np.split(order, np.cumsum(counts)[:-1])
+
+
+class IVFIndex:
+    """
+    Rows are grouped around about sqrt(n) centroids. A query scores only
+    the rows of its `n_probe` nearest groups (more if those hold fewer
+    than k rows), so a lookup touches a small fraction of the matrix.
+    Results are approximate: a close row in an unprobed group is missed.
+    """
+
+    def __init__(self, matrix, centroids=None, n_lists=None):
+        self.matrix = matrix
+        if centroids is None:
+            n_lists = n_lists or max(int(np.sqrt(len(matrix))), 1)
+            centroids = train_centroids(matrix, min(n_lists, len(matrix)))
+        self.centroids = centroids
+        self.trained_rows = len(matrix)
+        self.lists = assign_lists(matrix, centroids)
+
+    def reuse(self, matrix):
+        """Index for a changed matrix, reusing these centroids while its size stays comparable."""
+        if (matrix.shape[1] != self.centroids.shape[1]
+                or not self.trained_rows / 2 <= len(matrix) <= self.trained_rows * 2):
+            return IVFIndex(matrix)
+        index = IVFIndex(matrix, self.centroids)
+        index.trained_rows = self.trained_rows
+        return index
+
+    def search(self, query_vector, k, n_probe):
+        """(row numbers, scores) of the best k rows among the probed lists, best first."""
+        probes = top_k(self.centroids @ query_vector, len(self.centroids))
+        rows = []
+        found = 0
+        for probed, centroid in enumerate(probes):
+            if probed >= n_probe and found >= k:
+                break
+            rows.append(self.lists[centroid])
+            found += len(self.lists[centroid])
+        rows = np.concatenate(rows)
+        scores = self.matrix[rows] @ query_vector
+        best = top_k(scores, k)
+        return rows[best], scores[best]
@@ -0,0 +1,157 @@
+'''full-text search over societies, events and news with SQLite FTS5 and BM25 ranking'''
+from django.db import connection
+
+from apps.events.models import Event
+from apps.news.models import News
+from apps.societies.models import Society
+from .autocomplete import words
+
+FTS_TABLE = "search_fts"
+
+# Each FTS row's rowid packs the object id with its kind: rowid = id * ROWID_STRIDE + code.
+# Lookups and trigger deletes then go through the rowid instead of scanning a column.
+ROWID_STRIDE = 4
+KIND_CODES = {
+    "society": 1,
+    "event": 2,
+    "news": 3,
+}
+
+# SELECT producing (rowid, name, body) for every row of a kind; also used by the triggers
+SOURCES = {
+    "society": (
+        "societies_society",
+        "{row}.id * 4 + 1, {row}.name, coalesce({row}.description, '') || ' ' || "
+        "coalesce({row}.society_type, '') || ' ' || coalesce({row}.location, '')",
+    ),
+    "event": (
+        "events_event",
+        "{row}.id * 4 + 2, {row}.name, coalesce({row}.description, '') || ' ' || "
+        "coalesce({row}.keyword, '') || ' ' || coalesce({row}.location, '')",
+    ),
+    "news": (
+        "news_news",
+        "{row}.id * 4 + 3, {row}.title, coalesce({row}.content, '')",
+    ),
+}
+
+# Columns whose updates re-index a row
+WATCHED_COLUMNS = {
+    "society": "name, description, society_type, location",
+    "event": "name, description, keyword, location",
+    "news": "title, content",
+}
+
+# Name matches count ten times as much as matches in the rest of the text
+NAME_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# Used where FTS5 is not available (databases other than SQLite)
+FALLBACK_FIELDS = {
+    "society": (Society, "name"),
+    "event": (Event, "name"),
+    "news": (News, "title"),
+}
+
+
+def fts_available():
+    return connection.vendor == "sqlite"
+
+
+def match_expression(query):
+    """
+    FTS5 query matching any of the words, the last one as a prefix since
+    it may still be being typed. None if the query has no words.
+    """
+    terms = [f'"{term}"' for term in words(query)]
+    if not terms:
+        return None
+    terms[-1] += "*"
+    return " OR ".join(terms)
+
+
+def lexical_search(query, kind, limit=100, queryset=None):
+    """
+    IDs of objects of this kind whose text matches the query, best BM25
+    score first. With a queryset only its rows count, filtered before the
+    limit so that matches it excludes do not crowd out the ones it keeps.
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    if not fts_available():
+        model, field = FALLBACK_FIELDS[kind]
+        rows = model.objects.all() if queryset is None else queryset
+        return list(rows.filter(**{f"{field}__icontains": query.strip()}).values_list("id", flat=True)[:limit])
+    condition, condition_params = "", ()
+    if queryset is not None:
+        subquery, condition_params = queryset.values("id").query.sql_with_params()
+        condition = f"AND rowid / {ROWID_STRIDE} IN ({subquery}) "
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid / {ROWID_STRIDE} FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid %% {ROWID_STRIDE} = %s {condition}"
+            f"ORDER BY bm25({FTS_TABLE}, %s, %s) LIMIT %s",
+            [expression, KIND_CODES[kind], *condition_params, NAME_WEIGHT, BODY_WEIGHT, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def fts_table_exists(using=connection):
+    return FTS_TABLE in using.introspection.table_names()
+
+
+def ensure_fts_triggers(using=connection):
+    """
+    Create any missing trigger keeping the FTS table in step with its source
+    tables. SQLite drops a table's triggers when a migration rebuilds it (most
+    AlterField/RemoveField do), so this runs after every migrate as well as
+    from rebuild_lexical. Returns the number of triggers checked.
+    """
+    if using.vendor != "sqlite" or not fts_table_exists(using):
+        return 0
+    with using.cursor() as cursor:
+        for kind, (table, columns) in SOURCES.items():
+            rowid = f"old.id * {ROWID_STRIDE} + {KIND_CODES[kind]}"
+            insert = f"INSERT INTO {FTS_TABLE}(rowid, name, body) SELECT {columns.format(row='new')};"
+            delete = f"DELETE FROM {FTS_TABLE} WHERE rowid = {rowid};"
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{kind}_insert AFTER INSERT ON {table} "
+                f"BEGIN {insert} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{kind}_update "
+                f"AFTER UPDATE OF {WATCHED_COLUMNS[kind]} ON {table} BEGIN {delete} {insert} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{kind}_delete AFTER DELETE ON {table} "
+                f"BEGIN {delete} END"
+            )
+    return len(SOURCES) * 3
+
+
+def rebuild_lexical():
+    """Refill the FTS table from scratch (the triggers keep it in sync afterwards)."""
+    if not fts_available():
+        return 0
+    ensure_fts_triggers()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        for table, columns in SOURCES.values():
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, name, body) SELECT {columns.format(row=table)} FROM {table}"
+            )
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def fuse_rankings(*rankings, k=60):
+    """
+    Reciprocal rank fusion: merge several ranked ID lists into one, an ID
+    scoring 1 / (k + rank) in every list it appears in.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, object_id in enumerate(ranking, start=1):
+            scores[object_id] = scores.get(object_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda object_id: -scores[object_id])
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.search.index import SEARCHABLE_MODELS, TEXT_FIELDS, object_text
+from apps.search.precision import compare_precision, load_model, model_encoder
+
+DEFAULT_KINDS = ["event", "society"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the search results of the quantized (int8 model, float16 vectors) path "
+        "with the float32 one on a fixed set of queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=sorted(SEARCHABLE_MODELS),
+            action="append",
+            help="Only check this kind of object (can be repeated).",
+        )
+        parser.add_argument("--k", type=int, default=10, help="Results compared per query.")
+        parser.add_argument(
+            "--min-overlap",
+            type=float,
+            default=0.8,
+            help="Fail when the mean top-k overlap of a kind falls below this.",
+        )
+
+    def handle(self, *args, **options):
+        reference = model_encoder(load_model("float32"))
+        candidate = model_encoder(load_model("int8"))
+        failed = []
+        for kind in options["kind"] or DEFAULT_KINDS:
+            objects = SEARCHABLE_MODELS[kind].objects.only("id", TEXT_FIELDS[kind])
+            texts = [object_text(kind, obj) or "" for obj in objects]
+            if not texts:
+                self.stdout.write(f"No {kind} text to compare.")
+                continue
+            result = compare_precision(texts, reference, candidate, k=options["k"])
+            self.stdout.write(
+                f"{kind}: top-{result['k']} overlap {result['mean_overlap']:.2f} "
+                f"(worst {result['min_overlap']:.2f}) over {result['documents']} descriptions; "
+                f"query encode {result['reference_seconds_per_query'] * 1000:.1f} ms float32, "
+                f"{result['candidate_seconds_per_query'] * 1000:.1f} ms int8"
+            )
+            if result["mean_overlap"] < options["min_overlap"]:
+                failed.append(kind)
+        if failed:
+            raise CommandError(
+                f"Top-{options['k']} overlap below {options['min_overlap']} for: {', '.join(failed)}."
+            )
+        self.stdout.write(self.style.SUCCESS("Quantized search results match the float32 ones."))
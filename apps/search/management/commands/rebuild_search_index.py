@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.index import SEARCHABLE_MODELS, index_missing, rebuild
+from apps.search.lexical import rebuild_lexical
+
+
+class Command(BaseCommand):
+    help = "Re-embed the society, event and news text used by the AI search."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=sorted(SEARCHABLE_MODELS),
+            action="append",
+            help="Only rebuild this kind of object (can be repeated).",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only embed objects that have no stored embedding yet.",
+        )
+        parser.add_argument(
+            "--lexical",
+            action="store_true",
+            help="Also refill the full-text index (it is normally kept in sync by database triggers).",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kind"] or sorted(SEARCHABLE_MODELS)
+        for kind in kinds:
+            if options["missing_only"]:
+                count = index_missing(kind)
+            else:
+                count = rebuild(kind)
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind} description(s)."))
+        if options["lexical"]:
+            count = rebuild_lexical()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} row(s) for full-text search."))
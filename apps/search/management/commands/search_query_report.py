@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Max, Q
+from django.db.models.functions import Lower
+from django.utils.timezone import now
+
+from apps.search.models import SearchQueryLog
+
+
+class Command(BaseCommand):
+    help = "Report the most frequent and the zero-result searches from the search query log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help="Only report searches from the last N days.")
+        parser.add_argument("--limit", type=int, default=10, help="Queries listed per section.")
+        parser.add_argument(
+            "--search-type",
+            help="Only report searches of this type (societies, events or all).",
+        )
+
+    def handle(self, *args, **options):
+        logs = SearchQueryLog.objects.filter(created_at__gte=now() - timedelta(days=options["days"]))
+        if options["search_type"]:
+            logs = logs.filter(search_type=options["search_type"])
+
+        totals = logs.aggregate(
+            searches=Count("id"),
+            cache_hits=Count("id", filter=Q(cache_hit=True)),
+            empty=Count("id", filter=Q(result_count=0)),
+            mean_ms=Avg("duration_ms"),
+        )
+        if not totals["searches"]:
+            self.stdout.write(f"No searches logged in the last {options['days']} day(s).")
+            return
+        self.stdout.write(
+            f"{totals['searches']} searches in the last {options['days']} day(s): "
+            f"{totals['cache_hits'] / totals['searches']:.0%} served from the cache, "
+            f"{totals['empty']} with no results, {totals['mean_ms']:.1f} ms on average."
+        )
+
+        # queries differing only in case are the same search (the result cache ignores case too)
+        grouped = logs.annotate(normalized=Lower("query")).values("normalized")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nTop queries"))
+        for row in grouped.annotate(
+            searches=Count("id"),
+            results=Avg("result_count"),
+            mean_ms=Avg("duration_ms"),
+            cache_hits=Count("id", filter=Q(cache_hit=True)),
+        ).order_by("-searches", "normalized")[:options["limit"]]:
+            self.stdout.write(
+                f"  {row['searches']:6d}  {row['normalized']!r}  {row['results']:.1f} results, "
+                f"{row['mean_ms']:.1f} ms, {row['cache_hits'] / row['searches']:.0%} cached"
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nZero-result queries"))
+        empty = grouped.filter(result_count=0).annotate(
+            searches=Count("id"), corrected=Max("corrected_query"), last=Max("created_at"),
+        ).order_by("-searches", "normalized")[:options["limit"]]
+        if not empty:
+            self.stdout.write("  none")
+        for row in empty:
+            self.stdout.write(
+                f"  {row['searches']:6d}  {row['normalized']!r} (searched as {row['corrected']!r}), "
+                f"last {row['last']:%Y-%m-%d %H:%M}"
+            )
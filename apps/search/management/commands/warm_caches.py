@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.warming import DEFAULT_QUERY_COUNT, DEFAULT_QUERY_DAYS, PHASES, warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Warm the search caches after a deploy: load the model and description indexes, "
+        "work out the top societies and replay the most frequent recent searches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--phase",
+            choices=list(PHASES),
+            action="append",
+            help="Only run this phase (can be repeated). All phases run by default.",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=DEFAULT_QUERY_COUNT,
+            help="Number of popular searches to replay.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=DEFAULT_QUERY_DAYS,
+            help="Pick the popular searches from the last N days of the search log.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0.0
+        for phase, seconds, summary in warm_caches(options["phase"], options["queries"], options["days"]):
+            total += seconds
+            self.stdout.write(f"{phase:<14} {seconds:7.2f}s  {summary}")
+        self.stdout.write(self.style.SUCCESS(f"Caches warmed in {total:.2f}s."))
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+FTS_TABLE = "search_fts"
+
+# table -> (trigger name, columns watched on update, SELECT list of (rowid, name, body) for a row)
+SOURCES = {
+    "societies_society": (
+        "society",
+        "name, description, society_type, location",
+        "{row}.id * 4 + 1, {row}.name, coalesce({row}.description, '') || ' ' || "
+        "coalesce({row}.society_type, '') || ' ' || coalesce({row}.location, '')",
+        "{row}.id * 4 + 1",
+    ),
+    "events_event": (
+        "event",
+        "name, description, keyword, location",
+        "{row}.id * 4 + 2, {row}.name, coalesce({row}.description, '') || ' ' || "
+        "coalesce({row}.keyword, '') || ' ' || coalesce({row}.location, '')",
+        "{row}.id * 4 + 2",
+    ),
+    "news_news": (
+        "news",
+        "title, content",
+        "{row}.id * 4 + 3, {row}.title, coalesce({row}.content, '')",
+        "{row}.id * 4 + 3",
+    ),
+}
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    execute = schema_editor.execute
+    execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(name, body, tokenize = 'porter unicode61')"
+    )
+    for table, (kind, watched, columns, rowid) in SOURCES.items():
+        insert = f"INSERT INTO {FTS_TABLE}(rowid, name, body) SELECT {columns.format(row='new')};"
+        delete = f"DELETE FROM {FTS_TABLE} WHERE rowid = {rowid.format(row='old')};"
+        execute(f"CREATE TRIGGER {FTS_TABLE}_{kind}_insert AFTER INSERT ON {table} BEGIN {insert} END")
+        execute(
+            f"CREATE TRIGGER {FTS_TABLE}_{kind}_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+        execute(f"CREATE TRIGGER {FTS_TABLE}_{kind}_delete AFTER DELETE ON {table} BEGIN {delete} END")
+        execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, body) SELECT {columns.format(row=table)} FROM {table}"
+        )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for kind, *_ in SOURCES.values():
+        for action in ("insert", "update", "delete"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{kind}_{action}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('societies', '0002_initial'),
+        ('events', '0003_initial'),
+        ('news', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
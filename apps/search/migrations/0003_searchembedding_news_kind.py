@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_fts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchembedding',
+            name='kind',
+            field=models.CharField(choices=[('society', 'Society'), ('event', 'Event'), ('news', 'News')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_searchembedding_news_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchembedding',
+            name='backend',
+            # every embedding stored so far was made by the MiniLM model
+            field=models.CharField(default='minilm:all-MiniLM-L6-v2', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchembedding',
+            unique_together={('backend', 'kind', 'object_id')},
+        ),
+    ]
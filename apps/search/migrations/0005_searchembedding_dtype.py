@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_searchembedding_backend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchembedding',
+            name='dtype',
+            # every vector stored so far is float32
+            field=models.CharField(default='float32', max_length=10),
+        ),
+    ]
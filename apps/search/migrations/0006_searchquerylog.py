@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0005_searchembedding_dtype'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255)),
+                ('corrected_query', models.CharField(blank=True, max_length=255)),
+                ('search_type', models.CharField(max_length=20)),
+                ('result_count', models.PositiveIntegerField()),
+                ('cache_hit', models.BooleanField(default=False)),
+                ('duration_ms', models.FloatField()),
+                ('timings', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import models
+
+
+class SearchEmbedding(models.Model):
+    """
+    Stored sentence embedding of one searchable object's text,
+    so searches only have to encode the query.
+    """
+
+    KIND_CHOICES = [
+        ('society', 'Society'),
+        ('event', 'Event'),
+        ('news', 'News'),
+    ]
+
+    # key of the embedding backend that produced the vector (apps/search/backends.py)
+    backend = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    # sha1 of the embedded text, used to skip re-encoding unchanged rows
+    text_hash = models.CharField(max_length=40)
+    # normalised vector, stored as raw bytes of this numpy dtype
+    vector = models.BinaryField()
+    dtype = models.CharField(max_length=10, default='float32')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('backend', 'kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} embedding"
+
+
+class SearchQueryLog(models.Model):
+    """One search made through ai_search or the unified search, for analytics."""
+
+    query = models.CharField(max_length=255)
+    # the spell-corrected, autocompleted query the results were ranked for
+    corrected_query = models.CharField(max_length=255, blank=True)
+    search_type = models.CharField(max_length=20)
+    result_count = models.PositiveIntegerField()
+    cache_hit = models.BooleanField(default=False)
+    duration_ms = models.FloatField()
+    # milliseconds spent in each stage of the search (spell, autocomplete, encode, rank)
+    timings = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.search_type} search for {self.query!r}"
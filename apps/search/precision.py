@@ -0,0 +1,105 @@
+'''reduced-precision query encoding, and a check of how much it changes search results'''
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .ivf import top_k
+
+# "float32" runs the model as trained; "int8" quantizes its linear layers for CPU inference
+PRECISIONS = ("float32", "int8")
+
+# Fixed queries the precision check compares results for
+REFERENCE_QUERIES = [
+    "chess club",
+    "football training",
+    "live music night",
+    "coding hackathon",
+    "volunteering in the community",
+    "photography walk",
+    "debate competition",
+    "dance classes for beginners",
+    "board games social",
+    "careers fair",
+    "language exchange",
+    "hiking trip",
+    "film screening",
+    "charity bake sale",
+    "robotics workshop",
+    "poetry reading",
+]
+
+
+def inference_precision():
+    """The precision selected by settings.SEARCH_INFERENCE_PRECISION."""
+    precision = getattr(settings, "SEARCH_INFERENCE_PRECISION", "float32")
+    if precision not in PRECISIONS:
+        raise ImproperlyConfigured(
+            f"Unknown SEARCH_INFERENCE_PRECISION {precision!r}; choose one of {', '.join(PRECISIONS)}."
+        )
+    return precision
+
+
+def quantize_model(model):
+    """Replace the model's linear layers with dynamically quantized int8 ones, in place."""
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_model(precision=None):
+    """The SentenceTransformer named by settings.SEARCH_MODEL_NAME, at the given precision."""
+    precision = precision or inference_precision()
+    if precision not in PRECISIONS:
+        raise ImproperlyConfigured(f"Unknown precision {precision!r}; choose one of {', '.join(PRECISIONS)}.")
+    from sentence_transformers import SentenceTransformer
+    # quantized kernels only exist for the CPU
+    model = SentenceTransformer(
+        getattr(settings, "SEARCH_MODEL_NAME", "all-MiniLM-L6-v2"),
+        device="cpu" if precision == "int8" else None,
+    )
+    return quantize_model(model) if precision == "int8" else model
+
+
+def model_encoder(model):
+    """encode(texts) for a SentenceTransformer, as the MiniLM backend calls it."""
+    def encode(texts):
+        vectors = model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+    return encode
+
+
+def encode_queries(encode, queries):
+    """Query vectors encoded one at a time (as searches do), and the mean seconds per query."""
+    start = time.perf_counter()
+    vectors = np.vstack([encode([query]) for query in queries])
+    return vectors, (time.perf_counter() - start) / len(queries)
+
+
+def compare_precision(texts, reference_encode, candidate_encode, queries=REFERENCE_QUERIES,
+                      k=10, dtype="float16"):
+    """
+    Top-k overlap between the full-precision path (float32 vectors from
+    reference_encode) and the reduced one (vectors from candidate_encode,
+    stored as `dtype`) for each query, with the per-query encode time of each.
+    """
+    texts = list(texts)
+    reference_documents = np.asarray(reference_encode(texts), dtype=np.float32)
+    candidate_documents = np.asarray(candidate_encode(texts), dtype=dtype)
+    reference_queries, reference_seconds = encode_queries(reference_encode, queries)
+    candidate_queries, candidate_seconds = encode_queries(candidate_encode, queries)
+
+    overlaps = {}
+    for query, reference_query, candidate_query in zip(queries, reference_queries, candidate_queries):
+        expected = top_k(reference_documents @ reference_query, k)
+        found = top_k(candidate_documents @ candidate_query.astype(np.float32), k)
+        overlaps[query] = len(set(expected.tolist()) & set(found.tolist())) / max(len(expected), 1)
+    return {
+        "k": k,
+        "documents": len(texts),
+        "mean_overlap": float(np.mean(list(overlaps.values()))) if overlaps else 1.0,
+        "min_overlap": min(overlaps.values(), default=1.0),
+        "overlaps": overlaps,
+        "reference_seconds_per_query": reference_seconds,
+        "candidate_seconds_per_query": candidate_seconds,
+    }
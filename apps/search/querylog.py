@@ -0,0 +1,117 @@
+'''search analytics: every search is recorded in memory and written to the table in batches'''
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils.timezone import now
+
+from .models import SearchQueryLog
+
+logger = logging.getLogger(__name__)
+
+_current = threading.local()
+
+
+@contextmanager
+def collect_stages():
+    """Collect the stage timings (in ms) of the search run on this thread inside the block."""
+    _current.timings = timings = {}
+    try:
+        yield timings
+    finally:
+        _current.timings = None
+
+
+@contextmanager
+def stage(name):
+    """Time one stage of a search, if stage timings are being collected."""
+    timings = getattr(_current, "timings", None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+class QueryLogBuffer:
+    """
+    Search records kept in memory and written with one bulk_create once
+    SEARCH_QUERY_LOG_FLUSH_SIZE of them are waiting or the oldest is
+    SEARCH_QUERY_LOG_FLUSH_SECONDS old. The check runs when a request has
+    finished, after its response was sent, so searches never wait on it.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._oldest = None
+        self._lock = threading.Lock()
+
+    @property
+    def flush_size(self):
+        return getattr(settings, "SEARCH_QUERY_LOG_FLUSH_SIZE", 50)
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, "SEARCH_QUERY_LOG_FLUSH_SECONDS", 30)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        with self._lock:
+            if not self._entries:
+                self._oldest = time.monotonic()
+            self._entries.append(entry)
+
+    def due(self):
+        with self._lock:
+            return bool(self._entries) and (
+                len(self._entries) >= self.flush_size
+                or time.monotonic() - self._oldest >= self.flush_seconds
+            )
+
+    def flush(self):
+        """Write every waiting record; returns how many were written."""
+        with self._lock:
+            entries, self._entries = self._entries, []
+        if not entries:
+            return 0
+        try:
+            SearchQueryLog.objects.bulk_create(entries)
+        except DatabaseError:
+            # analytics are best effort: a failed batch is dropped, searches carry on
+            logger.exception("Could not write %d search log records", len(entries))
+            return 0
+        return len(entries)
+
+    def clear(self):
+        """Drop every waiting record."""
+        with self._lock:
+            self._entries = []
+
+    def flush_if_due(self):
+        return self.flush() if self.due() else 0
+
+
+query_log = QueryLogBuffer()
+
+
+def record_search(query, corrected_query, search_type, result_count, cache_hit, duration_ms, timings):
+    """Buffer one search for the analytics table. Empty queries are not recorded."""
+    if not (query or "").strip():
+        return
+    max_length = SearchQueryLog._meta.get_field("query").max_length
+    query_log.add(SearchQueryLog(
+        query=query[:max_length],
+        corrected_query=(corrected_query or "")[:max_length],
+        search_type=search_type,
+        result_count=result_count,
+        cache_hit=cache_hit,
+        duration_ms=duration_ms,
+        timings={name: round(ms, 3) for name, ms in timings.items()},
+        created_at=now(),
+    ))
@@ -0,0 +1,109 @@
+'''heavy search resources, loaded on first use and shared by the whole process'''
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LazyResource:
+    """A value that is built by `loader` the first time it is needed."""
+
+    def __init__(self, name, loader, warm=True):
+        self.name = name
+        self.loader = loader
+        # whether warm_up() loads it; a callable is asked at warm-up time
+        self.warm = warm
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    @property
+    def wanted(self):
+        return self.warm() if callable(self.warm) else self.warm
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    logger.info("Loading search resource %r", self.name)
+                    self._value = self.loader()
+                    self._loaded = True
+        return self._value
+
+    def reset(self):
+        """Forget the loaded value so the next get() loads it again."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+
+
+_registry = {}
+
+
+def register(name, loader, warm=True):
+    resource = LazyResource(name, loader, warm)
+    _registry[name] = resource
+    return resource
+
+
+def get_resource(name):
+    return _registry[name]
+
+
+def warm_up(names=None):
+    """
+    Load resources ahead of the first request. With `gunicorn --preload`
+    this runs in the master, so forked workers share the loaded pages.
+    """
+    for name in names or [name for name, resource in _registry.items() if resource.wanted]:
+        _registry[name].get()
+
+
+def _load_model():
+    from .precision import load_model
+    return load_model()
+
+
+def _load_sym_spell():
+    from symspellpy import SymSpell
+    sym_spell = SymSpell(max_dictionary_edit_distance=2)
+    sym_spell.load_dictionary(
+        str(settings.BASE_DIR / "frequency_dictionary_en.txt"), term_index=0, count_index=1
+    )
+    return sym_spell
+
+
+def _load_backend():
+    from .backends import load_backend
+    return load_backend()
+
+
+def _model_in_use():
+    return getattr(settings, "SEARCH_EMBEDDING_BACKEND", "minilm") == "minilm"
+
+
+# the model is only warmed up when the MiniLM backend is selected, so torch is never imported otherwise
+model = register("model", _load_model, warm=_model_in_use)
+sym_spell = register("sym_spell", _load_sym_spell)
+embedding_backend = register("embedding_backend", _load_backend)
+
+
+def get_model():
+    """The SentenceTransformer used for meaning-based matching."""
+    return model.get()
+
+
+def get_sym_spell():
+    """SymSpell loaded with the English frequency dictionary."""
+    return sym_spell.get()
+
+
+def get_backend():
+    """The embedding backend selected by settings.SEARCH_EMBEDDING_BACKEND."""
+    return embedding_backend.get()
@@ -0,0 +1,91 @@
+'''ranked search results kept server-side and referenced by a short token in the URL'''
+import base64
+import hashlib
+import secrets
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import result_cache
+
+KEY_PREFIX = "search:resultset:"
+TOKEN_BYTES = 8
+PAGE_SIZE = 20
+
+ResultSet = namedtuple("ResultSet", ["token", "search_type", "ids", "suggestion"])
+
+
+def _key(token):
+    return KEY_PREFIX + token
+
+
+def _timeout():
+    return getattr(settings, "SEARCH_RESULT_SET_TIMEOUT", 1800)
+
+
+def result_set_token(query, search_type):
+    """
+    Token of a search's result set, derived from its result cache key: every
+    repeat of the search at the same results version shares one stored set.
+    """
+    digest = hashlib.sha1(result_cache.key(query, search_type).encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest[:TOKEN_BYTES]).decode("ascii").rstrip("=")
+
+
+def store_result_set(search_type, ids, suggestion=None, token=None):
+    """
+    Keep the ranked IDs of a search and return the result set with its token.
+    Under a given (derived) token a set already stored is kept as it is, which
+    costs a read instead of a write; without one a new token is made.
+    """
+    ids = list(ids)
+    if token is None:
+        token = secrets.token_urlsafe(TOKEN_BYTES)
+        cache.set(_key(token), (search_type, ids, suggestion), _timeout())
+    else:
+        cache.add(_key(token), (search_type, ids, suggestion), _timeout())
+    return ResultSet(token, search_type, ids, suggestion)
+
+
+def load_result_set(token, search_type):
+    """The result set stored under token for this search type, or None if unknown or expired."""
+    if not token:
+        return None
+    entry = cache.get(_key(token))
+    if entry is None or entry[0] != search_type:
+        return None
+    return ResultSet(token, *entry)
+
+
+def parse_cursor(value):
+    """Rank position to continue from; anything malformed starts at the top."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def result_page(queryset, ids, after=0, page_size=PAGE_SIZE):
+    """
+    One page of queryset rows in stored rank order, starting at rank
+    position `after`. IDs are fetched a page at a time, and IDs the
+    queryset filters out (or that were deleted) are skipped. Returns the
+    rows and the position the next page starts at, or None on the last page.
+    """
+    page = []
+    position = after
+    while position < len(ids) and len(page) < page_size:
+        chunk = ids[position:position + page_size - len(page)]
+        rows = queryset.in_bulk(chunk)
+        page.extend(rows[object_id] for object_id in chunk if object_id in rows)
+        position += len(chunk)
+    return page, position if position < len(ids) else None
+
+
+def page_url(path, params, token, after):
+    """URL of the page starting at `after`, keeping the other query parameters."""
+    query = params.copy()
+    query["results"] = token
+    query["after"] = after
+    return f"{path}?{query.urlencode()}"
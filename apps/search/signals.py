@@ -0,0 +1,104 @@
+import logging
+
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from apps.events.models import Event
+from apps.news.models import News
+from apps.societies.models import Society
+from .autocomplete import corpus_index
+from .cache import RESULTS_VERSION
+from .index import embeddings_changed, forget_objects, index_objects, object_text, text_hash
+from .lexical import ensure_fts_triggers
+from .models import SearchEmbedding
+from .querylog import query_log
+from .versioning import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def _reindex_after_commit(kind, instance):
+    def reindex():
+        try:
+            index_objects(kind, [instance])
+        except Exception:
+            # rebuild_search_index --missing-only or warm_caches fills the gap
+            logger.exception("Could not index %s %s", kind, instance.pk)
+    transaction.on_commit(reindex)
+
+
+def _update_embedding(kind, instance, created):
+    stale, _ = SearchEmbedding.objects.filter(
+        kind=kind, object_id=instance.pk
+    ).exclude(text_hash=text_hash(object_text(kind, instance))).delete()
+    if stale:
+        embeddings_changed(kind)
+    if created or stale:
+        _reindex_after_commit(kind, instance)
+
+
+@receiver(post_save, sender=Society)
+def update_society_search(sender, instance, created, **kwargs):
+    """Re-embed a society when its description changes and refresh its completion terms."""
+    _update_embedding("society", instance, created)
+    corpus_index.update("society", instance)
+
+
+@receiver(post_save, sender=Event)
+def update_event_search(sender, instance, created, **kwargs):
+    """Re-embed an event when its description changes and refresh its completion terms."""
+    _update_embedding("event", instance, created)
+    corpus_index.update("event", instance)
+
+
+@receiver(post_save, sender=News)
+def update_news_search(sender, instance, created, **kwargs):
+    """Re-embed a news item when its content changes."""
+    _update_embedding("news", instance, created)
+
+
+@receiver(post_delete, sender=Society)
+def delete_society_search(sender, instance, **kwargs):
+    forget_objects("society", [instance.pk])
+    corpus_index.remove("society", instance.pk)
+
+
+@receiver(post_delete, sender=Event)
+def delete_event_search(sender, instance, **kwargs):
+    forget_objects("event", [instance.pk])
+    corpus_index.remove("event", instance.pk)
+
+
+@receiver(post_delete, sender=News)
+def delete_news_search(sender, instance, **kwargs):
+    forget_objects("news", [instance.pk])
+
+
+@receiver(post_save, sender=Society)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=Society)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=News)
+def invalidate_search_results(sender, **kwargs):
+    """
+    Retire every cached search result once a change to searchable content is
+    committed; bumping earlier would let a search cache the old results under
+    the new version, and a rolled-back save would retire them for nothing.
+    """
+    transaction.on_commit(lambda: bump_version(RESULTS_VERSION))
+
+
+@receiver(request_finished)
+def flush_search_log(sender, **kwargs):
+    """Write buffered search records once enough are waiting (the response is already sent)."""
+    query_log.flush_if_due()
+
+
+@receiver(post_migrate)
+def restore_fts_triggers(sender, using="default", **kwargs):
+    """Put back the full-text triggers a migration dropped by rebuilding a society, event or news table."""
+    if sender.name == "apps.search":
+        ensure_fts_triggers(connections[using])
@@ -0,0 +1,123 @@
+'''spelling correction that knows the names and keywords of societies and events'''
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from symspellpy import Verbosity
+
+from .autocomplete import corpus_index
+from .resources import get_sym_spell
+
+# Count given to society/event terms merged into the SymSpell dictionary. It is above
+# any English word's, so a misspelt club term is corrected to that term, not a common word.
+DOMAIN_TERM_COUNT = 10 ** 11
+# Shorter tokens (and tokens with digits or punctuation) are left as typed
+MIN_CORRECTION_LENGTH = 3
+MAX_EDIT_DISTANCE = 2
+# A token with no close single word is split into words ("chessclub") only this cheaply;
+# costlier splits are mostly noise ("zzzzqqqq" -> "zzz sqq")
+MAX_SPLIT_DISTANCE = 1
+
+MemoInfo = namedtuple("MemoInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class SpellingCorrector:
+    """
+    Corrects queries token by token with SymSpell (falling back to its
+    compound lookup to split run-together words), after
+    merging the autocomplete corpus (society and event names, keywords and
+    types) into the English dictionary. Only the terms that changed since
+    the last merge are added or removed. Corrections are memoised per
+    token and merge, so repeated tokens skip the edit-distance search.
+    """
+
+    def __init__(self, memo_size=None):
+        # bumped on every merge; part of the memo key so old corrections are not reused
+        self.generation = 0
+        self.domain_terms = frozenset()
+        self._source = None
+        self._dictionary = None
+        # terms that were not English words before being merged in, so removing them is safe
+        self._added = set()
+        self._lock = threading.RLock()
+        self._memo_size = memo_size or getattr(settings, "SEARCH_SPELLING_MEMO_SIZE", 4096)
+        # (token, generation) -> correction, least recently used first
+        self._memo = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def sync(self):
+        """Merge the current corpus into SymSpell and return the merge generation."""
+        # the corpus index builds a new word index whenever its terms change
+        corpus_words, _ = corpus_index.current()
+        sym_spell = get_sym_spell()
+        if corpus_words is self._source and sym_spell is self._dictionary:
+            return self.generation
+        with self._lock:
+            if sym_spell is not self._dictionary:
+                # a freshly loaded dictionary has none of the domain terms yet
+                self.domain_terms = frozenset()
+                self._added = set()
+                self._dictionary = sym_spell
+            if corpus_words is not self._source:
+                terms = frozenset(corpus_words.terms)
+                for term in terms - self.domain_terms:
+                    if term not in sym_spell.words:
+                        self._added.add(term)
+                    sym_spell.create_dictionary_entry(term, DOMAIN_TERM_COUNT)
+                for term in self.domain_terms - terms:
+                    if term in self._added:
+                        sym_spell.delete_dictionary_entry(term)
+                        self._added.discard(term)
+                self.domain_terms = terms
+                self._source = corpus_words
+                self.generation += 1
+            return self.generation
+
+    def _lookup(self, token):
+        sym_spell = get_sym_spell()
+        suggestions = sym_spell.lookup(token, Verbosity.CLOSEST, max_edit_distance=MAX_EDIT_DISTANCE)
+        if suggestions:
+            return suggestions[0].term
+        suggestions = sym_spell.lookup_compound(token, max_edit_distance=MAX_EDIT_DISTANCE)
+        if suggestions and suggestions[0].distance <= MAX_SPLIT_DISTANCE:
+            return suggestions[0].term
+        return token
+
+    def correct_token(self, token, generation):
+        if (len(token) < MIN_CORRECTION_LENGTH or not token.isalpha()
+                or token in self.domain_terms or token in get_sym_spell().words):
+            return token
+        key = (token, generation)
+        with self._lock:
+            if key in self._memo:
+                self._hits += 1
+                self._memo.move_to_end(key)
+                return self._memo[key]
+            self._misses += 1
+        # the lock is only held for the memo: concurrent requests look up in parallel, and a
+        # lookup racing a merge is memoised under the old generation, which is not asked for again
+        correction = self._lookup(token)
+        with self._lock:
+            self._memo[key] = correction
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return correction
+
+    def correct(self, query):
+        """The query with every unknown token corrected."""
+        generation = self.sync()
+        return " ".join(self.correct_token(token, generation) for token in query.split())
+
+    def memo_info(self):
+        with self._lock:
+            return MemoInfo(self._hits, self._misses, self._memo_size, len(self._memo))
+
+
+corrector = SpellingCorrector()
+
+
+def correct_query(query):
+    """Correct the spelling of each word of a query, knowing society and event vocabulary."""
+    return corrector.correct(query)
@@ -0,0 +1,100 @@
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.timezone import now
+
+from apps.events.models import Event
+from apps.search.autocomplete import PrefixIndex, complete_query, corpus_index, dictionary_index
+from apps.societies.models import Society
+
+User = get_user_model()
+
+
+class PrefixIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex({"chess": 5, "check": 50, "cheese": 20, "football": 30, "foot": 10})
+
+    def test_short_prefix_uses_most_frequent_term(self):
+        self.assertEqual(self.index.complete("che"), "check")
+        self.assertEqual(self.index.complete("f"), "football")
+
+    def test_long_prefix(self):
+        self.assertEqual(self.index.complete("ches"), "chess")
+        self.assertEqual(self.index.complete("foot"), "football")
+
+    def test_no_completion(self):
+        self.assertIsNone(self.index.complete("xyz"))
+        self.assertIsNone(self.index.complete("chessboard"))
+        self.assertIsNone(self.index.complete(""))
+
+    def test_membership(self):
+        self.assertIn("foot", self.index)
+        self.assertNotIn("foo", self.index)
+
+
+class CompleteQueryTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="complete@test.ac.uk", password="test",
+            first_name="Complete", last_name="Manager", preferred_name="CManager"
+        )
+        self.society = Society.objects.create(
+            name="Quidditch Club", description="brooms", society_type="sports",
+            status="approved", manager=manager
+        )
+        Society.objects.create(
+            name="Zorbing Society", description="pending", society_type="sports",
+            status="pending", manager=manager
+        )
+        Event.objects.create(
+            name="Xylophone Night", description="music", date=now(),
+            event_type="arts", keyword="marimba", location="London"
+        )
+
+    def test_complete_words_are_kept(self):
+        self.assertEqual(complete_query("football"), "football")
+        self.assertEqual(complete_query("quidditch"), "quidditch")
+
+    def test_domain_vocabulary_wins(self):
+        self.assertEqual(complete_query("quidd"), "quidditch")
+        self.assertEqual(complete_query("marim"), "marimba")
+
+    def test_dictionary_completion(self):
+        self.assertEqual(complete_query("footba"), "football")
+
+    def test_multiword_query_completes_to_a_name(self):
+        self.assertEqual(complete_query("xylophone ni"), "xylophone night")
+
+    def test_only_live_societies_contribute(self):
+        self.assertNotEqual(complete_query("zorbi"), "zorbing")
+
+    def test_unknown_prefix_is_returned_unchanged(self):
+        self.assertEqual(complete_query("qqqzz"), "qqqzz")
+        self.assertEqual(complete_query(""), "")
+
+    def test_index_follows_row_changes(self):
+        self.assertEqual(complete_query("quidd"), "quidditch")
+        self.society.name = "Quokka Club"
+        self.society.save()
+        self.assertEqual(complete_query("quok"), "quokka")
+        self.society.delete()
+        self.assertNotEqual(complete_query("quok"), "quokka")
+
+    def test_changes_from_other_workers_are_picked_up(self):
+        complete_query("quidd")
+        with patch("apps.search.autocomplete.corpus_index.update"):
+            Society.objects.create(
+                name="Unicycling Club", description="one wheel", society_type="sports",
+                status="approved", manager=self.society.manager
+            )
+        corpus_index.version = None
+        self.assertEqual(complete_query("unicy"), "unicycling")
+
+    def test_completion_is_fast_and_offline(self):
+        complete_query("warm")
+        start = time.perf_counter()
+        for _ in range(100):
+            dictionary_index.get().complete("inte")
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
@@ -0,0 +1,88 @@
+import sys
+from unittest.mock import patch
+
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.search import resources
+from apps.search.backends import HashingBackend, SentenceTransformerBackend, load_backend
+from apps.search.index import get_index, index_missing
+from apps.search.models import SearchEmbedding
+from apps.search.resources import get_backend
+from apps.societies.models import Society
+from .utils import FakeModelMixin, HashingBackendMixin
+
+
+class BackendContract:
+    """What every embedding backend must provide."""
+
+    def test_vectors_are_normalised_float32_rows(self):
+        vectors = get_backend().encode(["chess club", "film society", ""])
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape[0], 3)
+        np.testing.assert_allclose(np.linalg.norm(vectors[:2], axis=1), 1.0, rtol=1e-5)
+
+    def test_similar_texts_score_higher(self):
+        query, close, far = get_backend().encode(["chess games", "weekly chess games", "rowing"])
+        self.assertGreater(query @ close, query @ far)
+
+    def test_empty_batch(self):
+        self.assertEqual(get_backend().encode([]).shape[0], 0)
+
+
+class SentenceTransformerBackendTest(FakeModelMixin, BackendContract, SimpleTestCase):
+    def test_key_names_the_model(self):
+        self.assertIsInstance(get_backend(), SentenceTransformerBackend)
+        self.assertEqual(get_backend().key, "minilm:all-MiniLM-L6-v2")
+
+
+class HashingBackendTest(HashingBackendMixin, BackendContract, SimpleTestCase):
+    def test_key_names_the_size(self):
+        self.assertIsInstance(get_backend(), HashingBackend)
+        self.assertEqual(get_backend().key, "hashing:512")
+
+    @override_settings(SEARCH_HASHING_FEATURES=64)
+    def test_size_comes_from_settings(self):
+        self.assertEqual(load_backend().encode(["chess"]).shape, (1, 64))
+
+    def test_never_loads_the_model(self):
+        get_backend().encode(["chess"])
+        self.assertFalse(resources.model.loaded)
+
+    def test_warm_up_skips_the_model(self):
+        with patch.object(resources.model, "loader") as loader, patch.object(resources.sym_spell, "loader"):
+            resources.warm_up()
+        loader.assert_not_called()
+
+
+class LoadBackendTest(SimpleTestCase):
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_backend("word2vec")
+
+
+class BackendSwitchTest(FakeModelMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        from django.contrib.auth import get_user_model
+        manager = get_user_model().objects.create_user(
+            email="backend@test.ac.uk", password="test",
+            first_name="Backend", last_name="Manager", preferred_name="BManager"
+        )
+        self.society = Society.objects.create(
+            name="Chess", description="chess games", status="approved", manager=manager
+        )
+
+    def test_embeddings_are_kept_per_backend(self):
+        index_missing("society")
+        with override_settings(SEARCH_EMBEDDING_BACKEND="hashing"):
+            resources.embedding_backend.reset()
+            index_missing("society")
+            self.assertEqual(get_index("society").matrix.shape, (1, 512))
+        resources.embedding_backend.reset()
+        self.assertEqual(
+            set(SearchEmbedding.objects.values_list("backend", flat=True)),
+            {"minilm:all-MiniLM-L6-v2", "hashing:512"},
+        )
+        self.assertEqual(get_index("society").matrix.shape[0], 1)
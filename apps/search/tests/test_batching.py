@@ -0,0 +1,77 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase
+
+from apps.search.batching import EmbeddingBatcher
+from .utils import fake_encode, fake_vector
+
+
+class EmbeddingBatcherTest(SimpleTestCase):
+    def encode_concurrently(self, batcher, texts):
+        results = {}
+
+        def run(text):
+            results[text] = batcher.encode(text)
+
+        threads = [threading.Thread(target=run, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_concurrent_requests_share_one_batch(self):
+        encode = MagicMock(side_effect=fake_encode)
+        batcher = EmbeddingBatcher(encode, max_batch_size=4, max_wait=2)
+        texts = ["chess", "film", "rowing", "choir"]
+
+        # the worker starts once every request is under way
+        start_worker = batcher._ensure_worker
+        batcher._ensure_worker = lambda: None
+        threading.Timer(0.2, start_worker).start()
+        results = self.encode_concurrently(batcher, texts)
+
+        encode.assert_called_once()
+        self.assertEqual(sorted(encode.call_args.args[0]), sorted(texts))
+        for text in texts:
+            self.assertEqual(results[text].tolist(), fake_vector(text).tolist())
+        stats = batcher.stats()
+        self.assertEqual(stats["batches"], 1)
+        self.assertEqual(stats["largest_batch"], 4)
+        self.assertEqual(stats["batch_sizes"], {"4": 1})
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_lone_request_waits_at_most_max_wait(self):
+        encode = MagicMock(side_effect=fake_encode)
+        batcher = EmbeddingBatcher(encode, max_batch_size=8, max_wait=0.001)
+        self.assertEqual(batcher.encode("chess").tolist(), fake_vector("chess").tolist())
+        self.assertEqual(batcher.encode("film").tolist(), fake_vector("film").tolist())
+        self.assertEqual(batcher.stats()["batch_sizes"], {"1": 2})
+
+    def test_lone_request_does_not_wait(self):
+        batcher = EmbeddingBatcher(MagicMock(side_effect=fake_encode), max_batch_size=8, max_wait=5)
+        started = time.monotonic()
+        batcher.encode("chess")
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_short_result_fails_the_callers(self):
+        batcher = EmbeddingBatcher(MagicMock(return_value=[]), max_batch_size=2, max_wait=0.001)
+        with self.assertLogs("apps.search.batching", level="ERROR"):
+            with self.assertRaisesRegex(RuntimeError, "Encoded 0 vectors for 1 queries"):
+                batcher.encode("chess")
+
+    def test_errors_reach_every_caller(self):
+        batcher = EmbeddingBatcher(MagicMock(side_effect=RuntimeError("no model")), max_batch_size=2, max_wait=0.001)
+        with self.assertLogs("apps.search.batching", level="ERROR"):
+            with self.assertRaises(RuntimeError):
+                batcher.encode("chess")
+        self.assertEqual(batcher.stats()["batches"], 0)
+
+    def test_batch_size_one_encodes_directly(self):
+        encode = MagicMock(side_effect=fake_encode)
+        batcher = EmbeddingBatcher(encode, max_batch_size=1)
+        batcher.encode("chess")
+        encode.assert_called_once_with(["chess"])
+        self.assertIsNone(batcher._worker)
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.search.cache import SearchResultCache, cached_grouped_search, cached_search, normalize_query, result_cache
+from apps.societies.models import Society
+
+User = get_user_model()
+
+
+class NormalizeQueryTest(SimpleTestCase):
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  Chess   CLUB "), "chess club")
+        self.assertEqual(normalize_query(None), "")
+
+
+class CachedSearchTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="cache@test.ac.uk", password="test",
+            first_name="Cache", last_name="Manager", preferred_name="CManager"
+        )
+        self.first = Society.objects.create(name="First", description="a", status="approved", manager=manager)
+        self.second = Society.objects.create(name="Second", description="b", status="approved", manager=manager)
+        self.search = MagicMock(return_value=([self.second, self.first], "query"))
+
+    def test_hit_keeps_the_ranking(self):
+        self.assertFalse(cached_search("query", "societies", self.search, Society)[2])
+        results, suggestion, hit = cached_search("query", "societies", self.search, Society)
+        self.assertTrue(hit)
+        self.assertEqual(results, [self.second, self.first])
+        self.assertEqual(suggestion, "query")
+        self.search.assert_called_once_with("query")
+
+    def test_stats_shared_between_workers(self):
+        before = result_cache.stats()
+        cached_search("query", "societies", self.search, Society)
+        # another worker counts into the same totals once it flushes
+        other = SearchResultCache()
+        other.get("query", "societies")
+        other.flush_stats()
+        stats = result_cache.stats()
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+
+    @override_settings(SEARCH_CACHE_STATS_FLUSH_EVERY=3)
+    def test_lookups_only_read_the_cache_between_flushes(self):
+        counter = SearchResultCache()
+        counter.get("query", "societies")
+        # the results version and the entry
+        with self.assertNumQueries(2):
+            counter.get("query", "societies")
+        with CaptureQueriesContext(connection) as queries:
+            counter.get("query", "societies")
+        self.assertGreater(len(queries), 2)
+        self.assertEqual(counter.misses, 3)
+
+    def test_deleting_a_result_invalidates(self):
+        cached_search("query", "societies", self.search, Society)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        self.search.return_value = ([self.first], "query")
+        results, _, hit = cached_search("query", "societies", self.search, Society)
+        self.assertFalse(hit)
+        self.assertEqual(results, [self.first])
+
+    def test_results_kept_until_the_change_commits(self):
+        cached_search("query", "societies", self.search, Society)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.second.delete()
+            self.assertTrue(cached_search("query", "societies", self.search, Society)[2])
+        for callback in callbacks:
+            callback()
+        self.assertFalse(cached_search("query", "societies", self.search, Society)[2])
+
+    def test_grouped_hit_keeps_each_ranking(self):
+        search = MagicMock(return_value=({"societies": [self.second, self.first], "events": []}, "query"))
+        models = {"societies": Society, "events": MagicMock()}
+        self.assertFalse(cached_grouped_search("query", "all", search, models)[2])
+        groups, suggestion, hit = cached_grouped_search("query", "all", search, models)
+        self.assertTrue(hit)
+        self.assertEqual(groups["societies"], [self.second, self.first])
+        self.assertEqual(suggestion, "query")
+        search.assert_called_once_with("query")
@@ -0,0 +1,45 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.search.models import SearchEmbedding
+from apps.societies.models import Society
+from .utils import fake_encode
+
+User = get_user_model()
+
+
+@patch("apps.search.index.encode_texts", side_effect=fake_encode)
+class RebuildSearchIndexCommandTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="command@test.ac.uk", password="test",
+            first_name="Command", last_name="Manager", preferred_name="CManager"
+        )
+        for i in range(3):
+            Society.objects.create(
+                name=f"Society {i}", description=f"description {i}",
+                society_type="social", status="approved", manager=manager
+            )
+
+    def test_rebuild_all(self, mock_encode):
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 3 society description(s).", out.getvalue())
+        self.assertIn("Indexed 0 event description(s).", out.getvalue())
+        self.assertEqual(SearchEmbedding.objects.filter(kind="society").count(), 3)
+
+    def test_missing_only(self, mock_encode):
+        call_command("rebuild_search_index", kind=["society"], stdout=StringIO())
+        SearchEmbedding.objects.first().delete()
+        out = StringIO()
+        call_command("rebuild_search_index", kind=["society"], missing_only=True, stdout=out)
+        self.assertIn("Indexed 1 society description(s).", out.getvalue())
+
+    def test_lexical(self, mock_encode):
+        out = StringIO()
+        call_command("rebuild_search_index", kind=["society"], lexical=True, stdout=out)
+        self.assertIn("Indexed 3 row(s) for full-text search.", out.getvalue())
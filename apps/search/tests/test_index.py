@@ -0,0 +1,156 @@
+from unittest.mock import patch
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from apps.events.models import Event
+from apps.search.index import EmbeddingIndex, forget_objects, index_missing, nearest, rebuild, text_hash
+from apps.search.models import SearchEmbedding
+from apps.societies.models import Society
+from .utils import fake_encode, fake_vector
+
+User = get_user_model()
+
+
+@patch("apps.search.index.encode_texts", side_effect=fake_encode)
+class EmbeddingIndexTest(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            email="index@test.ac.uk", password="test",
+            first_name="Index", last_name="Manager", preferred_name="IManager"
+        )
+        self.chess = Society.objects.create(
+            name="Chess Club", description="chess tournaments and chess puzzles",
+            society_type="academic", status="approved", manager=self.manager
+        )
+        self.rowing = Society.objects.create(
+            name="Rowing Club", description="rowing on the river every morning",
+            society_type="sports", status="approved", manager=self.manager
+        )
+
+    def loaded_index(self):
+        index_missing("society")
+        index = EmbeddingIndex("society")
+        index.refresh()
+        return index
+
+    def test_index_missing_embeds_only_new_objects(self, mock_encode):
+        self.assertEqual(index_missing("society"), 2)
+        self.assertEqual(index_missing("society"), 0)
+        self.assertEqual(SearchEmbedding.objects.filter(kind="society").count(), 2)
+
+    def test_stored_vector_and_hash(self, mock_encode):
+        index_missing("society")
+        row = SearchEmbedding.objects.get(kind="society", object_id=self.chess.id)
+        self.assertEqual(row.text_hash, text_hash(self.chess.description))
+        self.assertEqual(row.dtype, "float16")
+        self.assertEqual(bytes(row.vector), fake_vector(self.chess.description).astype("float16").tobytes())
+
+    @override_settings(SEARCH_VECTOR_DTYPE="float32")
+    def test_stored_vector_dtype_setting(self, mock_encode):
+        index_missing("society")
+        row = SearchEmbedding.objects.get(kind="society", object_id=self.chess.id)
+        self.assertEqual(row.dtype, "float32")
+        self.assertEqual(bytes(row.vector), fake_vector(self.chess.description).tobytes())
+
+    @override_settings(SEARCH_VECTOR_DTYPE="int4")
+    def test_unknown_vector_dtype(self, mock_encode):
+        with self.assertRaises(ImproperlyConfigured):
+            index_missing("society")
+
+    def test_vectors_of_either_dtype_are_loaded(self, mock_encode):
+        index_missing("society")
+        # a row stored before vectors were float16
+        SearchEmbedding.objects.filter(object_id=self.rowing.id).update(
+            vector=fake_vector(self.rowing.description).tobytes(), dtype="float32"
+        )
+        index = EmbeddingIndex("society")
+        index.refresh()
+        self.assertEqual(index.matrix.dtype, np.float32)
+        ids, scores = index.search(fake_vector(self.rowing.description), 1)
+        self.assertEqual(ids, [self.rowing.id])
+        self.assertAlmostEqual(scores[0], 1.0, places=5)
+
+    def test_rank_orders_by_description_similarity(self, mock_encode):
+        index = self.loaded_index()
+        ranked = index.rank(fake_vector("chess puzzles"), [self.rowing, self.chess])
+        self.assertEqual(ranked, [self.chess, self.rowing])
+
+    def test_rank_puts_unindexed_objects_last(self, mock_encode):
+        index = self.loaded_index()
+        SearchEmbedding.objects.filter(object_id=self.chess.id).delete()
+        stray = Society(id=999, name="Stray")
+        ranked = index.rank(fake_vector("rowing"), [stray, self.rowing])
+        self.assertEqual(ranked, [self.rowing, stray])
+
+    def test_refresh_reloads_matrix_only_when_embeddings_change(self, mock_encode):
+        index = self.loaded_index()
+        matrix = index.matrix
+        index.refresh()
+        self.assertIs(index.matrix, matrix)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            forget_objects("society", [self.rowing.id])
+        index.refresh()
+        self.assertIsNot(index.matrix, matrix)
+        self.assertEqual(set(index.positions), {self.chess.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            index_missing("society")
+        index.refresh()
+        self.assertEqual(set(index.positions), {self.chess.id, self.rowing.id})
+
+    def test_lookups_neither_embed_nor_read_the_table(self, mock_encode):
+        index = self.loaded_index()
+        # saved without post_save, as bulk_create does
+        Society.objects.bulk_create([Society(name="Film Club", description="films", manager=self.manager)])
+        mock_encode.reset_mock()
+        # a single read of the shared version
+        with self.assertNumQueries(1):
+            index.refresh()
+        mock_encode.assert_not_called()
+        self.assertEqual(set(index.positions), {self.chess.id, self.rowing.id})
+
+    def test_rebuild_reembeds_everything(self, mock_encode):
+        Event.objects.create(
+            name="Blitz Night", description="fast chess games",
+            date=now(), event_type="social", keyword="chess", location="London"
+        )
+        index_missing("event")
+        mock_encode.reset_mock()
+        self.assertEqual(rebuild("event"), 1)
+        mock_encode.assert_called_once_with(["fast chess games"])
+
+    def test_search_returns_nearest_first(self, mock_encode):
+        index = self.loaded_index()
+        ids, scores = index.search(fake_vector("chess puzzles"), 5)
+        self.assertEqual(ids, [self.chess.id, self.rowing.id])
+        self.assertGreater(scores[0], scores[1])
+        self.assertIsNone(index.ivf)
+
+    @override_settings(SEARCH_IVF_MIN_ROWS=2)
+    def test_large_tables_use_ivf(self, mock_encode):
+        index = self.loaded_index()
+        self.assertIsNotNone(index.ivf)
+        # the IVF's matrix is kept at the stored precision
+        self.assertEqual(index.matrix.dtype, np.float16)
+        ids, _ = index.search(fake_vector("rowing river"), 1)
+        self.assertEqual(ids, [self.rowing.id])
+
+    def test_nearest_post_filters_and_fetches_more(self, mock_encode):
+        for i in range(6):
+            Society.objects.create(
+                name=f"Chess {i}", description="chess puzzles", society_type="academic",
+                status="pending", manager=self.manager
+            )
+        index_missing("society")
+        found = nearest("society", fake_vector("chess puzzles"), Society.objects.filter(status="approved"), k=2)
+        self.assertEqual(found, [self.chess, self.rowing])
+
+    def test_nearest_min_score(self, mock_encode):
+        index_missing("society")
+        found = nearest("society", fake_vector("chess puzzles"), Society.objects.all(), min_score=0.3)
+        self.assertEqual(found, [self.chess])
@@ -0,0 +1,56 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.search.ivf import IVFIndex, top_k
+
+
+def random_unit_rows(count, dimensions=32, seed=0):
+    rows = np.random.default_rng(seed).normal(size=(count, dimensions)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class TopKTest(SimpleTestCase):
+    def test_best_first(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+        self.assertEqual(top_k(scores, 2).tolist(), [1, 3])
+        self.assertEqual(top_k(scores, 10).tolist(), [1, 3, 2, 0])
+        self.assertEqual(top_k(scores, 0).tolist(), [])
+
+
+class IVFIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.matrix = random_unit_rows(2000)
+        self.index = IVFIndex(self.matrix)
+
+    def test_lists_cover_every_row_once(self):
+        self.assertEqual(len(self.index.lists), 44)
+        self.assertEqual(sorted(np.concatenate(self.index.lists).tolist()), list(range(2000)))
+
+    def test_finds_an_exact_row(self):
+        rows, scores = self.index.search(self.matrix[123], 5, n_probe=4)
+        self.assertEqual(rows[0], 123)
+        self.assertAlmostEqual(scores[0], 1.0, places=5)
+        self.assertEqual(len(rows), 5)
+
+    def test_recall_against_brute_force(self):
+        queries = random_unit_rows(20, seed=1)
+        recall = []
+        for query in queries:
+            exact = set(top_k(self.matrix @ query, 10).tolist())
+            rows, _ = self.index.search(query, 10, n_probe=8)
+            recall.append(len(exact & set(rows.tolist())) / 10)
+        self.assertGreater(np.mean(recall), 0.6)
+
+    def test_probes_only_part_of_the_matrix(self):
+        probes = np.argsort(-(self.index.centroids @ self.matrix[0]))[:4]
+        probed = sum(len(self.index.lists[c]) for c in probes)
+        self.assertLess(probed, len(self.matrix) / 4)
+
+    def test_probes_more_lists_when_they_hold_fewer_than_k_rows(self):
+        rows, _ = self.index.search(self.matrix[0], 500, n_probe=1)
+        self.assertEqual(len(rows), 500)
+
+    def test_reuse_keeps_centroids_for_similar_sizes(self):
+        grown = np.vstack([self.matrix, random_unit_rows(100, seed=2)])
+        self.assertIs(self.index.reuse(grown).centroids, self.index.centroids)
+        self.assertIsNot(self.index.reuse(random_unit_rows(5000, seed=3)).centroids, self.index.centroids)
@@ -0,0 +1,132 @@
+from django.contrib.auth import get_user_model
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from apps.events.models import Event
+from apps.news.models import News
+from apps.search.lexical import fuse_rankings, lexical_search, match_expression, rebuild_lexical
+from apps.societies.models import Society
+from .utils import HashingBackendMixin
+
+User = get_user_model()
+
+
+class MatchExpressionTest(SimpleTestCase):
+    def test_any_word_with_last_as_prefix(self):
+        self.assertEqual(match_expression("Chess clu"), '"chess" OR "clu"*')
+
+    def test_operators_are_quoted_away(self):
+        self.assertEqual(match_expression('NEAR(a "b") -c'), '"near" OR "a" OR "b" OR "c"*')
+
+    def test_no_words(self):
+        self.assertIsNone(match_expression(" !? "))
+
+
+class FuseRankingsTest(SimpleTestCase):
+    def test_items_in_both_lists_come_first(self):
+        self.assertEqual(fuse_rankings([1, 2, 3], [3, 4]), [3, 1, 2, 4])
+
+    def test_ties_keep_the_first_ranking_first(self):
+        self.assertEqual(fuse_rankings([1], [2]), [1, 2])
+
+
+class LexicalSearchTest(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            email="lexical@test.ac.uk", password="test",
+            first_name="Lexical", last_name="Manager", preferred_name="LManager"
+        )
+        self.chess = Society.objects.create(
+            name="Chess Club", description="weekly games", society_type="social",
+            status="approved", manager=self.manager
+        )
+        self.bridge = Society.objects.create(
+            name="Bridge Society", description="card games and chess puzzles", society_type="social",
+            status="approved", manager=self.manager
+        )
+        self.event = Event.objects.create(
+            name="Open Night", description="meet the team", event_type="social",
+            keyword="chess", location="Strand Campus", date=now()
+        )
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(lexical_search("chess", "society"), [self.chess.id, self.bridge.id])
+
+    def test_kinds_are_kept_apart(self):
+        self.assertEqual(lexical_search("chess", "event"), [self.event.id])
+        self.assertEqual(lexical_search("strand", "event"), [self.event.id])
+        self.assertEqual(lexical_search("strand", "society"), [])
+
+    def test_stemming_and_prefix(self):
+        self.assertEqual(lexical_search("game", "society"), [self.chess.id, self.bridge.id])
+        self.assertEqual(lexical_search("brid", "society"), [self.bridge.id])
+
+    def test_triggers_follow_updates_and_deletes(self):
+        self.chess.name = "Draughts Club"
+        self.chess.description = "weekly matches"
+        self.chess.save()
+        self.assertEqual(lexical_search("chess", "society"), [self.bridge.id])
+        self.assertEqual(lexical_search("draughts", "society"), [self.chess.id])
+        self.bridge.delete()
+        self.assertEqual(lexical_search("chess", "society"), [])
+
+    def test_queryset_filters_before_the_limit(self):
+        pending = [
+            Society.objects.create(
+                name=f"Chess Chess {i}", description="chess", status="pending", manager=self.manager
+            ).id
+            for i in range(2)
+        ]
+        self.assertCountEqual(lexical_search("chess", "society", limit=2), pending)
+        approved = Society.objects.filter(status="approved")
+        self.assertEqual(lexical_search("chess", "society", limit=2, queryset=approved),
+                         [self.chess.id, self.bridge.id])
+
+    def test_query_logging(self):
+        # DEBUG logs every query with its parameters filled in
+        with CaptureQueriesContext(connection):
+            self.assertEqual(lexical_search("chess", "event"), [self.event.id])
+
+    def test_news_is_indexed(self):
+        news = News.objects.create(title="Chess results", content="we won", society=self.chess)
+        self.assertEqual(lexical_search("results", "news"), [news.id])
+
+    def test_rebuild(self):
+        self.assertEqual(rebuild_lexical(), 3)
+        self.assertEqual(lexical_search("chess", "society"), [self.chess.id, self.bridge.id])
+
+
+class FTSTriggersTest(HashingBackendMixin, TransactionTestCase):
+    def news_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'news_news'")
+            return cursor.fetchone()[0]
+
+    def test_index_follows_a_rebuilt_table(self):
+        manager = User.objects.create_user(
+            email="triggers@test.ac.uk", password="test",
+            first_name="Trigger", last_name="Manager", preferred_name="TManager"
+        )
+        society = Society.objects.create(name="Rowing Club", status="approved", manager=manager)
+        # changing a column makes SQLite's schema editor rebuild news_news, dropping its triggers
+        old_field = News._meta.get_field("title")
+        new_field = models.CharField(max_length=300)
+        new_field.set_attributes_from_name("title")
+        with connection.schema_editor() as editor:
+            editor.alter_field(News, old_field, new_field)
+        try:
+            self.assertEqual(self.news_triggers(), 0)
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+            self.assertEqual(self.news_triggers(), 3)
+            news = News.objects.create(title="Rowing regatta", content="on the river", society=society)
+            self.assertEqual(lexical_search("regatta", "news"), [news.id])
+            news.title = "Rowing race"
+            news.save()
+            self.assertEqual(lexical_search("regatta", "news"), [])
+        finally:
+            with connection.schema_editor() as editor:
+                editor.alter_field(News, new_field, old_field)
+            emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
@@ -0,0 +1,105 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import torch
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.search.precision import (
+    compare_precision,
+    inference_precision,
+    load_model,
+    model_encoder,
+    quantize_model,
+)
+from apps.societies.models import Society
+from .utils import fake_encode, fake_model
+
+User = get_user_model()
+
+TEXTS = [
+    "chess tournaments and chess puzzles",
+    "rowing on the river every morning",
+    "live music and open mic nights",
+    "weekly football training",
+    "coding workshops and hackathons",
+    "photography walks around the city",
+]
+
+
+def misaligned_encode(texts):
+    """A candidate that gives every document the vector of the one before it."""
+    return np.roll(fake_encode(list(texts)), 1, axis=0)
+
+
+class QuantizeModelTest(SimpleTestCase):
+    def test_linear_layers_become_int8(self):
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(torch.nn.Linear(16, 16), torch.nn.ReLU(), torch.nn.Linear(16, 4))
+        inputs = torch.randn(8, 16)
+        expected = model(inputs)
+        quantized = quantize_model(model)
+        self.assertIsInstance(quantized[0], torch.ao.nn.quantized.dynamic.Linear)
+        self.assertTrue(torch.allclose(quantized(inputs), expected, atol=0.05))
+
+    @override_settings(SEARCH_INFERENCE_PRECISION="int8")
+    def test_int8_model_is_quantized_on_the_cpu(self):
+        tiny = torch.nn.Sequential(torch.nn.Linear(4, 4))
+        with patch("sentence_transformers.SentenceTransformer", return_value=tiny) as mock_model:
+            model = load_model()
+        self.assertEqual(mock_model.call_args.kwargs["device"], "cpu")
+        self.assertIsInstance(model[0], torch.ao.nn.quantized.dynamic.Linear)
+
+    @override_settings(SEARCH_INFERENCE_PRECISION="int4")
+    def test_unknown_precision(self):
+        with self.assertRaises(ImproperlyConfigured):
+            inference_precision()
+
+    def test_model_encoder_returns_float32_rows(self):
+        vectors = model_encoder(fake_model())(["chess", "rowing"])
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, (2, 64))
+
+
+class ComparePrecisionTest(SimpleTestCase):
+    def test_float16_vectors_keep_the_top_results(self):
+        result = compare_precision(TEXTS, fake_encode, fake_encode, k=3)
+        self.assertEqual(result["mean_overlap"], 1.0)
+        self.assertEqual(result["documents"], len(TEXTS))
+        self.assertIn("chess club", result["overlaps"])
+
+    def test_different_vectors_lose_overlap(self):
+        result = compare_precision(TEXTS, fake_encode, misaligned_encode, queries=["chess puzzles"], k=1)
+        self.assertEqual(result["overlaps"], {"chess puzzles": 0.0})
+
+
+class CheckSearchPrecisionCommandTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="precision@test.ac.uk", password="test",
+            first_name="Precision", last_name="Manager", preferred_name="PManager"
+        )
+        for i, text in enumerate(TEXTS):
+            Society.objects.create(
+                name=f"Society {i}", description=text, society_type="social",
+                status="approved", manager=manager
+            )
+
+    @patch("apps.search.management.commands.check_search_precision.load_model", side_effect=lambda precision: fake_model())
+    def test_matching_results_pass(self, mock_load):
+        out = StringIO()
+        call_command("check_search_precision", kind=["society"], stdout=out)
+        self.assertIn("society: top-10 overlap 1.00", out.getvalue())
+        self.assertEqual([call.args[0] for call in mock_load.call_args_list], ["float32", "int8"])
+
+    @patch("apps.search.management.commands.check_search_precision.load_model")
+    def test_low_overlap_fails(self, mock_load):
+        candidate = MagicMock()
+        candidate.encode.side_effect = lambda texts, **kwargs: misaligned_encode(texts)
+        mock_load.side_effect = lambda precision: fake_model() if precision == "float32" else candidate
+        with self.assertRaises(CommandError):
+            call_command("check_search_precision", kind=["society"], k=1, min_overlap=0.99, stdout=StringIO())
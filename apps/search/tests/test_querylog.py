@@ -0,0 +1,113 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.search.models import SearchQueryLog
+from apps.search.querylog import QueryLogBuffer, collect_stages, query_log, record_search, stage
+
+
+class StageTest(SimpleTestCase):
+    def test_stages_are_timed_only_while_collecting(self):
+        with stage("spell"):
+            pass
+        with collect_stages() as timings:
+            with stage("spell"):
+                pass
+            with stage("rank"):
+                pass
+            with stage("rank"):
+                pass
+        with stage("encode"):
+            pass
+        self.assertEqual(set(timings), {"spell", "rank"})
+        self.assertGreaterEqual(timings["rank"], 0.0)
+
+
+def log_entry(query="chess", **fields):
+    return SearchQueryLog(**{
+        "query": query, "search_type": "societies", "result_count": 1,
+        "duration_ms": 1.0, "created_at": "2026-01-01T00:00:00Z", **fields,
+    })
+
+
+@override_settings(SEARCH_QUERY_LOG_FLUSH_SIZE=3, SEARCH_QUERY_LOG_FLUSH_SECONDS=60)
+class QueryLogBufferTest(TestCase):
+    def setUp(self):
+        self.buffer = QueryLogBuffer()
+
+    def test_flushes_once_enough_records_wait(self):
+        self.buffer.add(log_entry())
+        self.buffer.add(log_entry())
+        self.assertEqual(self.buffer.flush_if_due(), 0)
+        self.buffer.add(log_entry())
+        with self.assertNumQueries(1):
+            self.assertEqual(self.buffer.flush_if_due(), 3)
+        self.assertEqual(SearchQueryLog.objects.count(), 3)
+        self.assertEqual(len(self.buffer), 0)
+
+    @override_settings(SEARCH_QUERY_LOG_FLUSH_SECONDS=0)
+    def test_flushes_old_records(self):
+        self.buffer.add(log_entry())
+        self.assertEqual(self.buffer.flush_if_due(), 1)
+
+    def test_nothing_to_flush(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.buffer.flush(), 0)
+
+    def test_failed_write_is_dropped(self):
+        self.buffer.add(log_entry())
+        with patch.object(SearchQueryLog.objects, "bulk_create", side_effect=DatabaseError), \
+                self.assertLogs("apps.search.querylog", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(self.buffer), 0)
+
+
+class RecordSearchTest(TestCase):
+    def setUp(self):
+        query_log.clear()
+
+    def test_record(self):
+        record_search("Chess Clb", "chess club", "societies", 4, False, 12.5, {"spell": 1.23456})
+        query_log.flush()
+        log = SearchQueryLog.objects.get()
+        self.assertEqual((log.query, log.corrected_query, log.result_count), ("Chess Clb", "chess club", 4))
+        self.assertEqual(log.timings, {"spell": 1.235})
+
+    def test_empty_and_long_queries(self):
+        record_search("  ", None, "societies", 0, False, 1.0, {})
+        record_search("x" * 300, None, "events", 0, False, 1.0, {})
+        query_log.flush()
+        log = SearchQueryLog.objects.get()
+        self.assertEqual(len(log.query), 255)
+        self.assertEqual(log.corrected_query, "")
+
+
+class SearchQueryReportCommandTest(TestCase):
+    def setUp(self):
+        query_log.clear()
+        for query, results in [("Chess", 3), ("chess", 3), ("rowing", 1), ("quidditch", 0), ("quidditch", 0)]:
+            record_search(query, query, "societies", results, False, 10.0, {})
+        record_search("old", "old", "societies", 0, False, 10.0, {})
+        query_log.flush()
+        SearchQueryLog.objects.filter(query="old").update(created_at="2020-01-01T00:00:00Z")
+
+    def test_report(self):
+        out = StringIO()
+        call_command("search_query_report", stdout=out)
+        report = out.getvalue()
+        self.assertIn("5 searches in the last 7 day(s)", report)
+        top = report.split("Top queries")[1].split("Zero-result queries")[0]
+        self.assertLess(top.index("'chess'"), top.index("'quidditch'"))
+        self.assertLess(top.index("'quidditch'"), top.index("'rowing'"))
+        empty = report.split("Zero-result queries")[1]
+        self.assertIn("'quidditch'", empty)
+        self.assertNotIn("'rowing'", empty)
+        self.assertNotIn("'old'", report)
+
+    def test_nothing_logged(self):
+        out = StringIO()
+        call_command("search_query_report", search_type="events", stdout=out)
+        self.assertIn("No searches logged", out.getvalue())
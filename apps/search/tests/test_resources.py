@@ -0,0 +1,53 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.search import resources
+from apps.search.resources import LazyResource, warm_up
+
+
+class LazyResourceTest(SimpleTestCase):
+    def test_loads_on_first_use_only(self):
+        loader = MagicMock(return_value="loaded")
+        resource = LazyResource("thing", loader)
+
+        self.assertFalse(resource.loaded)
+        loader.assert_not_called()
+
+        self.assertEqual(resource.get(), "loaded")
+        self.assertEqual(resource.get(), "loaded")
+        self.assertTrue(resource.loaded)
+        loader.assert_called_once()
+
+    def test_concurrent_first_use_loads_once(self):
+        started = threading.Event()
+        loader = MagicMock(side_effect=lambda: started.wait(1) or "loaded")
+        resource = LazyResource("thing", loader)
+
+        threads = [threading.Thread(target=resource.get) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        started.set()
+        for thread in threads:
+            thread.join()
+
+        loader.assert_called_once()
+
+    def test_reset_forces_reload(self):
+        loader = MagicMock(side_effect=["first", "second"])
+        resource = LazyResource("thing", loader)
+        resource.get()
+        resource.reset()
+        self.assertEqual(resource.get(), "second")
+
+    def test_warm_up_loads_registered_resources(self):
+        loader = MagicMock(return_value="loaded")
+        with patch.dict(resources._registry, {"thing": LazyResource("thing", loader)}, clear=True):
+            warm_up()
+        loader.assert_called_once()
+
+    def test_importing_search_functions_loads_nothing(self):
+        """config.functions is imported by the URLconf, so it must stay cheap."""
+        import config.functions  # noqa: F401
+        self.assertFalse(resources.model.loaded)
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+
+from apps.search.results import (
+    load_result_set, page_url, parse_cursor, result_page, result_set_token, store_result_set,
+)
+from apps.societies.models import Society
+
+User = get_user_model()
+
+
+class ResultSetStoreTest(TestCase):
+    def test_round_trip(self):
+        stored = store_result_set("societies", [3, 1, 2], "chess")
+        loaded = load_result_set(stored.token, "societies")
+        self.assertEqual(loaded.ids, [3, 1, 2])
+        self.assertEqual(loaded.suggestion, "chess")
+
+    def test_tokens_are_short_and_unique(self):
+        first = store_result_set("societies", [1]).token
+        second = store_result_set("societies", [1]).token
+        self.assertNotEqual(first, second)
+        self.assertLessEqual(len(first), 12)
+
+    def test_derived_token_keeps_the_first_set(self):
+        token = result_set_token("Chess  club", "societies")
+        self.assertEqual(token, result_set_token("chess club", "societies"))
+        self.assertNotEqual(token, result_set_token("chess club", "events"))
+        store_result_set("societies", [1, 2], token=token)
+        self.assertEqual(store_result_set("societies", [2, 1], token=token).token, token)
+        self.assertEqual(load_result_set(token, "societies").ids, [1, 2])
+
+    def test_unknown_expired_or_other_type(self):
+        stored = store_result_set("events", [1])
+        self.assertIsNone(load_result_set(stored.token, "societies"))
+        self.assertIsNone(load_result_set("missing", "events"))
+        self.assertIsNone(load_result_set(None, "events"))
+        cache.clear()
+        self.assertIsNone(load_result_set(stored.token, "events"))
+
+
+class ResultPageTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="pages@test.ac.uk", password="test",
+            first_name="Page", last_name="Manager", preferred_name="PManager"
+        )
+        self.societies = [
+            Society.objects.create(name=f"Soc{i}", description="d", status="approved", manager=manager)
+            for i in range(5)
+        ]
+        self.ids = [society.id for society in reversed(self.societies)]
+
+    def test_pages_follow_rank_order(self):
+        page, after = result_page(Society.objects.all(), self.ids, 0, page_size=2)
+        self.assertEqual([s.id for s in page], self.ids[:2])
+        self.assertEqual(after, 2)
+        page, after = result_page(Society.objects.all(), self.ids, 4, page_size=2)
+        self.assertEqual([s.id for s in page], self.ids[4:])
+        self.assertIsNone(after)
+
+    def test_filtered_and_deleted_rows_are_skipped(self):
+        self.societies[3].status = "pending"
+        self.societies[3].save()
+        self.societies[2].delete()
+        page, after = result_page(Society.objects.filter(status="approved"), self.ids, 0, page_size=2)
+        self.assertEqual([s.id for s in page], [self.ids[0], self.ids[3]])
+        self.assertEqual(after, 4)
+
+    def test_each_step_fetches_one_page(self):
+        with self.assertNumQueries(1):
+            result_page(Society.objects.all(), self.ids, 0, page_size=3)
+
+
+class CursorTest(SimpleTestCase):
+    def test_parse_cursor(self):
+        self.assertEqual(parse_cursor("20"), 20)
+        self.assertEqual(parse_cursor("-3"), 0)
+        self.assertEqual(parse_cursor("abc"), 0)
+        self.assertEqual(parse_cursor(None), 0)
+
+    def test_page_url_keeps_other_parameters(self):
+        url = page_url("/societies/", QueryDict("society_type=arts&after=0"), "tok", 20)
+        self.assertEqual(url, "/societies/?society_type=arts&after=20&results=tok")
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils.timezone import now
+
+from apps.events.models import Event
+from apps.news.models import News
+from apps.search.models import SearchEmbedding
+from apps.societies.models import Society
+from .utils import fake_encode
+
+User = get_user_model()
+
+
+@patch("apps.search.index.encode_texts", side_effect=fake_encode)
+class SearchEmbeddingSignalsTest(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            email="signals@test.ac.uk", password="test",
+            first_name="Signal", last_name="Manager", preferred_name="SManager"
+        )
+
+    def create_society(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Society.objects.create(
+                name="Film Society", description="weekly film screenings",
+                society_type="arts", status="approved", manager=self.manager, **kwargs
+            )
+
+    def test_created_society_is_embedded_after_commit(self, mock_encode):
+        society = self.create_society()
+        self.assertTrue(SearchEmbedding.objects.filter(kind="society", object_id=society.id).exists())
+
+    def test_description_change_reembeds(self, mock_encode):
+        society = self.create_society()
+        mock_encode.reset_mock()
+
+        society.description = "classic cinema nights"
+        with self.captureOnCommitCallbacks(execute=True):
+            society.save()
+
+        mock_encode.assert_called_once_with(["classic cinema nights"])
+        self.assertEqual(SearchEmbedding.objects.filter(kind="society", object_id=society.id).count(), 1)
+
+    def test_unrelated_change_keeps_embedding(self, mock_encode):
+        society = self.create_society()
+        mock_encode.reset_mock()
+
+        society.members_count = 5
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            society.save()
+
+        self.assertNotIn("reindex", [callback.__name__ for callback in callbacks])
+        mock_encode.assert_not_called()
+
+    def test_delete_removes_embedding(self, mock_encode):
+        society = self.create_society()
+        society.delete()
+        self.assertFalse(SearchEmbedding.objects.filter(kind="society").exists())
+
+    def test_event_lifecycle(self, mock_encode):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(
+                name="Quiz", description="pub quiz", date=now(),
+                event_type="social", keyword="quiz", location="London"
+            )
+        self.assertTrue(SearchEmbedding.objects.filter(kind="event", object_id=event.id).exists())
+        event.delete()
+        self.assertFalse(SearchEmbedding.objects.filter(kind="event").exists())
+
+    def test_news_lifecycle(self, mock_encode):
+        society = self.create_society()
+        with self.captureOnCommitCallbacks(execute=True):
+            news = News.objects.create(title="Screening", content="free popcorn", society=society)
+        mock_encode.assert_called_with(["free popcorn"])
+        self.assertTrue(SearchEmbedding.objects.filter(kind="news", object_id=news.id).exists())
+        news.delete()
+        self.assertFalse(SearchEmbedding.objects.filter(kind="news").exists())
+
+    def test_indexing_failure_does_not_break_save(self, mock_encode):
+        mock_encode.side_effect = RuntimeError("model unavailable")
+        with self.assertLogs("apps.search.signals", level="ERROR"):
+            society = self.create_society()
+        self.assertTrue(Society.objects.filter(id=society.id).exists())
+        self.assertFalse(SearchEmbedding.objects.exists())
@@ -0,0 +1,97 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils.timezone import now
+
+from apps.events.models import Event
+from apps.search.resources import get_sym_spell
+from apps.search.spelling import SpellingCorrector, correct_query
+from apps.societies.models import Society
+
+User = get_user_model()
+
+
+class CorrectQueryTest(TestCase):
+    def setUp(self):
+        manager = User.objects.create_user(
+            email="spelling@test.ac.uk", password="test",
+            first_name="Spelling", last_name="Manager", preferred_name="SManager"
+        )
+        self.society = Society.objects.create(
+            name="Quidditch Club", description="brooms", society_type="sports",
+            status="approved", manager=manager
+        )
+        Event.objects.create(
+            name="Spring Hackathon", description="code", date=now(),
+            event_type="academic", keyword="hackathon", location="London"
+        )
+
+    def test_english_typos_are_corrected(self):
+        self.assertEqual(correct_query("footbal"), "football")
+
+    def test_each_word_is_corrected(self):
+        self.assertEqual(correct_query("chess clb"), "chess club")
+        self.assertEqual(correct_query("footbal socety"), "football society")
+
+    def test_domain_terms_are_kept(self):
+        self.assertEqual(correct_query("quidditch hackathon"), "quidditch hackathon")
+
+    def test_domain_terms_win_corrections(self):
+        self.assertEqual(correct_query("quiditch"), "quidditch")
+        self.assertEqual(correct_query("hackaton"), "hackathon")
+
+    def test_run_together_words_are_split(self):
+        self.assertEqual(correct_query("chessclub"), "chess club")
+
+    def test_short_junk_and_numbers_are_left_alone(self):
+        self.assertEqual(correct_query("zzzzqqqq"), "zzzzqqqq")
+        self.assertEqual(correct_query("xq 2025"), "xq 2025")
+
+    def test_removed_terms_leave_the_dictionary(self):
+        correct_query("quidditch")
+        self.assertIn("quidditch", get_sym_spell().words)
+        self.society.delete()
+        correct_query("quidditch")
+        self.assertNotIn("quidditch", get_sym_spell().words)
+        # English words that are also society terms stay in the dictionary
+        self.assertIn("club", get_sym_spell().words)
+
+
+class SpellingCorrectorMemoTest(TestCase):
+    def test_repeated_tokens_are_memoised(self):
+        corrector = SpellingCorrector(memo_size=16)
+        self.assertEqual(corrector.correct("footbal"), "football")
+        self.assertEqual(corrector.correct("footbal clb"), "football club")
+        info = corrector.memo_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+
+    def test_least_recently_used_corrections_are_dropped(self):
+        corrector = SpellingCorrector(memo_size=2)
+        corrector.correct("footbal clb")
+        corrector.correct("footbal socety")
+        corrector.correct("clb")
+        info = corrector.memo_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 4, 2))
+
+    def test_lookups_run_without_the_lock(self):
+        corrector = SpellingCorrector(memo_size=16)
+        lookup = corrector._lookup
+        acquired = []
+
+        def reach_the_memo():
+            acquired.append(corrector._lock.acquire(timeout=1))
+            if acquired[-1]:
+                corrector._lock.release()
+
+        def checked_lookup(token):
+            # another request can reach the memo while this lookup runs
+            thread = threading.Thread(target=reach_the_memo)
+            thread.start()
+            thread.join()
+            return lookup(token)
+
+        corrector._lookup = checked_lookup
+        self.assertEqual(corrector.correct("footbal"), "football")
+        self.assertEqual(acquired, [True])
@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from apps.search.resources import get_model
+from apps.search.types import best_type, type_labels
+from .utils import FakeModelMixin, fake_vector
+
+
+class BestTypeTest(FakeModelMixin, SimpleTestCase):
+    def test_picks_the_closest_label(self):
+        self.assertEqual(best_type("society", fake_vector("sports")), "sports")
+        self.assertEqual(best_type("event", fake_vector("cultural")), "cultural")
+
+    def test_only_considers_candidates(self):
+        self.assertEqual(best_type("society", fake_vector("sports"), {"arts"}), "arts")
+        self.assertIsNone(best_type("society", fake_vector("sports"), {"unknown"}))
+
+    def test_labels_are_encoded_once_per_process(self):
+        for _ in range(3):
+            best_type("society", fake_vector("arts"))
+            best_type("event", fake_vector("arts"))
+        encoded = [call.args[0] for call in get_model().encode.call_args_list]
+        self.assertEqual(len(encoded), 2)
+        self.assertTrue(all(len(labels) == 6 for labels in encoded))
+        self.assertTrue(type_labels.loaded)
@@ -0,0 +1,86 @@
+import runpy
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.timezone import now
+
+from apps.search.cache import result_cache
+from apps.search.models import SearchEmbedding, SearchQueryLog
+from apps.search.warming import popular_queries
+from apps.societies.models import Society
+from .utils import HashingBackendMixin
+
+User = get_user_model()
+
+
+def log_search(query, search_type="societies", days_ago=0):
+    SearchQueryLog.objects.create(
+        query=query, search_type=search_type, result_count=1,
+        duration_ms=5.0, created_at=now() - timedelta(days=days_ago),
+    )
+
+
+class WarmCachesTest(HashingBackendMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        manager = User.objects.create_user(
+            email="warm@test.ac.uk", password="test",
+            first_name="Warm", last_name="Manager", preferred_name="WManager"
+        )
+        self.chess = Society.objects.create(
+            name="Chess Club", description="chess tournaments", society_type="academic",
+            status="approved", manager=manager
+        )
+        for query in ["Chess", "chess", "chess", "rowing"]:
+            log_search(query)
+        log_search("chess", "events")
+        log_search("film", days_ago=30)
+
+    def test_popular_queries(self):
+        self.assertEqual(popular_queries(), [("chess", "societies"), ("chess", "events"), ("rowing", "societies")])
+        self.assertEqual(popular_queries(count=1), [("chess", "societies")])
+        self.assertIn(("film", "societies"), popular_queries(days=60))
+
+    def test_every_phase_is_timed(self):
+        out = StringIO()
+        call_command("warm_caches", stdout=out)
+        output = out.getvalue()
+        for phase in ["resources", "indexes", "top_societies", "queries"]:
+            self.assertIn(phase, output)
+        self.assertIn("3 popular searches replayed (0 were already cached)", output)
+        self.assertIn("Caches warmed in", output)
+
+    def test_objects_saved_without_signals_are_embedded(self):
+        film = Society.objects.bulk_create([
+            Society(name="Film Club", description="films", status="approved", manager=self.chess.manager)
+        ])[0]
+        call_command("warm_caches", phase=["indexes"], stdout=StringIO())
+        self.assertTrue(SearchEmbedding.objects.filter(kind="society", object_id=film.id).exists())
+
+    @patch("config.functions.search_societies", return_value=([], "chess"))
+    def test_replayed_searches_are_cached(self, mock_search):
+        call_command("warm_caches", phase=["queries"], queries=1, stdout=StringIO())
+        mock_search.assert_called_once_with("chess")
+        self.assertIsNotNone(result_cache.get("chess", "societies"))
+
+        out = StringIO()
+        call_command("warm_caches", phase=["queries"], queries=1, stdout=out)
+        self.assertIn("1 popular searches replayed (1 were already cached)", out.getvalue())
+        mock_search.assert_called_once()
+
+    @patch("django.db.connections.close_all")
+    @patch("django.core.management.call_command", side_effect=RuntimeError("model download failed"))
+    def test_failed_warm_up_does_not_stop_gunicorn(self, mock_call, mock_close_all):
+        config = runpy.run_path(str(Path(settings.BASE_DIR) / "gunicorn.conf.py"))
+        server = MagicMock()
+        config["when_ready"](server)
+        mock_call.assert_called_once()
+        server.log.exception.assert_called_once()
+        mock_close_all.assert_called_once()
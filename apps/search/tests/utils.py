@@ -0,0 +1,66 @@
+import hashlib
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from django.test import override_settings
+
+from apps.search.resources import embedding_backend
+from apps.search.types import type_labels
+
+DIMENSIONS = 64
+
+
+def fake_vector(text):
+    """Deterministic bag-of-words vector, so tests never load the real model."""
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for word in (text or "").lower().split():
+        bucket = int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % DIMENSIONS
+        vector[bucket] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def fake_encode(texts, **kwargs):
+    """Stand-in for SentenceTransformer.encode."""
+    if isinstance(texts, str):
+        return fake_vector(texts)
+    return np.vstack([fake_vector(text) for text in texts]) if texts else np.empty((0, DIMENSIONS), dtype=np.float32)
+
+
+def fake_model():
+    model = MagicMock()
+    model.encode.side_effect = fake_encode
+    return model
+
+
+def reset_backend_resources():
+    embedding_backend.reset()
+    type_labels.reset()
+
+
+class FakeModelMixin:
+    """Use the MiniLM backend, serving every model.encode call in the test from fake_encode."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch("apps.search.resources.model.get", return_value=fake_model())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        override = override_settings(SEARCH_EMBEDDING_BACKEND="minilm")
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_backend_resources()
+        self.addCleanup(reset_backend_resources)
+
+
+class HashingBackendMixin:
+    """Use the scikit-learn hashing backend (real, it needs no download)."""
+
+    def setUp(self):
+        # switched before the test's own setUp, so what it indexes uses this backend
+        override = override_settings(SEARCH_EMBEDDING_BACKEND="hashing")
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_backend_resources()
+        self.addCleanup(reset_backend_resources)
+        super().setUp()
@@ -0,0 +1,37 @@
+'''type-label embeddings, computed once per process with the embedding backend'''
+import numpy as np
+
+from config.constants import EVENT_TYPE_CHOICES, SOCIETY_TYPE_CHOICES
+from .resources import get_backend, register
+
+TYPE_CHOICES = {
+    "society": SOCIETY_TYPE_CHOICES,
+    "event": EVENT_TYPE_CHOICES,
+}
+
+
+def _encode_type_labels():
+    backend = get_backend()
+    return {
+        kind: (
+            [value for value, _ in choices],
+            backend.encode([label for _, label in choices]),
+        )
+        for kind, choices in TYPE_CHOICES.items()
+    }
+
+
+type_labels = register("type_label_embeddings", _encode_type_labels)
+
+
+def best_type(kind, query_embedding, candidates=None):
+    """
+    The type whose label best matches the query. When candidates is given,
+    only those types are considered (e.g. the types that have any rows).
+    """
+    values, embeddings = type_labels.get()[kind]
+    scores = np.asarray(embeddings) @ np.asarray(query_embedding)
+    for position in np.argsort(-scores, kind="stable"):
+        if candidates is None or values[position] in candidates:
+            return values[position]
+    return None
@@ -0,0 +1,34 @@
+'''version stamps shared by every worker through the Django cache'''
+import time
+
+from django.core.cache import cache
+
+KEY_PREFIX = "search:version:"
+
+
+def _first_version():
+    # Versions start from the clock rather than 1, so after the cache is cleared
+    # a worker never mistakes the new count for the version it already holds.
+    return time.time_ns() // 1000
+
+
+def get_version(name):
+    """Current version of `name`."""
+    key = KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        first = _first_version()
+        cache.add(key, first, timeout=None)
+        version = cache.get(key, first)
+    return version
+
+
+def bump_version(name):
+    """Mark everything derived from `name` as stale and return the new version."""
+    key = KEY_PREFIX + name
+    try:
+        return cache.incr(key)
+    except ValueError:
+        first = _first_version()
+        cache.add(key, first, timeout=None)
+        return cache.get(key, first)
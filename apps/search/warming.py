@@ -0,0 +1,101 @@
+'''warming of the search caches after a deploy: model, indexes, listings and popular queries'''
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Count
+from django.db.models.functions import Lower
+from django.utils.timezone import now
+
+from .autocomplete import corpus_index
+from .cache import cached_grouped_search, cached_search
+from .index import SEARCHABLE_MODELS, get_index, index_missing
+from .models import SearchQueryLog
+from .resources import warm_up
+from .spelling import corrector
+
+DEFAULT_QUERY_COUNT = 20
+DEFAULT_QUERY_DAYS = 7
+
+
+def warm_resources():
+    """Load the search model, spelling dictionary and type-label embeddings."""
+    warm_up()
+    return "search resources loaded"
+
+
+def warm_indexes():
+    """
+    Embed any object saved without its post_save (bulk_create), then load the
+    description embeddings, the completion corpus and the spelling terms.
+    """
+    embedded = sum(index_missing(kind) for kind in SEARCHABLE_MODELS)
+    rows = sum(len(get_index(kind).ids) for kind in SEARCHABLE_MODELS)
+    corpus_index.current()
+    corrector.sync()
+    return f"{rows} description vectors loaded ({embedded} newly embedded)"
+
+
+def warm_top_societies():
+    """Work out the top societies shown on the home, society and search pages."""
+    from apps.societies.functions import top_societies
+    top = top_societies(AnonymousUser())
+    listed = len(list(top["top_overall_societies"]))
+    listed += sum(len(list(societies)) for societies in top["top_societies_per_type"].values())
+    return f"{listed} top societies listed"
+
+
+def popular_queries(count=DEFAULT_QUERY_COUNT, days=DEFAULT_QUERY_DAYS):
+    """(query, search_type) of the most frequent searches of the last `days` days, most frequent first."""
+    return [
+        (row["normalized"], row["search_type"])
+        for row in SearchQueryLog.objects.filter(created_at__gte=now() - timedelta(days=days))
+        .annotate(normalized=Lower("query"))
+        .values("normalized", "search_type")
+        .annotate(searches=Count("id"))
+        .order_by("-searches", "normalized")[:count]
+    ]
+
+
+def replay_search(query, search_type):
+    """Run a logged search through the result cache, as the search views do; True if it was cached."""
+    from apps.events.models import Event
+    from apps.societies.models import Society
+    from config.functions import SEARCH_ALL_LIMIT, search_all, search_events, search_societies
+    from config.views import SEARCH_ALL_MODELS
+
+    if search_type == "all":
+        _, _, hit = cached_grouped_search(
+            query, f"all:{SEARCH_ALL_LIMIT}", lambda q: search_all(q, SEARCH_ALL_LIMIT), SEARCH_ALL_MODELS
+        )
+    elif search_type == "events":
+        _, _, hit = cached_search(query, search_type, search_events, Event)
+    else:
+        _, _, hit = cached_search(query, "societies", search_societies, Society)
+    return hit
+
+
+def warm_queries(count=DEFAULT_QUERY_COUNT, days=DEFAULT_QUERY_DAYS):
+    """Replay the most frequent recent searches so their results are cached."""
+    queries = popular_queries(count, days)
+    cached = sum(replay_search(query, search_type) for query, search_type in queries)
+    return f"{len(queries)} popular searches replayed ({cached} were already cached)"
+
+
+PHASES = {
+    "resources": warm_resources,
+    "indexes": warm_indexes,
+    "top_societies": warm_top_societies,
+    "queries": warm_queries,
+}
+
+
+def warm_caches(phases=None, query_count=DEFAULT_QUERY_COUNT, query_days=DEFAULT_QUERY_DAYS):
+    """Run the warm-up phases in order; yields (phase, seconds, summary) as each one finishes."""
+    for name in phases or PHASES:
+        start = time.perf_counter()
+        if name == "queries":
+            summary = warm_queries(query_count, query_days)
+        else:
+            summary = PHASES[name]()
+        yield name, time.perf_counter() - start, summary
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class SocietiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.societies' 
+
+    def ready(self):
+        import apps.societies.signals
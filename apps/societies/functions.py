@@ -1,5 +1,10 @@
 '''for society functions'''
-from .models import Society, Membership, SocietyRegistration
+import base64
+import binascii
+import json
+
+from .middleware import memberships_of
+from .models import Society, Membership, MembershipRole, MembershipStatus, SocietyRegistration
 from django.contrib.auth.decorators import user_passes_test
 from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib import messages
@@ -8,8 +13,33 @@ from apps.widgets.models import Widget
 from apps.widgets.forms import ContactWidgetForm
 from apps.widgets.views import edit_leaderboard_widget, edit_featured_members_widget, edit_announcements_widget
 from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 from config.constants import SOCIETY_TYPE_CHOICES
 
+# Societies listed overall and per type by top_societies
+TOP_SOCIETIES_COUNT = 5
+TOP_SOCIETIES_CACHE_KEY = 'societies:top'
+
+# Societies per page of the societies listing
+SOCIETIES_PAGE_SIZE = 24
+
+# Listing sort option -> (field, descending); every order ends on id so ties page stably
+SOCIETY_SORTS = {
+    'name_asc': ('name', False),
+    'name_desc': ('name', True),
+    'date_newest': ('created_at', True),
+    'date_oldest': ('created_at', False),
+    'price_low_high': ('joining_fee', False),
+    'price_high_low': ('joining_fee', True),
+    'popularity': ('members_count', True),
+    'availability': ('members_count', False),
+}
+DEFAULT_SOCIETY_SORT = 'name_asc'
+
 def staff_required(user):
     return user.is_staff
 
@@ -69,33 +99,129 @@ def get_all_users():
 register = template.Library()
 
 @register.filter
-def get_user_membership(all_memberships, user):
+def get_user_membership(society, request):
     """
     Usage in template:
-      {% with my_membership=society.society_memberships.all|get_user_membership:user %}
+      {% with my_membership=society|get_user_membership:request %}
         ...
       {% endwith %}
-    Returns the membership object for the given user, or None if not found.
+    Returns the request user's membership of the society, or None if not found,
+    from the user's memberships loaded once for the request.
     """
-    return all_memberships.filter(user=user).first()
+    return memberships_of(request).membership(society)
 
 
-def top_societies(user):
-    """Return a dict with top societies per type and top overall societies."""
-    top_societies_per_type = {}
-    all_approved = approved_societies(user)
-
-    for society_type, _ in SOCIETY_TYPE_CHOICES:
-        top_societies_per_type[society_type] = (
-            all_approved.filter(society_type=society_type).order_by('-members_count')[:5]
-        )
+def rank_top_societies(user):
+    """Top approved societies by members_count, per type and overall, from a single window query."""
+    by_members = [F('members_count').desc(), F('id').asc()]
+    ranked = approved_societies(user).annotate(
+        type_rank=Window(RowNumber(), partition_by=[F('society_type')], order_by=by_members),
+        overall_rank=Window(RowNumber(), order_by=by_members),
+    ).filter(
+        Q(type_rank__lte=TOP_SOCIETIES_COUNT) | Q(overall_rank__lte=TOP_SOCIETIES_COUNT)
+    ).order_by('-members_count', 'id')
 
-    top_overall_societies = all_approved.order_by('-members_count')[:5]
+    top_societies_per_type = {society_type: [] for society_type, _ in SOCIETY_TYPE_CHOICES}
+    top_overall_societies = []
+    for society in ranked:
+        if society.overall_rank <= TOP_SOCIETIES_COUNT:
+            top_overall_societies.append(society)
+        if society.type_rank <= TOP_SOCIETIES_COUNT and society.society_type in top_societies_per_type:
+            top_societies_per_type[society.society_type].append(society)
     return {
         'top_overall_societies': top_overall_societies,
         'top_societies_per_type': top_societies_per_type
     }
 
+
+def top_societies(user):
+    """Return a dict with top societies per type and top overall societies.
+    The result is cached until a society or membership changes, so a page pays one cache read."""
+    top = cache.get(TOP_SOCIETIES_CACHE_KEY)
+    if top is None:
+        top = rank_top_societies(user)
+        cache.set(TOP_SOCIETIES_CACHE_KEY, top, getattr(settings, 'TOP_SOCIETIES_CACHE_TIMEOUT', 3600))
+    return top
+
+
+def invalidate_top_societies():
+    cache.delete(TOP_SOCIETIES_CACHE_KEY)
+
+
+def attach_membership_states(societies, user):
+    """
+    Set `membership_state` on each society of a listing page: 'manager' if
+    the user runs it (manager or co-manager), 'member' or 'pending' for
+    their membership, None otherwise. One query covers the whole page.
+    Returns `societies`, whose rows (a queryset's too) are evaluated once.
+    """
+    page = list(societies)
+    memberships = {}
+    if user.is_authenticated and page:
+        memberships = {
+            membership.society_id: membership
+            for membership in Membership.objects.filter(user=user, society__in=[society.pk for society in page])
+        }
+    for society in page:
+        membership = memberships.get(society.pk)
+        if society.manager_id == user.pk or (
+            membership and membership.status == MembershipStatus.APPROVED
+            and membership.role in (MembershipRole.MANAGER, MembershipRole.CO_MANAGER)
+        ):
+            society.membership_state = 'manager'
+        elif membership and membership.status == MembershipStatus.APPROVED:
+            society.membership_state = 'member'
+        elif membership and membership.status == MembershipStatus.PENDING:
+            society.membership_state = 'pending'
+        else:
+            society.membership_state = None
+    return societies
+
+
+def encode_society_cursor(society, field):
+    """Opaque cursor for the position just after `society` in a listing sorted on `field`."""
+    value = Society._meta.get_field(field).value_to_string(society)
+    raw = json.dumps([field, value, society.pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_society_cursor(cursor, field):
+    """(value, id) held by a cursor for `field`; None if missing, malformed or made for another sort."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_field, value, pk = json.loads(raw)
+        if cursor_field != field:
+            return None
+        return Society._meta.get_field(field).to_python(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, ValidationError):
+        return None
+
+
+def keyset_page(queryset, sort, cursor=None, page_size=None):
+    """
+    One page of societies in `sort` order, starting after `cursor`. The
+    position is a (value, id) pair rather than an offset, so every page
+    is an indexed range read however deep the listing goes. Returns the
+    rows and the cursor of the next page, or None on the last page.
+    """
+    page_size = page_size or SOCIETIES_PAGE_SIZE
+    field, descending = SOCIETY_SORTS.get(sort, SOCIETY_SORTS[DEFAULT_SOCIETY_SORT])
+    direction, after_lookup = ('-', 'lt') if descending else ('', 'gt')
+    queryset = queryset.order_by(f'{direction}{field}', f'{direction}id')
+
+    position = decode_society_cursor(cursor, field)
+    if position is not None:
+        value, pk = position
+        queryset = queryset.filter(
+            Q(**{f'{field}__{after_lookup}': value}) | Q(**{field: value, f'id__{after_lookup}': pk})
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = encode_society_cursor(rows[page_size - 1], field) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
 @user_passes_test(staff_required)
 def approve_society(request, registration_id):
     """Approve a society registration and create the actual Society."""
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from apps.societies.functions import invalidate_top_societies
+from apps.societies.models import MembershipStatus, Society
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the approved memberships of every society and fix any members_count "
+        "that has drifted from them (e.g. after bulk edits that bypass the membership signals)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the societies whose count is wrong, without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Society.objects.annotate(
+                approved_members=Count(
+                    "society_memberships",
+                    filter=Q(society_memberships__status=MembershipStatus.APPROVED),
+                )
+            )
+            .exclude(members_count=F("approved_members"))
+            .order_by("id")
+        )
+        for society in drifted:
+            self.stdout.write(f"  {society.name}: {society.members_count} -> {society.approved_members}")
+            society.members_count = society.approved_members
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Every members_count matches its approved memberships."))
+            return
+        if options["dry_run"]:
+            self.stdout.write(f"{len(drifted)} society count(s) out of step (dry run, nothing changed).")
+            return
+        Society.objects.bulk_update(drifted, ["members_count"])
+        invalidate_top_societies()
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(drifted)} society count(s)."))
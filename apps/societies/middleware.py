@@ -0,0 +1,99 @@
+'''per-request resolution of the signed-in user's society memberships, shared by the permission checks'''
+from django.utils.functional import SimpleLazyObject, cached_property
+
+from .models import Membership, MembershipRole, MembershipStatus
+
+# Roles allowed to post events and news and to edit a society's page
+MANAGING_ROLES = (MembershipRole.MANAGER, MembershipRole.CO_MANAGER, MembershipRole.EDITOR)
+
+
+def _society_id(society):
+    return getattr(society, 'pk', society)
+
+
+class MembershipResolver:
+    """
+    Every membership of one user, loaded with a single query the first time
+    one is asked for and then answered from memory for the rest of the
+    request. Societies can be passed as instances or ids.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def memberships(self):
+        """{society_id: Membership} of the user, whatever their status."""
+        if not self.user.is_authenticated:
+            return {}
+        return {membership.society_id: membership for membership in Membership.objects.filter(user=self.user)}
+
+    @cached_property
+    def roles(self):
+        """{society_id: role} of the user's approved memberships."""
+        return {
+            society_id: membership.role
+            for society_id, membership in self.memberships.items()
+            if membership.status == MembershipStatus.APPROVED
+        }
+
+    def membership(self, society):
+        """The user's membership of `society` in any status, or None."""
+        return self.memberships.get(_society_id(society))
+
+    def approved_membership(self, society):
+        """The user's approved membership of `society`, or None."""
+        if _society_id(society) in self.roles:
+            return self.memberships[_society_id(society)]
+        return None
+
+    def role(self, society):
+        """The user's role in `society` if they are an approved member, else None."""
+        return self.roles.get(_society_id(society))
+
+    def has_role(self, society, roles):
+        return self.role(society) in roles
+
+    def membership_with_role(self, societies, roles):
+        """The user's approved membership of the first of `societies` where they hold one of `roles`, or None."""
+        for society in societies:
+            if self.has_role(society, roles):
+                return self.approved_membership(society)
+        return None
+
+    def has_any_role(self, societies, roles):
+        return self.membership_with_role(societies, roles) is not None
+
+
+def memberships_of(request):
+    """
+    The MembershipResolver of the request's user, created on first use and kept
+    on the request, so nothing outlives it. A new one is made if the request
+    changes user (a login or logout half-way through).
+    """
+    resolver = getattr(request, '_membership_resolver', None)
+    if resolver is None or resolver.user is not request.user:
+        resolver = request._membership_resolver = MembershipResolver(request.user)
+    return resolver
+
+
+class MembershipResolverMiddleware:
+    """
+    Attaches the user's MembershipResolver as `request.memberships` and,
+    for views of one society (a `society_id` URL argument), the user's
+    approved membership of it as `request.user_membership`.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.memberships = SimpleLazyObject(lambda: memberships_of(request))
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        society_id = view_kwargs.get('society_id')
+        if society_id is not None and request.user.is_authenticated:
+            request.user_membership = memberships_of(request).approved_membership(society_id)
+        return None
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('societies', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='society',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='society_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='society',
+            index=models.Index(fields=['status', 'joining_fee', 'id'], name='society_status_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='society',
+            index=models.Index(fields=['status', 'members_count', 'id'], name='society_status_members_idx'),
+        ),
+    ]
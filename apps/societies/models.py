@@ -3,8 +3,6 @@ from django.conf import settings
 from django.apps import apps
 from apps.users.models import CustomUser
 from config.constants import VISIBILITY_CHOICES, REGISTRATION_STATUS_CHOICES
-from django.db.models.signals import m2m_changed
-from django.dispatch import receiver
 
 
 class Society(models.Model):
@@ -65,6 +63,14 @@ class Society(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_status_display()})"
 
+    class Meta:
+        # keyset pages of the societies listing: approved societies in each sort order, ties on id
+        indexes = [
+            models.Index(fields=["status", "created_at", "id"], name="society_status_created_idx"),
+            models.Index(fields=["status", "joining_fee", "id"], name="society_status_fee_idx"),
+            models.Index(fields=["status", "members_count", "id"], name="society_status_members_idx"),
+        ]
+
 
 # should be in constants
 class MembershipRole(models.TextChoices):
@@ -91,11 +97,6 @@ class Membership(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.society.name} ({self.role})"
 
-@receiver(m2m_changed, sender=Society.members.through)
-def update_members_count(sender, instance, action, **kwargs):
-    if action in ["post_add", "post_remove", "post_clear"]:
-        instance.members_count = instance.members.filter(is_active=True).count()
-        instance.save()
 
 
 
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .functions import invalidate_top_societies
+from .models import Membership, MembershipStatus, Society
+
+
+def _adjust_members_count(society_id, delta):
+    # a single UPDATE ... SET members_count = members_count + delta, so concurrent joins never lose a count
+    if delta:
+        Society.objects.filter(pk=society_id).update(members_count=F('members_count') + delta)
+
+
+@receiver(post_init, sender=Membership)
+def remember_membership_status(sender, instance, **kwargs):
+    """Note whether this membership is already counted in its society's members_count."""
+    instance._counted = instance.pk is not None and instance.status == MembershipStatus.APPROVED
+
+
+@receiver(post_save, sender=Membership)
+def count_membership(sender, instance, raw=False, **kwargs):
+    """Keep members_count in step when a membership becomes (or stops being) approved."""
+    if raw:
+        return
+    counted = instance.status == MembershipStatus.APPROVED
+    _adjust_members_count(instance.society_id, int(counted) - int(instance._counted))
+    instance._counted = counted
+
+
+@receiver(post_delete, sender=Membership)
+def uncount_membership(sender, instance, **kwargs):
+    """Take a deleted approved membership off its society's members_count."""
+    if instance._counted:
+        _adjust_members_count(instance.society_id, -1)
+        instance._counted = False
+
+
+@receiver(m2m_changed, sender=Society.members.through)
+def count_added_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    society.members.add() bulk-creates its memberships without post_save, so the
+    approved ones (through_defaults={'status': 'approved'}) are counted here.
+    Removals go through post_delete as usual.
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        added = Membership.objects.filter(user=instance, society_id__in=pk_set)
+    else:
+        added = Membership.objects.filter(society=instance, user_id__in=pk_set)
+    for society_id in added.filter(status=MembershipStatus.APPROVED).values_list('society_id', flat=True):
+        _adjust_members_count(society_id, 1)
+
+
+# Connected after the members_count receivers above, so that outside a transaction
+# (where on_commit runs straight away) the ranking is dropped after the count moved.
+@receiver(post_save, sender=Society)
+@receiver(post_delete, sender=Society)
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+@receiver(m2m_changed, sender=Society.members.through)
+def refresh_top_societies(sender, **kwargs):
+    """
+    Drop the cached top societies once a change to a society or its membership
+    is committed; dropping it earlier would let a concurrent request cache the
+    old ranking again before the new members_count is visible.
+    """
+    # m2m_changed (Membership is the through model) fires before and after; act once it is done
+    if not kwargs.get('action', 'post_').startswith('post_'):
+        return
+    transaction.on_commit(invalidate_top_societies)
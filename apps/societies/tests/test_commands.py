@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.societies.models import Membership, MembershipStatus, Society
+from apps.users.models import CustomUser
+
+
+class ReconcileMemberCountsTest(TestCase):
+    """Tests for the reconcile_member_counts command."""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(
+            email="counts@example.com", first_name="Count", last_name="User",
+            preferred_name="Counter", password="password"
+        )
+        self.society = Society.objects.create(
+            name="Count Society", description="counting", society_type="type1",
+            manager=self.manager, status="approved"
+        )
+        Membership.objects.create(user=self.manager, society=self.society, status=MembershipStatus.APPROVED)
+        # drift the stored count, as a bulk edit bypassing the signals would
+        Society.objects.filter(pk=self.society.pk).update(members_count=7)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("reconcile_member_counts", *args, stdout=out)
+        return out.getvalue()
+
+    def test_fixes_drifted_count(self):
+        output = self.run_command()
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 1)
+        self.assertIn("Count Society: 7 -> 1", output)
+        self.assertIn("Fixed 1", output)
+        self.assertIn("matches", self.run_command())
+
+    def test_dry_run_changes_nothing(self):
+        output = self.run_command("--dry-run")
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 7)
+        self.assertIn("dry run", output)
@@ -1,4 +1,5 @@
 from django.test import TestCase, RequestFactory
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.sessions.middleware import SessionMiddleware
@@ -8,7 +9,8 @@ from apps.societies.models import Society, Membership, SocietyRegistration
 from apps.users.models import CustomUser
 from apps.societies.functions import (
     staff_required, approved_societies, get_societies, manage_societies,
-    get_all_users, get_user_membership, top_societies, approve_society
+    get_all_users, get_user_membership, top_societies, approve_society,
+    rank_top_societies, TOP_SOCIETIES_CACHE_KEY, SOCIETY_SORTS, keyset_page, encode_society_cursor
 )
 
 class FunctionsTestCase(TestCase):
@@ -111,11 +113,12 @@ class FunctionsTestCase(TestCase):
         self.assertNotIn(new_user, get_all_users())
     
     def test_get_user_membership_valid(self):
-        memberships = Membership.objects.all()
-        self.assertEqual(get_user_membership(memberships, self.regular_user), self.membership)
+        request = self.factory.get("/")
+        request.user = self.regular_user
+        self.assertEqual(get_user_membership(self.society, request), self.membership)
     
     def test_get_user_membership_invalid(self):
-        memberships = Membership.objects.all()
+        request = self.factory.get("/")
         new_user = CustomUser.objects.create_user(
             email="new_user@university.ac.uk",
             first_name="New",
@@ -123,7 +126,8 @@ class FunctionsTestCase(TestCase):
             preferred_name="NewUser",
             password="pass"
         )
-        self.assertIsNone(get_user_membership(memberships, new_user))
+        request.user = new_user
+        self.assertIsNone(get_user_membership(self.society, request))
     
     def test_top_societies(self):
         top = top_societies(self.superuser)
@@ -135,6 +139,58 @@ class FunctionsTestCase(TestCase):
         Society.objects.all().delete()
         top = top_societies(self.superuser)
         self.assertEqual(len(top["top_overall_societies"]), 0)
+
+    def test_top_societies_ranked_in_one_query(self):
+        for i in range(7):
+            Society.objects.create(
+                name=f"Arts {i}", society_type="arts", status="approved",
+                members_count=i, manager=self.staff_user
+            )
+        Society.objects.create(
+            name="Pending Arts", society_type="arts", status="pending",
+            members_count=100, manager=self.staff_user
+        )
+        with self.assertNumQueries(1):
+            top = rank_top_societies(self.superuser)
+        self.assertEqual(
+            [society.name for society in top["top_societies_per_type"]["arts"]],
+            ["Arts 6", "Arts 5", "Arts 4", "Arts 3", "Arts 2"]
+        )
+        self.assertEqual(
+            [society.name for society in top["top_overall_societies"]],
+            ["Test Society", "Arts 6", "Arts 5", "Arts 4", "Arts 3"]
+        )
+        self.assertEqual(top["top_societies_per_type"]["sports"], [])
+
+    def test_top_societies_cached_until_memberships_change(self):
+        top_societies(self.superuser)
+        # one cache read, no ranking query
+        with self.assertNumQueries(1):
+            top = top_societies(self.superuser)
+        self.assertEqual(top["top_overall_societies"], [self.society])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Society.objects.create(
+                name="Other Society", status="approved", members_count=20, manager=self.staff_user
+            )
+        self.assertEqual(top_societies(self.superuser)["top_overall_societies"], [other, self.society])
+        with self.captureOnCommitCallbacks(execute=True):
+            Membership.objects.filter(society=self.society).delete()
+        self.assertIsNone(cache.get(TOP_SOCIETIES_CACHE_KEY))
+
+    def test_top_societies_dropped_only_after_commit(self):
+        top_societies(self.superuser)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Membership.objects.create(
+                society=self.society, user=self.superuser, status="approved"
+            )
+            # still cached until the join commits
+            self.assertIsNotNone(cache.get(TOP_SOCIETIES_CACHE_KEY))
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 11)
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(TOP_SOCIETIES_CACHE_KEY))
     
     def test_approve_society_success(self):
         request = self.factory.get(reverse("admin_pending_societies"))
@@ -151,4 +207,57 @@ class FunctionsTestCase(TestCase):
         request = self.factory.get(reverse("admin_pending_societies"))
         request.user = self.regular_user
         response = approve_society(request, self.pending_registration.id)
-        self.assertEqual(Society.objects.filter(name="Pending Society").count(), 0)
\ No newline at end of file
+        self.assertEqual(Society.objects.filter(name="Pending Society").count(), 0)
+
+
+class KeysetPageTest(TestCase):
+    def setUp(self):
+        manager = CustomUser.objects.create_user(
+            email="keyset@university.ac.uk", first_name="Key", last_name="Set",
+            preferred_name="KeySet", password="pass"
+        )
+        created = timezone.now()
+        for i in range(7):
+            # pairs of equal fees, counts and creation times so the id tiebreaker is exercised
+            society = Society.objects.create(
+                name=f"Society {i}", description="keyset", status="approved",
+                joining_fee=i // 2, members_count=i // 2, manager=manager
+            )
+            Society.objects.filter(pk=society.pk).update(created_at=created + timezone.timedelta(hours=i // 2))
+        Society.objects.create(name="Hidden", status="pending", manager=manager)
+        self.societies = Society.objects.filter(status="approved")
+
+    def read_all(self, sort, page_size):
+        seen, cursor = [], None
+        while True:
+            page, cursor = keyset_page(self.societies, sort, cursor, page_size)
+            seen.extend(society.name for society in page)
+            if cursor is None:
+                return seen
+
+    def test_every_sort_pages_through_every_society_once(self):
+        for sort, (field, descending) in SOCIETY_SORTS.items():
+            order = [f"-{field}", "-id"] if descending else [field, "id"]
+            expected = list(self.societies.order_by(*order).values_list("name", flat=True))
+            for page_size in (1, 2, 3, 7):
+                with self.subTest(sort=sort, page_size=page_size):
+                    self.assertEqual(self.read_all(sort, page_size), expected)
+
+    def test_each_page_is_one_query(self):
+        _, cursor = keyset_page(self.societies, "popularity", None, 3)
+        with self.assertNumQueries(1):
+            page, _ = keyset_page(self.societies, "popularity", cursor, 3)
+        self.assertEqual(len(page), 3)
+
+    def test_bad_cursor_starts_at_top(self):
+        first, _ = keyset_page(self.societies, "name_asc", None, 3)
+        name_cursor = encode_society_cursor(first[0], "name")
+        for cursor in ["not-a-cursor", "e30", name_cursor]:
+            with self.subTest(cursor=cursor):
+                # a cursor made for another sort is ignored too
+                page, _ = keyset_page(self.societies, "price_low_high", cursor, 3)
+                self.assertEqual(page, keyset_page(self.societies, "price_low_high", None, 3)[0])
+
+    def test_unknown_sort_uses_name(self):
+        page, _ = keyset_page(self.societies, "bogus", None, 3)
+        self.assertEqual([society.name for society in page], ["Society 0", "Society 1", "Society 2"])
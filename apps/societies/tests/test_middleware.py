@@ -0,0 +1,100 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from apps.news.models import News
+from apps.societies.functions import get_user_membership
+from apps.societies.middleware import MANAGING_ROLES, MembershipResolverMiddleware, memberships_of
+from apps.societies.models import Membership, MembershipRole, MembershipStatus, Society
+from apps.users.models import CustomUser
+
+
+class MembershipResolverTest(TestCase):
+    """Tests for the per-request membership resolver and its middleware."""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(
+            email="resolver-manager@example.com", first_name="Res", last_name="Manager",
+            preferred_name="ResManager", password="password"
+        )
+        self.user = CustomUser.objects.create_user(
+            email="resolver@example.com", first_name="Res", last_name="User",
+            preferred_name="Resolver", password="password"
+        )
+        self.chess = Society.objects.create(name="Chess", status="approved", manager=self.manager)
+        self.drama = Society.objects.create(name="Drama", status="approved", manager=self.manager)
+        self.film = Society.objects.create(name="Film", status="approved", manager=self.manager)
+        Membership.objects.create(
+            society=self.chess, user=self.user, role=MembershipRole.EDITOR, status=MembershipStatus.APPROVED
+        )
+        Membership.objects.create(
+            society=self.drama, user=self.user, role=MembershipRole.CO_MANAGER, status=MembershipStatus.PENDING
+        )
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_memberships_loaded_once(self):
+        request = self.request_for(self.user)
+        resolver = memberships_of(request)
+        with self.assertNumQueries(1):
+            self.assertEqual(resolver.roles, {self.chess.id: MembershipRole.EDITOR})
+            self.assertTrue(resolver.has_role(self.chess, MANAGING_ROLES))
+            self.assertTrue(resolver.has_any_role([self.film, self.chess.id], MANAGING_ROLES))
+            # pending memberships are known but grant no role
+            self.assertEqual(resolver.membership(self.drama).status, MembershipStatus.PENDING)
+            self.assertIsNone(resolver.role(self.drama))
+            self.assertIsNone(resolver.approved_membership(self.drama))
+            self.assertIsNone(resolver.membership(self.film))
+        self.assertIs(memberships_of(request), resolver)
+
+    def test_resolver_kept_on_the_request(self):
+        first = memberships_of(self.request_for(self.user))
+        # the same user object on a later request gets fresh memberships
+        Membership.objects.create(society=self.film, user=self.user, status=MembershipStatus.APPROVED)
+        later = memberships_of(self.request_for(self.user))
+        self.assertIsNot(later, first)
+        self.assertIsNotNone(later.approved_membership(self.film))
+        # so does a request whose user changes half-way through
+        request = self.request_for(AnonymousUser())
+        self.assertEqual(memberships_of(request).roles, {})
+        request.user = self.user
+        self.assertIn(self.film.id, memberships_of(request).roles)
+
+    def test_anonymous_user_has_no_memberships(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(memberships_of(self.request_for(AnonymousUser())).roles, {})
+
+    def test_middleware_sets_user_membership_for_society_views(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        middleware = MembershipResolverMiddleware(lambda request: None)
+        middleware(request)
+        middleware.process_view(request, None, (), {"society_id": self.chess.id})
+        self.assertEqual(request.user_membership.role, MembershipRole.EDITOR)
+        self.assertEqual(request.memberships.role(self.chess), MembershipRole.EDITOR)
+
+        middleware.process_view(request, None, (), {"society_id": self.drama.id})
+        self.assertIsNone(request.user_membership)
+
+    def test_get_user_membership_filter_uses_resolver(self):
+        request = self.request_for(self.user)
+        memberships_of(request).memberships
+        with self.assertNumQueries(0):
+            found = [get_user_membership(society, request) for society in [self.chess, self.drama, self.film]]
+        self.assertEqual([membership and membership.society_id for membership in found],
+                         [self.chess.id, self.drama.id, None])
+
+    def test_editor_can_delete_news(self):
+        news = News.objects.create(title="Old news", content="...", society=self.chess)
+        self.client.login(email="resolver@example.com", password="password")
+        self.client.post(reverse("delete_news", args=[news.id]))
+        self.assertFalse(News.objects.filter(id=news.id).exists())
+
+    def test_pending_member_cannot_delete_news(self):
+        news = News.objects.create(title="Drama news", content="...", society=self.drama)
+        self.client.login(email="resolver@example.com", password="password")
+        self.client.post(reverse("delete_news", args=[news.id]))
+        self.assertTrue(News.objects.filter(id=news.id).exists())
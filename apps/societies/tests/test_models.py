@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from apps.societies.models import (
-    Society, Membership, MembershipApplication, SocietyRequirement, SocietyQuestion,
+    Society, Membership, MembershipApplication, MembershipStatus, SocietyRequirement, SocietyQuestion,
     RequirementType, SocietyRegistration, SocietyExtraForm
 )
 from apps.widgets.models import Widget
@@ -48,10 +48,50 @@ class SocietyModelTest(TestCase):
             self.society.get_events().filter(non_existent_field=True)
     
     def test_update_members_count(self):
-        """Test that adding a member updates the members_count field."""
+        """Test that adding an approved member updates the members_count field."""
+        self.society.members.add(self.user, through_defaults={"status": MembershipStatus.APPROVED})
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 1)
+
+    def test_pending_member_not_counted(self):
+        """Test that adding a pending member leaves the members_count field alone."""
         self.society.members.add(self.user)
         self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 0)
+
+    def test_members_count_follows_membership_status(self):
+        """Test that members_count is kept in step as a membership is approved, demoted and deleted."""
+        membership = Membership.objects.create(user=self.user, society=self.society)
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 0)
+
+        membership.status = MembershipStatus.APPROVED
+        membership.save()
+        membership.save()
+        self.society.refresh_from_db()
         self.assertEqual(self.society.members_count, 1)
+
+        Membership.objects.get(pk=membership.pk).delete()
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 0)
+
+    def test_members_count_rejected_membership(self):
+        """Test that an approved membership which is rejected is no longer counted."""
+        membership = Membership.objects.create(
+            user=self.user, society=self.society, status=MembershipStatus.APPROVED
+        )
+        membership = Membership.objects.get(pk=membership.pk)
+        membership.status = MembershipStatus.REJECTED
+        membership.save()
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 0)
+
+    def test_members_count_remove_member(self):
+        """Test that removing an approved member through the relation decrements members_count."""
+        self.society.members.add(self.user, through_defaults={"status": MembershipStatus.APPROVED})
+        self.society.members.remove(self.user)
+        self.society.refresh_from_db()
+        self.assertEqual(self.society.members_count, 0)
     
     def test_str_representation(self):
         """Test the string representation of a Society"""
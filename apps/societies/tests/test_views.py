@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve
 from django.contrib.auth import get_user_model
 from django.contrib import messages
@@ -10,8 +12,8 @@ import json
 from apps.societies import views
 from apps.societies.models import Society, SocietyRegistration, Membership, MembershipRole, MembershipStatus, MembershipApplication
 from apps.news.models import News
-from apps.widgets.models import Widget
-from apps.societies.functions import get_societies, manage_societies, get_all_users
+from apps.widgets.models import LeaderboardPoints, Widget
+from apps.societies.functions import attach_membership_states, get_societies, manage_societies, get_all_users
 
 class SocietiesViewsTest(TestCase):
     def setUp(self):
@@ -76,6 +78,82 @@ class SocietiesViewsTest(TestCase):
         self.assertEqual(len(response.context['societies']), 1)  # Expecting 1 test society
         self.assertIn(self.society, response.context['societies'])
 
+    @patch("apps.societies.functions.SOCIETIES_PAGE_SIZE", 2)
+    def test_societies_page_paginated(self):
+        for name in ["Art Club", "Book Club", "Chess Club", "Drama Club"]:
+            Society.objects.create(
+                name=name, description="club", society_type="arts",
+                status="approved", visibility="Public", manager=self.user
+            )
+        names = []
+        response = self.client.get(reverse("societiespage"), {"sort": "name_asc", "society_type": "arts"})
+        names += [society.name for society in response.context["societies"]]
+        self.assertEqual(names, ["Art Club", "Book Club"])
+        self.assertIn("society_type=arts", response.context["next_url"])
+
+        next_url = response.context["next_fragment_url"]
+        while next_url:
+            data = self.client.get(next_url).json()
+            self.assertIn("View Details", data["html"])
+            names += [name for name in ["Chess Club", "Drama Club"] if name in data["html"]]
+            if data["next"]:
+                self.assertTrue(data["next_url"].startswith(reverse("societiespage")))
+            next_url = data["next"]
+        self.assertEqual(names, ["Art Club", "Book Club", "Chess Club", "Drama Club"])
+
+    def test_listing_pages_issue_constant_queries(self):
+        """Listing pages cost the same number of queries however many societies they show."""
+        other = get_user_model().objects.create_user(
+            email="listing-owner@example.com", password="password",
+            first_name="List", last_name="Owner", preferred_name="Owner"
+        )
+
+        def add_societies(start, count):
+            for i in range(start, start + count):
+                society = Society.objects.create(
+                    name=f"Listing {i:02d}", description="listing", society_type="arts",
+                    status="approved", visibility="Public", manager=other
+                )
+                Membership.objects.create(
+                    society=society, user=self.user,
+                    status=MembershipStatus.APPROVED if i % 2 else MembershipStatus.PENDING
+                )
+
+        urls = [reverse("societiespage"), reverse("societiespage_more"), reverse("my_societies")]
+        add_societies(0, 2)
+        baseline = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            baseline[url] = len(queries)
+
+        add_societies(2, 10)
+        for url in urls:
+            with self.subTest(url=url), self.assertNumQueries(baseline[url]):
+                response = self.client.get(url)
+        states = {society.name: society.membership_state for society in response.context["societies"]}
+        self.assertEqual(states["Tech Club"], "manager")
+        self.assertEqual(states["Listing 01"], "member")
+
+    def test_listing_membership_states_in_one_query(self):
+        pending = Society.objects.create(
+            name="Pending Club", description="club", society_type="arts",
+            status="approved", visibility="Public", manager=get_user_model().objects.create_user(
+                email="pending-owner@example.com", password="password",
+                first_name="Pending", last_name="Owner", preferred_name="Pending"
+            )
+        )
+        Membership.objects.create(society=pending, user=self.user, status=MembershipStatus.PENDING)
+        societies = list(Society.objects.order_by("name"))
+        with self.assertNumQueries(1):
+            attach_membership_states(societies, self.user)
+        self.assertEqual([society.membership_state for society in societies], ["pending", "manager"])
+
+    def test_societies_page_last_page_has_no_next(self):
+        response = self.client.get(reverse("societiespage"))
+        self.assertIsNone(response.context["next_url"])
+        self.assertNotContains(response, 'id="societies-more"')
+
     def test_create_society(self):
         post_data = {
             "name": "Art Club",
@@ -1638,6 +1716,39 @@ class ExtraViewsTest(TestCase):
         widget_types = [w.widget_type for w in widgets]
         self.assertNotIn("discussion", widget_types)
 
+    def test_society_page_leaderboard_top_entries(self):
+        """
+        Test that the leaderboard shows its top members and that the page's
+        query count does not grow with the size of the leaderboard.
+        """
+        def leaderboard_page(member_count):
+            Widget.objects.filter(society=self.society).delete()
+            widget = Widget.objects.create(
+                society=self.society, widget_type="leaderboard", position=0,
+                data={"display_points": True, "display_count": 3}
+            )
+            for i in range(member_count):
+                member = User.objects.create_user(
+                    email=f"board{member_count}-{i}@example.com", password="pass",
+                    first_name=f"Board{i}", last_name="Member", preferred_name=f"Board{i}"
+                )
+                membership = Membership.objects.create(
+                    society=self.society, user=member, status=MembershipStatus.APPROVED
+                )
+                LeaderboardPoints.objects.create(widget=widget, membership=membership, points=i)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("society_page", args=[self.society.id]))
+            return response, len(queries)
+
+        _, few_queries = leaderboard_page(4)
+        response, many_queries = leaderboard_page(40)
+        widget = response.context["widgets"][0]
+        self.assertEqual(
+            widget.top_entries,
+            [("Board39 Member", 39), ("Board38 Member", 38), ("Board37 Member", 37)]
+        )
+        self.assertEqual(few_queries, many_queries)
+
     def test_leave_society_not_member(self):
         """
         Test that leave_society displays an error when the user is not a member.
@@ -21,6 +21,7 @@ from apps.widgets.views import remove_widget
 
 urlpatterns = [
     path('societiespage/', societiespage, name='societiespage'),
+    path('societiespage/more/', societiespage_more, name='societiespage_more'),
     path('my_societies/', my_societies, name='my_societies'),
     path('manage_societies/', view_manage_societies, name= 'manage_societies'),
     path('all_members/', view_all_members, name= 'all_members'),
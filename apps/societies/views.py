@@ -1,12 +1,17 @@
 from .models import Society, Membership, MembershipRole, MembershipStatus, RequirementType
-from .functions import approved_societies, get_societies, manage_societies, get_all_users, top_societies
+from .functions import (
+    DEFAULT_SOCIETY_SORT, approved_societies, attach_membership_states, get_societies, keyset_page, manage_societies,
+    get_all_users, top_societies,
+)
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from .forms import NewSocietyForm, JoinSocietyForm
+from .middleware import memberships_of
 from apps.news.models import News
 from django.db.models import Count
 from django.http import JsonResponse, HttpResponseNotFound
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
@@ -15,60 +20,86 @@ from django.utils.timezone import now, timezone
 from .models import Society, SocietyRegistration
 from .forms import NewSocietyForm
 from apps.news.models import News
-from apps.panels.models import Poll
 from config.functions import get_recent_news
 from apps.widgets.models import Widget
+from apps.widgets.fragments import render_widget_fragments
+from apps.widgets.functions import reorder_widgets
 from config.filters import SocietyFilter
+from apps.search.results import load_result_set, parse_cursor, result_page
 from config.constants import SOCIETY_TYPE_CHOICES
 import json
 
-def societiespage(request):
-    societies = approved_societies(request.user)
+def _societies_listing(request):
+    """
+    One page of the societies listing and the query parameters of the next
+    page (None on the last). Search results keep their stored ranking;
+    otherwise the page is a keyset page in the chosen sort order.
+    """
+    # Search results arrive as a token for the ranking stored by ai_search
+    result_set = load_result_set(request.GET.get("results"), "societies")
 
-    search_type = request.session.get('search_type', None) 
-    search_ids = request.session.get('search_ids', [])
+    filtered_societies = SocietyFilter(
+        request.GET, queryset=approved_societies(request.user), request=request
+    ).qs
 
-    if search_type == 'societies' and search_ids:
-        societies = societies.filter(id__in=search_ids) 
-    
-    filtered_societies = SocietyFilter(request.GET, queryset=societies, request=request).qs
+    if result_set is not None:
+        # Keep the search ranking and fetch only the rows of this page
+        page, next_after = result_page(
+            filtered_societies, result_set.ids, parse_cursor(request.GET.get("after"))
+        )
+        next_page = None if next_after is None else {"results": result_set.token, "after": next_after}
+    else:
+        page, next_cursor = keyset_page(
+            filtered_societies, request.GET.get("sort", DEFAULT_SOCIETY_SORT), request.GET.get("cursor")
+        )
+        next_page = None if next_cursor is None else {"cursor": next_cursor}
+    return page, next_page, result_set
 
-    sort_option = request.GET.get("sort", "name_asc")
-    
-    recent_news = get_recent_news()
 
-    if sort_option == "name_asc":
-        filtered_societies = filtered_societies.order_by("name")
-    elif sort_option == "name_desc":
-        filtered_societies = filtered_societies.order_by("-name")
-    elif sort_option == "date_newest":
-        filtered_societies = filtered_societies.order_by("-created_at")
-    elif sort_option == "date_oldest":
-        filtered_societies = filtered_societies.order_by("created_at")
-    elif sort_option == "price_low_high":
-        filtered_societies = filtered_societies.order_by("joining_fee")
-    elif sort_option == "price_high_low":
-        filtered_societies = filtered_societies.order_by("-joining_fee")
-    elif sort_option == "popularity":
-        filtered_societies = filtered_societies.order_by("-members_count")
-    elif sort_option == "availability":
-        filtered_societies = filtered_societies.order_by("members_count")
+def _next_page_url(path, params, next_page):
+    """URL of the next listing page, keeping the filters and sort of this one."""
+    if next_page is None:
+        return None
+    query = params.copy()
+    for name, value in next_page.items():
+        query[name] = value
+    return f"{path}?{query.urlencode()}"
 
 
+def societiespage(request):
+    societies, next_page, result_set = _societies_listing(request)
+    attach_membership_states(societies, request.user)
+
     top_context = top_societies(request.user)
     recent_news = get_recent_news()
 
     context = {
-        "societies": filtered_societies,
+        "societies": societies,
         "news_list": recent_news,
+        "results_token": result_set.token if result_set else None,
+        "next_url": _next_page_url(request.path, request.GET, next_page),
+        "next_fragment_url": _next_page_url(reverse("societiespage_more"), request.GET, next_page),
         **top_context
     }
 
     return render(request, "societies.html", context)
 
 
+def societiespage_more(request):
+    """The next page of the societies listing as rendered cards, for infinite scroll."""
+    societies, next_page, _ = _societies_listing(request)
+    attach_membership_states(societies, request.user)
+    html = render_to_string("society-cards.html", {"societies": societies}, request=request)
+    return JsonResponse({
+        "html": html,
+        # next fragment for the script, and the same page as a full page for the link
+        "next": _next_page_url(request.path, request.GET, next_page),
+        "next_url": _next_page_url(reverse("societiespage"), request.GET, next_page),
+    })
+
+
 def my_societies(request):
-    societies = get_societies(request.user)
+    societies = attach_membership_states(get_societies(request.user), request.user)
     news_list = News.objects.filter(is_published=True).order_by('-date_posted')[:10]
     return render(request, "societies.html", {'societies': societies, "news_list": news_list, 'page':'My'})
 
@@ -188,29 +219,16 @@ def manage_society(request, society_id):
         is_authorized = True
 
     else:
-        if society.manager == request.user:
-            is_authorized = True
-        else:
-            # Or check if they are a co_manager of this society
-            co_manager_membership = Membership.objects.filter(
-                society=society,
-                user=request.user,
-                role=MembershipRole.CO_MANAGER,
-                status=MembershipStatus.APPROVED
-            ).first()
-            is_authorized = bool(co_manager_membership)
+        # the manager (the one who created the society) or a co_manager of it
+        is_authorized = (
+            society.manager == request.user
+            or memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER])
+        )
 
     if not is_authorized:
         messages.error(request, "You do not have permission to manage this society.")
         return redirect('societiespage')
 
-    society.members_count = Membership.objects.filter(
-        society=society,
-        status=MembershipStatus.APPROVED
-    ).count()
-    society.save()
-
-
     # Get all memberships for this society
     memberships = Membership.objects.filter(society=society).select_related('user')
 
@@ -244,14 +262,7 @@ def update_membership(request, society_id, user_id):
     # Double-check the request.user is allowed to manage
     # i.e. they are the society manager or co-manager
     if society.manager != request.user:
-        co_manager_membership = Membership.objects.filter(
-            society=society,
-            user=request.user,
-            role=MembershipRole.CO_MANAGER,
-            status=MembershipStatus.APPROVED
-        ).first()
-
-        if not co_manager_membership:
+        if not memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER]):
             messages.error(request, "You do not have permission to update members for this society.")
             return redirect('societiespage')
 
@@ -284,12 +295,6 @@ def update_membership(request, society_id, user_id):
             messages.error(request, "Invalid action.")
             return redirect('manage_society', society_id=society.id)
 
-        society.members_count = Membership.objects.filter(
-            society=society,
-            status=MembershipStatus.APPROVED
-        ).count()
-        society.save()
-
         return redirect('manage_society', society_id=society_id)
 
     else:
@@ -330,12 +335,6 @@ def join_society(request, society_id):
                 membership.status = MembershipStatus.APPROVED
                 membership.save()
 
-                society.members_count = Membership.objects.filter(
-                    society=society,
-                    status=MembershipStatus.APPROVED
-                ).count()
-                society.save()
-
                 return redirect('society_page', society_id=society.id)
             else:
                 return render(request, 'join_society.html', {'society': society, 'form': form})
@@ -378,18 +377,10 @@ def view_applications(request, society_id):
     """If the society is set to 'manual' or has any applications, managers can see them here."""
     society = get_object_or_404(Society, id=society_id)
     # Only manager or co_manager can see
-    is_manager_or_co = False
-    if society.manager == request.user:
-        is_manager_or_co = True
-    else:
-        from .models import MembershipRole
-        membership_co = Membership.objects.filter(
-            society=society,
-            user=request.user,
-            role=MembershipRole.CO_MANAGER,
-            status=MembershipStatus.APPROVED
-        ).first()
-        is_manager_or_co = bool(membership_co)
+    is_manager_or_co = (
+        society.manager == request.user
+        or memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER])
+    )
 
     if not is_manager_or_co:
         messages.error(request, "You do not have permission to view applications.")
@@ -423,12 +414,9 @@ def decide_application(request, society_id, application_id, decision):
     #     ).first()
     #     is_manager_or_co = bool(membership_co)
 
-    is_manager_or_co = (society.manager == request.user) or Membership.objects.filter(
-        society=society,
-        user=request.user,
-        role=MembershipRole.CO_MANAGER,
-        status=MembershipStatus.APPROVED
-    ).exists()
+    is_manager_or_co = (society.manager == request.user) or memberships_of(request).has_role(
+        society, [MembershipRole.CO_MANAGER]
+    )
 
     if not is_manager_or_co:
         messages.error(request, "You do not have permission to decide on applications.")
@@ -587,17 +575,12 @@ def society_page(request, society_id):
     society = get_object_or_404(Society, id=society_id)
     widgets = Widget.objects.filter(society=society).order_by("position")
 
-    members_count = Membership.objects.filter(
-        society=society,
-        status=MembershipStatus.APPROVED
-    ).count()
-
     membership = None
     is_member = False
     is_manager = False
 
     if request.user.is_authenticated:
-        membership = Membership.objects.filter(society=society, user=request.user).first()
+        membership = memberships_of(request).membership(society)
         if membership and membership.status == 'approved':
             is_member = True
         if society.manager == request.user:
@@ -609,32 +592,9 @@ def society_page(request, society_id):
         (membership and membership.role in ["manager", "co_manager", "editor"])
     )
     
-    # process leaderboard widget data if available
-    for widget in widgets:
-        if widget.widget_type == "leaderboard" and widget.data:
-            points = widget.data.get("points", {})
-            display_points = widget.data.get("display_points", True)
-            display_count = widget.data.get("display_count", 3)
-            if display_points and points:
-                entries = []
-                for membership_id, pts in points.items():
-                    try:
-                        membership_obj = Membership.objects.get(society=society, id=int(membership_id))
-                        member_name = (membership_obj.user.get_full_name() 
-                                    if hasattr(membership_obj.user, "get_full_name") 
-                                    else str(membership_obj.user))
-                    except Membership.DoesNotExist:
-                        member_name = "Unknown"
-                    entries.append((member_name, pts))
-                sorted_entries = sorted(entries, key=lambda x: (-x[1], x[0]))
-                widget.top_entries = sorted_entries[:int(display_count)]
-            else:
-                widget.top_entries = []
-    
-    recent_polls = Poll.objects.filter(society=society).order_by("-id")[:3]
-    recent_comments = society.comments.all().order_by('-created_at')[:3]
-    gallery = society.gallery_society.first()
-    
+    # rendered widgets come from the fragment cache; only stale ones are rendered again
+    widgets = render_widget_fragments(society, widgets)
+
     context = {
         "society": society,
         "widgets": widgets,
@@ -642,11 +602,8 @@ def society_page(request, society_id):
         "user_membership": membership,
         "is_member": is_member,
         "is_manager": is_manager,
-        "members_count": members_count,
+        "members_count": society.members_count,
         "can_manage": can_manage,
-        "recent_polls": recent_polls,
-        "recent_comments": recent_comments,
-        "gallery": gallery,
     }
     return render(request, "society_page.html", context)
 
@@ -666,11 +623,6 @@ def leave_society(request, society_id):
 
     if request.method == "POST":
         membership.delete()
-        society.members_count = Membership.objects.filter(
-            society=society,
-            status=MembershipStatus.APPROVED
-        ).count()
-        society.save()
 
         return redirect('society_page', society_id=society.id)
 
@@ -681,12 +633,7 @@ def manage_display(request, society_id):
     society = get_object_or_404(Society, id=society_id)
     
     if not (request.user.is_superuser or request.user == society.manager):
-        membership = Membership.objects.filter(
-            society=society,
-            user=request.user,
-            status=MembershipStatus.APPROVED
-        ).first()
-        if not membership or membership.role not in [MembershipRole.CO_MANAGER, MembershipRole.EDITOR]:
+        if not memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER, MembershipRole.EDITOR]):
             messages.error(request, "You do not have permission to manage widget display for this society.")
             return redirect("society_page", society_id=society.id)
 
@@ -696,10 +643,7 @@ def manage_display(request, society_id):
                 data = json.loads(request.body)
                 widget_order = data.get("widget_order")
                 if widget_order:
-                    for index, widget_id in enumerate(widget_order):
-                        widget = Widget.objects.get(id=widget_id, society=society)
-                        widget.position = index
-                        widget.save()
+                    reorder_widgets(society, widget_order)
                     return JsonResponse({"status": "success", "message": "Widget order updated."})
                 else:
                     return JsonResponse({"status": "error", "message": "No widget order provided."}, status=400)
@@ -0,0 +1,69 @@
+'''rendered society page widgets, cached until the society's widgets or their content change'''
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from apps.panels.models import Poll
+from apps.search.versioning import bump_version, get_version
+
+
+def _version_name(society_id):
+    return f"widgets:{society_id}"
+
+
+def fragment_key(widget, version):
+    return f"widgets:fragment:{widget.pk}:{version}"
+
+
+def invalidate_widget_fragments(society_id):
+    """Retire every cached widget of a society; the next page view renders them again."""
+    if society_id is not None:
+        bump_version(_version_name(society_id))
+
+
+def _widget_context(society, widget):
+    """What a widget's template shows; the panel queries only run for the widget types that need them."""
+    context = {"widget": widget, "society": society}
+    if widget.widget_type == "leaderboard":
+        from .functions import leaderboard_entries
+        data = widget.data or {}
+        if data.get("display_points", True):
+            widget.top_entries = leaderboard_entries(widget, data.get("display_count", 3))
+        else:
+            widget.top_entries = []
+    elif widget.widget_type == "gallery":
+        context["gallery"] = society.gallery_society.first()
+    elif widget.widget_type == "comment":
+        context["recent_comments"] = society.comments.select_related("author").order_by("-created_at")[:3]
+    elif widget.widget_type == "polls":
+        context["recent_polls"] = Poll.objects.filter(society=society).order_by("-id")[:3]
+    return context
+
+
+def render_widget_fragments(society, widgets):
+    """
+    Set `widget.fragment` to the rendered HTML of each widget. Fragments are
+    cached per widget under the society's widget version, which is bumped
+    whenever a widget, comment, poll, gallery, image, member or leaderboard
+    points of the society change, so a page view with every widget cached
+    costs two cache reads.
+    Nothing per user goes into a fragment.
+    """
+    widgets = list(widgets)
+    if not widgets:
+        return widgets
+    version = get_version(_version_name(society.pk))
+    keys = {widget.pk: fragment_key(widget, version) for widget in widgets}
+    cached = cache.get_many(list(keys.values()))
+    rendered = {}
+    for widget in widgets:
+        html = cached.get(keys[widget.pk])
+        if html is None:
+            html = rendered[keys[widget.pk]] = render_to_string(
+                "widget_fragment.html", _widget_context(society, widget)
+            )
+        widget.fragment = mark_safe(html)
+    if rendered:
+        cache.set_many(rendered, getattr(settings, "SOCIETY_WIDGET_CACHE_TIMEOUT", 86400))
+    return widgets
@@ -0,0 +1,79 @@
+'''for widget functions'''
+from django.db import transaction
+
+from apps.societies.models import Membership
+from .fragments import invalidate_widget_fragments
+from .models import LeaderboardPoints, Widget
+
+
+def reorder_widgets(society, widget_order):
+    """
+    Give the society's widgets in `widget_order` (a list of widget IDs) the
+    positions 0, 1, 2, ... in that order. Every ID is checked with one
+    in_bulk query and only the widgets that actually move are written, in
+    one bulk_update inside a transaction. Raises ValueError, and changes
+    nothing, if an ID is malformed, repeated or not one of the society's
+    widgets. Returns the number of widgets moved.
+    """
+    try:
+        widget_ids = [int(widget_id) for widget_id in widget_order]
+    except (TypeError, ValueError):
+        raise ValueError("Widget IDs must be integers.")
+    if len(set(widget_ids)) != len(widget_ids):
+        raise ValueError("Each widget can only appear once in the order.")
+
+    with transaction.atomic():
+        widgets = Widget.objects.filter(society=society).in_bulk(widget_ids)
+        unknown = [widget_id for widget_id in widget_ids if widget_id not in widgets]
+        if unknown:
+            raise ValueError(f"No widget with ID {', '.join(map(str, unknown))} in this society.")
+
+        moved = []
+        for position, widget_id in enumerate(widget_ids):
+            widget = widgets[widget_id]
+            if widget.position != position:
+                widget.position = position
+                moved.append(widget)
+        if moved:
+            # no post_save is sent, which is fine: cached widget fragments don't depend on position
+            Widget.objects.bulk_update(moved, fields=["position"])
+    return len(moved)
+
+
+def leaderboard_entries(widget, count):
+    """
+    Top `count` (member name, points) pairs of a leaderboard widget, highest
+    first and ties by name, also where a tie straddles the cut-off. The rows
+    come off the (widget, -points) index with their members in the same
+    query, so the cost does not grow with the size of the leaderboard.
+    """
+    top = widget.leaderboard_points.select_related("membership__user").order_by(
+        "-points", "membership__user__first_name", "membership__user__last_name", "id"
+    )[:int(count)]
+    return [(row.membership.user.get_full_name(), row.points) for row in top]
+
+
+def set_leaderboard_points(widget, points):
+    """
+    Store the {membership id: points} a manager entered for a leaderboard.
+    Only the members whose points changed are written (one bulk_update and
+    one bulk_create); IDs that are not memberships of the widget's society
+    are ignored and empty points count as 0. Returns the number of rows written.
+    """
+    points = {int(membership_id): value or 0 for membership_id, value in points.items()}
+    members = Membership.objects.filter(society_id=widget.society_id, id__in=points).values_list("id", flat=True)
+    with transaction.atomic():
+        existing = {row.membership_id: row for row in widget.leaderboard_points.filter(membership_id__in=members)}
+        changed, created = [], []
+        for membership_id in members:
+            row = existing.get(membership_id)
+            if row is None:
+                created.append(LeaderboardPoints(widget=widget, membership_id=membership_id, points=points[membership_id]))
+            elif row.points != points[membership_id]:
+                row.points = points[membership_id]
+                changed.append(row)
+        LeaderboardPoints.objects.bulk_update(changed, fields=["points"])
+        LeaderboardPoints.objects.bulk_create(created)
+    if changed or created:
+        invalidate_widget_fragments(widget.society_id)
+    return len(changed) + len(created)
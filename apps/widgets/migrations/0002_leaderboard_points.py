@@ -0,0 +1,64 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def points_to_rows(apps, schema_editor):
+    """Move each leaderboard's JSON {membership id: points} dict into LeaderboardPoints rows."""
+    Widget = apps.get_model("widgets", "Widget")
+    Membership = apps.get_model("societies", "Membership")
+    LeaderboardPoints = apps.get_model("widgets", "LeaderboardPoints")
+    for widget in Widget.objects.filter(widget_type="leaderboard").exclude(data=None):
+        if not isinstance(widget.data, dict) or "points" not in widget.data:
+            continue
+        points = {}
+        for membership_id, value in (widget.data.pop("points") or {}).items():
+            if str(membership_id).isdigit():
+                points[int(membership_id)] = value or 0
+        # ids of memberships that were deleted or belong to another society are dropped
+        members = Membership.objects.filter(society_id=widget.society_id, id__in=points).values_list("id", flat=True)
+        LeaderboardPoints.objects.bulk_create(
+            LeaderboardPoints(widget=widget, membership_id=membership_id, points=points[membership_id])
+            for membership_id in members
+        )
+        widget.save(update_fields=["data"])
+
+
+def rows_to_points(apps, schema_editor):
+    Widget = apps.get_model("widgets", "Widget")
+    LeaderboardPoints = apps.get_model("widgets", "LeaderboardPoints")
+    for widget in Widget.objects.filter(widget_type="leaderboard"):
+        data = widget.data if isinstance(widget.data, dict) else {}
+        data["points"] = {
+            str(membership_id): points
+            for membership_id, points in LeaderboardPoints.objects.filter(widget=widget)
+            .values_list("membership_id", "points")
+        }
+        widget.data = data
+        widget.save(update_fields=["data"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('societies', '0003_society_listing_indexes'),
+        ('widgets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_points', to='societies.membership')),
+                ('widget', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_points', to='widgets.widget')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['widget', '-points'], name='leaderboard_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('widget', 'membership'), name='unique_leaderboard_member')],
+            },
+        ),
+        migrations.RunPython(points_to_rows, rows_to_points),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from apps.societies.models import Society 
+from apps.societies.models import Membership, Society
 from config.constants import WIDGET_TYPES
 
 class Widget(models.Model):
@@ -14,3 +14,20 @@ class Widget(models.Model):
         
     def __str__(self):
         return f"{self.get_widget_type_display()} for {self.society.name}"
+
+
+class LeaderboardPoints(models.Model):
+    """One member's points on a leaderboard widget."""
+    widget = models.ForeignKey(Widget, on_delete=models.CASCADE, related_name="leaderboard_points")
+    membership = models.ForeignKey(Membership, on_delete=models.CASCADE, related_name="leaderboard_points")
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["widget", "membership"], name="unique_leaderboard_member"),
+        ]
+        # the top N of a leaderboard is read straight off this index
+        indexes = [models.Index(fields=["widget", "-points"], name="leaderboard_top_idx")]
+
+    def __str__(self):
+        return f"{self.membership_id} on {self.widget_id}: {self.points} points"
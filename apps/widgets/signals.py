@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.panels.models import Comment, Gallery, Image, Poll, Question
+from apps.societies.models import Membership
+from .fragments import invalidate_widget_fragments
+from .models import Widget
+
+
+@receiver(post_save, sender=Widget)
+@receiver(post_delete, sender=Widget)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Poll)
+@receiver(post_delete, sender=Poll)
+@receiver(post_save, sender=Gallery)
+@receiver(post_delete, sender=Gallery)
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def refresh_society_widgets(sender, instance, **kwargs):
+    """Re-render a society's widgets after a widget or the content they show (members included) changes."""
+    invalidate_widget_fragments(instance.society_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def refresh_poll_widgets(sender, instance, **kwargs):
+    """The polls widget links to each poll's first question."""
+    invalidate_widget_fragments(Poll.objects.filter(pk=instance.poll_id).values_list('society_id', flat=True).first())
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+def refresh_gallery_widgets(sender, instance, **kwargs):
+    """The gallery widget shows a gallery's first images."""
+    invalidate_widget_fragments(Gallery.objects.filter(pk=instance.gallery_id).values_list('society_id', flat=True).first())
@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.panels.models import Comment, Poll, Question
+from apps.societies.models import Society
+from apps.users.models import CustomUser
+from apps.widgets.fragments import render_widget_fragments
+from apps.widgets.models import Widget
+
+
+class WidgetFragmentCacheTests(TestCase):
+    """Tests for the cached society page widgets."""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(
+            email="fragments@example.com", first_name="Frag", last_name="Manager",
+            preferred_name="Frag", password="password123"
+        )
+        self.society = Society.objects.create(
+            name="Fragment Society", description="widgets", society_type="Test",
+            status="approved", manager=self.manager
+        )
+        self.comment = Comment.objects.create(society=self.society, author=self.manager, content="First comment")
+        Widget.objects.create(society=self.society, widget_type="comment", position=0)
+        Widget.objects.create(society=self.society, widget_type="polls", position=1)
+        Widget.objects.create(
+            society=self.society, widget_type="announcements", position=2,
+            data={"announcements": [{"title": "Welcome", "message": "Hello all"}]}
+        )
+
+    def widgets(self):
+        return Widget.objects.filter(society=self.society).order_by("position")
+
+    def page_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("society_page", args=[self.society.id]))
+        return response, len(queries)
+
+    def test_fragments_rendered_then_cached(self):
+        widgets = render_widget_fragments(self.society, self.widgets())
+        self.assertIn("First comment", widgets[0].fragment)
+        self.assertIn("No polls have been created yet.", widgets[1].fragment)
+        self.assertIn("Welcome", widgets[2].fragment)
+
+        # a version read and one read of every fragment
+        fresh = list(self.widgets())
+        with self.assertNumQueries(2):
+            cached = render_widget_fragments(self.society, fresh)
+        self.assertEqual([widget.fragment for widget in cached], [widget.fragment for widget in widgets])
+
+    def test_cached_page_served_with_fewer_queries(self):
+        first, cold = self.page_queries()
+        second, warm = self.page_queries()
+        self.assertLess(warm, cold)
+        self.assertContains(second, "First comment")
+        self.assertContains(second, "Hello all")
+
+    def test_content_changes_retire_fragments(self):
+        render_widget_fragments(self.society, self.widgets())
+
+        self.comment.content = "Edited comment"
+        self.comment.save()
+        self.assertIn("Edited comment", render_widget_fragments(self.society, self.widgets())[0].fragment)
+
+        poll = Poll.objects.create(society=self.society, title="Best day")
+        self.assertIn("No question added", render_widget_fragments(self.society, self.widgets())[1].fragment)
+        Question.objects.create(poll=poll, question_text="Which day?")
+        self.assertIn("View Results", render_widget_fragments(self.society, self.widgets())[1].fragment)
+
+        widget = self.widgets()[2]
+        widget.data = {"announcements": [{"title": "Moved", "message": "New room"}]}
+        widget.save()
+        self.assertIn("New room", render_widget_fragments(self.society, self.widgets())[2].fragment)
+
+    def test_other_societies_keep_their_fragments(self):
+        other = Society.objects.create(name="Other Fragments", status="approved", manager=self.manager)
+        Widget.objects.create(society=other, widget_type="announcements", position=0)
+        render_widget_fragments(other, Widget.objects.filter(society=other))
+        Comment.objects.create(society=self.society, author=self.manager, content="Not for other")
+        widgets = list(Widget.objects.filter(society=other))
+        with self.assertNumQueries(2):
+            render_widget_fragments(other, widgets)
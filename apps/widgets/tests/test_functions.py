@@ -0,0 +1,112 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.societies.models import Membership, Society
+from apps.users.models import CustomUser
+from apps.widgets.fragments import render_widget_fragments
+from apps.widgets.functions import leaderboard_entries, reorder_widgets, set_leaderboard_points
+from apps.widgets.models import LeaderboardPoints, Widget
+
+
+class ReorderWidgetsTests(TestCase):
+    """Tests for reorder_widgets."""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(
+            email="reorder@example.com", first_name="Re", last_name="Order",
+            preferred_name="Reorder", password="password123"
+        )
+        self.society = Society.objects.create(
+            name="Reorder Society", description="widgets", society_type="Test", manager=self.manager
+        )
+        self.widgets = [
+            Widget.objects.create(society=self.society, widget_type=widget_type, position=position)
+            for position, widget_type in enumerate(["announcements", "contacts", "featured", "polls"])
+        ]
+
+    def positions(self):
+        return list(Widget.objects.filter(society=self.society).order_by("position").values_list("id", flat=True))
+
+    def test_only_moved_widgets_written_in_one_update(self):
+        first, second, third, fourth = (widget.id for widget in self.widgets)
+        with CaptureQueriesContext(connection) as queries:
+            moved = reorder_widgets(self.society, [first, third, second, str(fourth)])
+        self.assertEqual(moved, 2)
+        self.assertEqual(self.positions(), [first, third, second, fourth])
+        updates = [query["sql"] for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+
+    def test_unchanged_order_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(reorder_widgets(self.society, [widget.id for widget in self.widgets]), 0)
+        self.assertFalse([query for query in queries if query["sql"].startswith("UPDATE")])
+
+    def test_invalid_orders_change_nothing(self):
+        other = Society.objects.create(name="Other Reorder", manager=self.manager)
+        foreign = Widget.objects.create(society=other, widget_type="contacts", position=0)
+        before = self.positions()
+        first, second = self.widgets[0].id, self.widgets[1].id
+        for order in ([second, foreign.id], [second, 999999], [second, second], [second, "x"]):
+            with self.subTest(order=order), self.assertRaises(ValueError):
+                reorder_widgets(self.society, order)
+        self.assertEqual(self.positions(), before)
+
+
+class LeaderboardPointsTests(TestCase):
+    """Tests for the leaderboard points helpers."""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(
+            email="board@example.com", first_name="Board", last_name="Manager",
+            preferred_name="Board", password="password123"
+        )
+        self.society = Society.objects.create(name="Board Society", status="approved", manager=self.manager)
+        self.widget = Widget.objects.create(
+            society=self.society, widget_type="leaderboard", data={"display_points": True, "display_count": 3}
+        )
+        self.memberships = {}
+        for name, points in [("Ada", 5), ("Bea", 9), ("Cal", 5), ("Dee", 1)]:
+            user = CustomUser.objects.create_user(
+                email=f"{name}@example.com", first_name=name, last_name="Lee",
+                preferred_name=name, password="password123"
+            )
+            membership = Membership.objects.create(user=user, society=self.society, status="approved")
+            self.memberships[name] = membership
+            LeaderboardPoints.objects.create(widget=self.widget, membership=membership, points=points)
+
+    def points(self):
+        return dict(
+            LeaderboardPoints.objects.filter(widget=self.widget).values_list("membership__user__first_name", "points")
+        )
+
+    def test_top_entries_in_one_query(self):
+        with self.assertNumQueries(1):
+            entries = leaderboard_entries(self.widget, 3)
+        self.assertEqual(entries, [("Bea Lee", 9), ("Ada Lee", 5), ("Cal Lee", 5)])
+
+    def test_ties_at_the_cut_off_picked_by_name(self):
+        # Cal's row now comes before Ada's, but Ada still wins the tie for second place
+        LeaderboardPoints.objects.filter(membership=self.memberships["Ada"]).delete()
+        LeaderboardPoints.objects.create(widget=self.widget, membership=self.memberships["Ada"], points=5)
+        self.assertEqual(leaderboard_entries(self.widget, 2), [("Bea Lee", 9), ("Ada Lee", 5)])
+
+    def test_set_points_writes_only_changes(self):
+        other = Society.objects.create(name="Other Board", manager=self.manager)
+        foreign = Membership.objects.create(user=self.manager, society=other, status="approved")
+        LeaderboardPoints.objects.filter(membership=self.memberships["Dee"]).delete()
+        written = set_leaderboard_points(self.widget, {
+            self.memberships["Ada"].id: 5,
+            self.memberships["Bea"].id: 12,
+            self.memberships["Cal"].id: None,
+            self.memberships["Dee"].id: 3,
+            foreign.id: 100,
+        })
+        self.assertEqual(written, 3)
+        self.assertEqual(self.points(), {"Ada": 5, "Bea": 12, "Cal": 0, "Dee": 3})
+
+    def test_points_changes_retire_the_cached_widget(self):
+        self.assertIn("Bea Lee", render_widget_fragments(self.society, [self.widget])[0].fragment)
+        set_leaderboard_points(self.widget, {self.memberships["Dee"].id: 21})
+        widget = Widget.objects.get(pk=self.widget.pk)
+        self.assertIn("1. Dee Lee – 21 points", render_widget_fragments(self.society, [widget])[0].fragment)
@@ -1,7 +1,7 @@
 import json
 from django.test import TestCase, Client
 from django.urls import reverse
-from apps.widgets.models import Widget
+from apps.widgets.models import LeaderboardPoints, Widget
 from apps.societies.models import Society, Membership, MembershipRole, MembershipStatus
 from apps.users.models import CustomUser
 
@@ -68,6 +68,21 @@ class WidgetViewsTests(TestCase):
         self.assertEqual(self.widget2.position, 0)
         self.assertEqual(self.widget1.position, 1)
 
+    def test_update_widget_order_rejects_unknown_widget(self):
+        """Test that an order naming another society's widget is refused and nothing moves."""
+        self.client.login(email="manager@example.com", password="password123")
+        other = Society.objects.create(name="Other Society", manager=self.manager)
+        foreign = Widget.objects.create(society=other, widget_type="contacts", position=0)
+        for url in [
+            reverse("update_widget_order", kwargs={"society_id": self.society.id}),
+            reverse("manage_display", kwargs={"society_id": self.society.id}),
+        ]:
+            response = self.client.post(url, data=json.dumps({"widget_order": [self.widget2.id, foreign.id]}),
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 400)
+        self.widget2.refresh_from_db()
+        self.assertEqual(self.widget2.position, 2)
+
     def test_remove_widget_as_manager(self):
         """Test removing a widget as society manager returns a redirect to manage display."""
         self.client.login(email="manager@example.com", password="password123")
@@ -162,3 +177,27 @@ class WidgetViewsTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Number of Top Entries to Display")
+
+    def test_edit_leaderboard_widget_post_stores_points(self):
+        """Test that saving the leaderboard stores each member's points as rows, not in the widget data."""
+        leaderboard_widget = Widget.objects.create(
+            society=self.society, widget_type="leaderboard", position=6,
+            data={"display_points": True, "display_count": 3}
+        )
+        self.client.login(email="manager@example.com", password="password123")
+        url = reverse("edit_widget", kwargs={"society_id": self.society.id, "widget_id": leaderboard_widget.id})
+        response = self.client.post(url, {
+            "settings-display_count": "5",
+            "settings-display_points": "on",
+            "members-TOTAL_FORMS": "1",
+            "members-INITIAL_FORMS": "1",
+            "members-0-membership_id": str(self.membership.id),
+            "members-0-points": "42",
+        })
+        self.assertRedirects(response, reverse("manage_display", kwargs={"society_id": self.society.id}))
+        leaderboard_widget.refresh_from_db()
+        self.assertEqual(leaderboard_widget.data, {"display_points": True, "display_count": 5})
+        self.assertEqual(
+            list(LeaderboardPoints.objects.filter(widget=leaderboard_widget).values_list("membership_id", "points")),
+            [(self.membership.id, 42)]
+        )
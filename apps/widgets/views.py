@@ -8,9 +8,11 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
 from django.views.decorators.csrf import csrf_exempt
 from .models import Widget
+from .functions import reorder_widgets, set_leaderboard_points
 from .forms import *
 from apps.panels.models import Gallery, Image, Poll, Comment
 from apps.societies.models import Society, Membership, MembershipRole, MembershipStatus
+from apps.societies.middleware import memberships_of
 from apps.panels import views as panels_views
 import json
 
@@ -20,29 +22,17 @@ def update_widget_order(request, society_id):
     if request.method == "POST":
         society = get_object_or_404(Society, id=society_id)
         
-        membership = Membership.objects.filter(
-            society=society,
-            user=request.user,
-            status=MembershipStatus.APPROVED
-        ).first()
-        
-        is_authorized = False
-    
-        if request.user.is_superuser or request.user == society.manager:
-            is_authorized = True
-        else:
-            if membership and membership.role in [MembershipRole.CO_MANAGER, MembershipRole.EDITOR]:
-                is_authorized = True
+        is_authorized = (
+            request.user.is_superuser
+            or request.user == society.manager
+            or memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER, MembershipRole.EDITOR])
+        )
         
         if not is_authorized:
             return JsonResponse({"error": "Permission denied"}, status=403)
         try:
             data = json.loads(request.body)
-            widget_order = data.get("widget_order", [])
-            for index, widget_id in enumerate(widget_order):
-                widget = get_object_or_404(Widget, id=widget_id, society=society)
-                widget.position = index
-                widget.save()
+            reorder_widgets(society, data.get("widget_order", []))
             return JsonResponse({"success": True})
         except Exception as e:
             return JsonResponse({"error": str(e)}, status=400)
@@ -52,14 +42,11 @@ def remove_widget(request, society_id, widget_id):
     widget = get_object_or_404(Widget, id=widget_id)
     society = widget.society
     
-    # fetch the user's membership
-    membership = Membership.objects.filter(
-        society=society,
-        user=request.user,
-        status=MembershipStatus.APPROVED
-    ).first()
-    
-    if not (request.user.is_superuser or request.user == society.manager or (membership and membership.role in [MembershipRole.CO_MANAGER, MembershipRole.EDITOR])):
+    if not (
+        request.user.is_superuser
+        or request.user == society.manager
+        or memberships_of(request).has_role(society, [MembershipRole.CO_MANAGER, MembershipRole.EDITOR])
+    ):
         messages.error(request, "Permission denied.")
         return redirect("manage_display", society_id=society_id)
 
@@ -220,13 +207,12 @@ def edit_leaderboard_widget(request, society_id, widget_id):
     society = widget.society
 
     # get all approved memberships for the society
-    memberships = Membership.objects.filter(society=society, status=MembershipStatus.APPROVED)
+    memberships = Membership.objects.filter(society=society, status=MembershipStatus.APPROVED).select_related('user')
 
-    initial_points = {}
+    initial_points = dict(widget.leaderboard_points.values_list('membership_id', 'points'))
     display_points = True
     display_count = '3'
     if widget.data:
-        initial_points = widget.data.get('points', {})
         display_points = widget.data.get('display_points', True)
         display_count = str(widget.data.get('display_count', '3'))
 
@@ -237,7 +223,7 @@ def edit_leaderboard_widget(request, society_id, widget_id):
         initial_data.append({
             'membership_id': membership.id,
             'member_name': full_name,
-            'points': initial_points.get(str(membership.id), 0),
+            'points': initial_points.get(membership.id, 0),
         })
 
     if request.method == "POST":
@@ -248,9 +234,10 @@ def edit_leaderboard_widget(request, society_id, widget_id):
             for form in formset:
                 mid = form.cleaned_data.get('membership_id')
                 pts = form.cleaned_data.get('points', 0)
-                new_points[str(mid)] = pts
+                new_points[mid] = pts
+            # only the members whose points changed are written
+            set_leaderboard_points(widget, new_points)
             widget.data = {
-                'points': new_points,
                 'display_points': settings_form.cleaned_data.get('display_points', False),
                 'display_count': int(settings_form.cleaned_data.get('display_count'))
             }
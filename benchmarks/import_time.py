@@ -0,0 +1,65 @@
+"""
+Startup cost of the project: how long it takes a fresh interpreter to import
+the URLconf (what every gunicorn worker, manage.py command and test run pays
+before serving anything) and how much memory it is holding afterwards.
+
+Each scenario runs in its own interpreter:
+  lazy  - import config.urls only (search resources load on first use)
+  eager - import config.urls and warm_up() the search resources, which is
+          what importing config.functions used to cost
+
+Usage:
+    python benchmarks/import_time.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIO = """
+import json, os, resource, sys, time
+sys.path.insert(0, {base_dir!r})
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+start = time.perf_counter()
+import django
+django.setup()
+import config.urls
+if {eager!r}:
+    from apps.search.resources import warm_up
+    warm_up()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def run_scenario(eager):
+    code = SCENARIO.format(base_dir=str(BASE_DIR), eager=eager)
+    result = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, eager in (("lazy", False), ("eager", True)):
+        try:
+            samples = [run_scenario(eager) for _ in range(args.runs)]
+        except RuntimeError as error:
+            print(f"{name:<6} import: failed ({error})")
+            continue
+        seconds = statistics.median(sample["seconds"] for sample in samples)
+        rss = statistics.median(sample["max_rss_mb"] for sample in samples)
+        print(f"{name:<6} import: {seconds:6.2f}s  max RSS: {rss:7.1f} MB  ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Search latency at realistic corpus sizes. For each size a fresh test
+database is filled with synthetic societies and events (and their search
+embeddings), then the search functions and the listing views are timed.
+
+Each size runs in its own interpreter, so resident memory and the
+per-process search caches start from nothing every time. Reported per
+stage of a search:
+  spell         spelling correction
+  autocomplete  completion of the last word
+  encode        embedding of the query
+  ranking       nearest-vector and full-text candidate retrieval
+  type match    best-matching society/event type among the candidates
+  merge         everything else in ranking: fetching rows and fusing rankings
+with p50/p95/p99 latency, the mean number of SQL queries and the peak RSS
+of the process by the end of the stage. Views are requested through the
+Django test client with the result cache retired before every request.
+
+The first search of each size loads the model, dictionaries and indexes;
+it is reported on its own as `first_search_ms` and left out of the
+percentiles.
+
+Usage:
+    python benchmarks/search_latency.py [--sizes 1000 10000 100000] [--repeat 5]
+                                        [--backend hashing] [--precision int8]
+                                        [--output search_latency.json]
+
+Compare two commits by diffing their JSON outputs.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+QUERIES = [
+    "chess clb",
+    "footbal",
+    "music society",
+    "coding hackathon",
+    "volunteering",
+    "photography walk",
+    "debate",
+    "dance classes",
+    "board games night",
+    "careers fair",
+]
+STAGES = ["spell", "autocomplete", "encode", "ranking", "type match", "merge", "total"]
+# config.functions attribute -> stage it is timed under
+TIMED_FUNCTIONS = {
+    "correct_spelling": "spell",
+    "autocomplete": "autocomplete",
+    "encode_query": "encode",
+    "nearest": "ranking",
+    "lexical_search": "ranking",
+    "type_ranking": "type match",
+    "rank_events": "rank",
+    "rank_societies": "rank",
+}
+BULK_BATCH_SIZE = 1000
+
+TOPICS = [
+    "chess", "football", "music", "coding", "photography", "debate", "dance", "robotics",
+    "poetry", "hiking", "film", "baking", "volunteering", "astronomy", "climbing", "careers",
+    "board games", "rowing", "theatre", "gaming", "languages", "finance", "medicine", "law",
+]
+ADJECTIVES = ["Open", "Competitive", "Beginner", "Advanced", "Social", "Late Night", "Weekend", "Student"]
+SOCIETY_SUFFIXES = ["Society", "Club", "Group", "Network", "Collective"]
+EVENT_FORMATS = ["Night", "Workshop", "Tournament", "Meetup", "Fair", "Walk", "Social", "Talk"]
+LOCATIONS = ["London", "Manchester", "Leeds", "Bristol", "Edinburgh", "Online"]
+DESCRIPTIONS = [
+    "A friendly {topic} community for {adjective} members, meeting every week on campus.",
+    "We run {topic} sessions, trips and socials. {adjective} players and newcomers welcome.",
+    "Learn {topic} with experienced students. Our {adjective} sessions suit every level.",
+]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    position = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[position]
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(records):
+    """p50/p95/p99 latency, mean queries and peak RSS of each stage over the recorded calls."""
+    summary = {}
+    for stage in STAGES:
+        timings = [record[stage]["seconds"] * 1000 for record in records if stage in record]
+        if not timings:
+            continue
+        summary[stage] = {
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "p99_ms": round(percentile(timings, 0.99), 3),
+            "queries": round(statistics.mean(record[stage]["queries"] for record in records), 2),
+            "max_rss_mb": round(max(record[stage]["max_rss_mb"] for record in records), 1),
+        }
+    return summary
+
+
+class QueryCounter:
+    """Database execute wrapper counting every SQL statement."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class StageTimer:
+    """Wraps the functions a search is built from and records time, queries and RSS per stage."""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.record = None
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            queries = self.counter.count
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if self.record is not None:
+                    entry = self.record.setdefault(stage, {"seconds": 0.0, "queries": 0, "max_rss_mb": 0.0})
+                    entry["seconds"] += time.perf_counter() - start
+                    entry["queries"] += self.counter.count - queries
+                    entry["max_rss_mb"] = rss_mb()
+        return timed
+
+    def measure(self, call):
+        """Run call() and return its per-stage record."""
+        self.record = {}
+        queries = self.counter.count
+        start = time.perf_counter()
+        try:
+            call()
+        finally:
+            record, self.record = self.record, None
+        record["total"] = {
+            "seconds": time.perf_counter() - start,
+            "queries": self.counter.count - queries,
+            "max_rss_mb": rss_mb(),
+        }
+        # merge is what ranking spends outside candidate retrieval and type matching
+        rank = record.pop("rank", None)
+        if rank is not None:
+            inner = [record[stage] for stage in ("ranking", "type match") if stage in record]
+            record["merge"] = {
+                "seconds": max(rank["seconds"] - sum(entry["seconds"] for entry in inner), 0.0),
+                "queries": rank["queries"] - sum(entry["queries"] for entry in inner),
+                "max_rss_mb": rank["max_rss_mb"],
+            }
+        return record
+
+
+def populate(size, seed=0):
+    """Synthetic approved societies and events (size of each), with their embeddings."""
+    from django.contrib.auth import get_user_model
+    from django.utils.timezone import now
+
+    from apps.events.models import Event
+    from apps.search.index import index_missing
+    from apps.societies.models import Society
+    from config.constants import EVENT_TYPE_CHOICES, SOCIETY_TYPE_CHOICES
+
+    rng = random.Random(seed)
+    manager = get_user_model().objects.create_user(
+        email="benchmark@example.ac.uk", password="benchmark",
+        first_name="Bench", last_name="Mark", preferred_name="Bench"
+    )
+
+    def description(topic):
+        return rng.choice(DESCRIPTIONS).format(topic=topic, adjective=rng.choice(ADJECTIVES).lower())
+
+    timings = {}
+    start = time.perf_counter()
+    Society.objects.bulk_create((
+        Society(
+            name=f"{rng.choice(ADJECTIVES)} {topic.title()} {rng.choice(SOCIETY_SUFFIXES)} {number}",
+            description=description(topic),
+            society_type=rng.choice(SOCIETY_TYPE_CHOICES)[0],
+            status="approved",
+            visibility="Public",
+            manager=manager,
+            location=rng.choice(LOCATIONS),
+        )
+        for number, topic in ((number, rng.choice(TOPICS)) for number in range(size))
+    ), batch_size=BULK_BATCH_SIZE)
+    today = now()
+    Event.objects.bulk_create((
+        Event(
+            name=f"{topic.title()} {rng.choice(EVENT_FORMATS)} {number}",
+            description=description(topic),
+            date=today + timedelta(days=rng.randrange(-30, 180)),
+            event_type=rng.choice(EVENT_TYPE_CHOICES)[0],
+            keyword=topic,
+            location=rng.choice(LOCATIONS),
+        )
+        for number, topic in ((number, rng.choice(TOPICS)) for number in range(size))
+    ), batch_size=BULK_BATCH_SIZE)
+    timings["insert_seconds"] = round(time.perf_counter() - start, 3)
+
+    # bulk_create sends no signals, so embed the new rows directly
+    # (the full-text index is filled by its database triggers)
+    start = time.perf_counter()
+    index_missing("society")
+    index_missing("event")
+    timings["embed_seconds"] = round(time.perf_counter() - start, 3)
+    return manager, timings
+
+
+def bench_functions(timer, repeat):
+    from config import functions
+
+    results = {}
+    for name in ("search_societies", "search_events"):
+        search = getattr(functions, name)
+        first = timer.measure(lambda: search(QUERIES[0]))
+        records = [
+            timer.measure(lambda query=query: search(query))
+            for _ in range(repeat) for query in QUERIES
+        ]
+        results[name] = {
+            "first_search_ms": round(first["total"]["seconds"] * 1000, 3),
+            "samples": len(records),
+            "stages": summarize(records),
+        }
+    return results
+
+
+def bench_views(timer, user, repeat):
+    from django.test import Client
+    from django.urls import reverse
+
+    from apps.search.cache import RESULTS_VERSION
+    from apps.search.versioning import bump_version
+
+    client = Client()
+    client.force_login(user)
+    searches = {
+        "ai_search societies": lambda query: (reverse("ai_search"), {"q": query, "search_type": "societies"}),
+        "ai_search events": lambda query: (reverse("ai_search"), {"q": query, "search_type": "events"}),
+    }
+    listings = {
+        "societiespage": (reverse("societiespage"), {}),
+        "eventspage": (reverse("eventspage"), {}),
+    }
+
+    def get(path, params):
+        # retire cached results so every request ranks again
+        bump_version(RESULTS_VERSION)
+        response = client.get(path, params)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    results = {}
+    for name, request in searches.items():
+        records = [
+            timer.measure(lambda query=query: get(*request(query)))
+            for _ in range(repeat) for query in QUERIES
+        ]
+        results[name] = {"samples": len(records), "stages": summarize(records)}
+    for name, (path, params) in listings.items():
+        records = [timer.measure(lambda: get(path, params)) for _ in range(repeat)]
+        results[name] = {"samples": len(records), "stages": summarize(records)}
+    return results
+
+
+def run_size(size, repeat, views):
+    """Benchmark one corpus size in this process and return its results."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from config import functions
+
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        manager, build = populate(size)
+        counter = QueryCounter()
+        timer = StageTimer(counter)
+        with ExitStack() as stack:
+            stack.enter_context(connection.execute_wrapper(counter))
+            for name, stage in TIMED_FUNCTIONS.items():
+                stack.enter_context(patch.object(functions, name, timer.wrap(stage, getattr(functions, name))))
+            result = {
+                "size": size,
+                "build": build,
+                "functions": bench_functions(timer, repeat),
+            }
+            if views:
+                result["views"] = bench_views(timer, manager, repeat)
+        result["max_rss_mb"] = round(rss_mb(), 1)
+        return result
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def spawn_size(size, repeat, views):
+    command = [sys.executable, __file__, "--child", "--sizes", str(size), "--repeat", str(repeat)]
+    if not views:
+        command.append("--no-views")
+    result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr.strip().splitlines() or ["no output"])[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def print_summary(result):
+    print(f"\n{result['size']} societies and events "
+          f"(insert {result['build']['insert_seconds']}s, embed {result['build']['embed_seconds']}s, "
+          f"peak RSS {result['max_rss_mb']} MB)")
+    for section in ("functions", "views"):
+        for name, entry in result.get(section, {}).items():
+            print(f"  {name}")
+            for stage, numbers in entry["stages"].items():
+                print(f"    {stage:<13} p50 {numbers['p50_ms']:9.2f} ms  p95 {numbers['p95_ms']:9.2f} ms  "
+                      f"p99 {numbers['p99_ms']:9.2f} ms  {numbers['queries']:7.2f} queries  "
+                      f"{numbers['max_rss_mb']:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Number of societies (and of events) to synthesize.")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the query list per size.")
+    parser.add_argument("--backend", help="SEARCH_EMBEDDING_BACKEND to benchmark (default: the configured one).")
+    parser.add_argument("--precision", help="SEARCH_INFERENCE_PRECISION to benchmark, e.g. int8.")
+    parser.add_argument("--no-views", dest="views", action="store_false", help="Only time the search functions.")
+    parser.add_argument("--output", default="search_latency.json", help="Where to write the JSON results.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        os.environ["SEARCH_EMBEDDING_BACKEND"] = args.backend
+    if args.precision:
+        os.environ["SEARCH_INFERENCE_PRECISION"] = args.precision
+
+    if args.child:
+        print(json.dumps(run_size(args.sizes[0], args.repeat, args.views)))
+        return
+
+    results = []
+    for size in args.sizes:
+        try:
+            result = spawn_size(size, args.repeat, args.views)
+        except RuntimeError as error:
+            print(f"\n{size} societies and events: failed ({error})")
+            continue
+        print_summary(result)
+        results.append(result)
+
+    with open(args.output, "w") as output:
+        json.dump({
+            "commit": git_commit(),
+            "backend": os.environ.get("SEARCH_EMBEDDING_BACKEND", "minilm"),
+            "precision": os.environ.get("SEARCH_INFERENCE_PRECISION", "float32"),
+            "repeat": args.repeat,
+            "queries": QUERIES,
+            "results": results,
+        }, output, indent=2)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
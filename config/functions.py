@@ -1,130 +1,135 @@
 '''this file is for functions to be reused in other files'''
-from sentence_transformers import SentenceTransformer, util
-from symspellpy import SymSpell, Verbosity
-import requests
-import torch
 from apps.societies.models import Society
 from apps.events.models import Event
 from apps.news.models import News
-
-# Load AI model for meaning-based matching
-model = SentenceTransformer("all-MiniLM-L6-v2")
-
-# Load SymSpell for autocorrect
-sym_spell = SymSpell(max_dictionary_edit_distance=2)
-sym_spell.load_dictionary("frequency_dictionary_en.txt", term_index=0, count_index=1)
+from apps.search.autocomplete import complete_query
+from apps.search.batching import encode_query
+from apps.search.index import nearest
+from apps.search.lexical import fuse_rankings, lexical_search
+from apps.search.querylog import stage
+# The AI model and SymSpell dictionary are loaded on first use (see apps/search/resources.py)
+from apps.search.spelling import correct_query
+from apps.search.types import best_type
+
+# Semantic-only news matches below this cosine similarity are left out
+NEWS_MIN_SCORE = 0.3
+NEWS_CANDIDATES = 100
+# Results shown per type by the unified search
+SEARCH_ALL_LIMIT = 5
 
 def correct_spelling(query):
-    """Correct spelling using SymSpell."""
-    suggestions = sym_spell.lookup(query, Verbosity.CLOSEST, max_edit_distance=2)
-    return suggestions[0].term if suggestions else query
+    """Correct spelling word by word using SymSpell, keeping society and event terms."""
+    return correct_query(query)
 
 def autocomplete(query):
-    """Autocomplete using Datamuse API."""
-    response = requests.get(f"https://api.datamuse.com/sug?s={query}")
-    suggestions = response.json()
-    return suggestions[0]["word"] if suggestions else query
-
-def search_events(query):
-    """Search events with AI-powered matching, spell checking, and suggestions."""
-    if not query:
-        return [], None
-
-    # Step 1: Correct Spelling and Autocomplete the Query
-    corrected_query = correct_spelling(query.strip().lower())
-    completed_query = autocomplete(corrected_query)
-
-    # Step 2: Get all event categories/types
-    event_types = list(Event.objects.values_list("event_type", flat=True).distinct())
-
-    if not event_types:
-        return [], completed_query
-
-    # Step 3: Use AI to Find Best-Matching event_type
-    type_embeddings = model.encode(event_types, convert_to_tensor=True)
-    query_embedding = model.encode(completed_query, convert_to_tensor=True)
-
-    similarity_scores = util.pytorch_cos_sim(query_embedding, type_embeddings)
-    best_match_index = torch.argmax(similarity_scores)
-    best_match = event_types[best_match_index]
-
-    # Step 4: Filter events by the best-matching event_type
-    filtered_events = list(Event.objects.filter(event_type=best_match))
+    """Autocomplete the last word offline, from society/event vocabulary and the English dictionary."""
+    return complete_query(query)
+
+def prepare_query(query):
+    """Spell-correct, autocomplete and embed a query; shared by every kind of search."""
+    # Correct Spelling and Autocomplete the Query
+    with stage("spell"):
+        corrected_query = correct_spelling(query.strip().lower())
+    with stage("autocomplete"):
+        completed_query = autocomplete(corrected_query)
+
+    # Encode the query once (type labels and descriptions are already embedded);
+    # concurrent requests share one forward pass through the batcher
+    with stage("encode"):
+        query_embedding = encode_query(completed_query)
+    return completed_query, query_embedding
+
+def type_ranking(kind, query_embedding, objects, type_field):
+    """IDs of the objects whose type best matches the query, in the given order."""
+    best_match = best_type(kind, query_embedding, {getattr(obj, type_field) for obj in objects})
+    return [obj.id for obj in objects if getattr(obj, type_field) == best_match]
+
+def rank_events(completed_query, query_embedding):
+    """Rank events for a prepared query."""
+    # Nearest event descriptions across every type (top-k search over the stored embeddings)
+    nearest_events = nearest("event", query_embedding, Event.objects.all())
+
+    # Text matches over name, description, keyword and location (BM25-ranked, full-text index)
+    text_ids = lexical_search(completed_query, "event")
+    found = {event.id: event for event in nearest_events}
+    found.update(Event.objects.in_bulk([event_id for event_id in text_ids if event_id not in found]))
+
+    # Use AI to Find Best-Matching event_type among the candidates; it boosts events of that type
+    # (type labels are embedded once per process)
+    type_ids = type_ranking("event", query_embedding, nearest_events, "event_type")
+
+    # Fuse the text, description and type rankings (reciprocal rank fusion)
+    ranked_ids = fuse_rankings(text_ids, [event.id for event in nearest_events], type_ids)
+    return [found[event_id] for event_id in ranked_ids if event_id in found]
+
+def rank_societies(completed_query, query_embedding):
+    """Rank approved societies for a prepared query."""
+    # Nearest `description` embeddings across every type; only approved public societies are kept
+    nearest_societies = nearest("society", query_embedding, Society.objects.filter(
+    status="approved",
+    visibility="Public",  # 🟢 ADD THIS LINE
+    ))
 
-    if not filtered_events:
-        # If no events found by type, try name-based search
-        name_events = Event.objects.filter(name__icontains=completed_query)
-        if name_events:
-            return list(name_events), completed_query
-        return [], completed_query
+    # Text matches among approved societies (BM25-ranked, full-text index)
+    approved = Society.objects.filter(status="approved")
+    text_ids = lexical_search(completed_query, "society", queryset=approved)
+    found = {society.id: society for society in nearest_societies}
+    found.update(approved.in_bulk([society_id for society_id in text_ids if society_id not in found]))
 
-    # Step 5: Rank results by how well description matches the query
-    descriptions = [event.description for event in filtered_events]
-    description_embeddings = model.encode(descriptions, convert_to_tensor=True)
+    # Use AI to Find Best-Matching `society_type` among the candidates; it boosts societies of that type
+    type_ids = type_ranking("society", query_embedding, nearest_societies, "society_type")
 
-    description_scores = util.pytorch_cos_sim(query_embedding, description_embeddings).squeeze(0)
-    ranked_events = sorted(zip(filtered_events, description_scores), key=lambda x: x[1], reverse=True)
+    # Fuse the text, description and type rankings (reciprocal rank fusion)
+    ranked_ids = fuse_rankings(text_ids, [society.id for society in nearest_societies], type_ids)
+    return [found[society_id] for society_id in ranked_ids]
 
-    sorted_results = [event for event, score in ranked_events]
+def rank_news(completed_query, query_embedding):
+    """Rank published news for a prepared query."""
+    published = News.objects.filter(is_published=True)
 
-    # Step 6: Check Event Names (for name-based searches)
-    name_events = Event.objects.filter(name__icontains=completed_query)
+    # Text matches over title and content, fused with the nearest content embeddings
+    text_ids = lexical_search(completed_query, "news", queryset=published)
+    found = published.in_bulk(text_ids)
+    nearest_news = nearest("news", query_embedding, published, NEWS_CANDIDATES, min_score=NEWS_MIN_SCORE)
+    found.update({article.id: article for article in nearest_news})
+    return [found[news_id] for news_id in fuse_rankings(text_ids, [article.id for article in nearest_news])]
 
-    # Step 7: Merge Name Matches + Sorted Description Matches (Avoid Duplicates)
-    final_results = list(name_events) + [event for event in sorted_results if event not in name_events]
+def search_events(query):
+    """Search events with AI-powered matching, spell checking, and suggestions."""
+    if not query:
+        return [], None
 
-    return final_results, completed_query
+    completed_query, query_embedding = prepare_query(query)
+    with stage("rank"):
+        return rank_events(completed_query, query_embedding), completed_query
 
 def search_societies(query):
     """Main search function that handles all the AI-powered society search logic."""
     if not query:
         return [], None
 
-    # Step 1: Correct Spelling and Autocomplete the Query
-    corrected_query = correct_spelling(query.strip().lower())
-    completed_query = autocomplete(corrected_query)
-
-    # Step 2: Get all society types from approved societies only
-    society_types = list(Society.objects.filter(status="approved").values_list("society_type", flat=True))
-
-    if not society_types:
-        return [], completed_query
-
-    # Step 3: Use AI to Find Best-Matching `society_type`
-    type_embeddings = model.encode(society_types, convert_to_tensor=True)
-    query_embedding = model.encode(completed_query, convert_to_tensor=True)
-
-    similarity_scores = util.pytorch_cos_sim(query_embedding, type_embeddings)
-    best_match_index = torch.argmax(similarity_scores)
-    best_match = society_types[best_match_index]
-
-    # Step 4: Filter only approved societies with the best-matching `society_type`
-    filtered_societies = list(Society.objects.filter(
-    status="approved",
-    visibility="Public",  # 🟢 ADD THIS LINE
-    society_type=best_match
-    ))
-
+    completed_query, query_embedding = prepare_query(query)
+    with stage("rank"):
+        return rank_societies(completed_query, query_embedding), completed_query
 
-    if not filtered_societies:
-        return [], completed_query
-
-    # Step 5: Rank results by how well `description` matches the query
-    descriptions = [society.description for society in filtered_societies]
-    description_embeddings = model.encode(descriptions, convert_to_tensor=True)
-
-    description_scores = util.pytorch_cos_sim(query_embedding, description_embeddings).squeeze(0)
-    ranked_societies = sorted(zip(filtered_societies, description_scores), key=lambda x: x[1], reverse=True)
-
-    sorted_results = [society for society, score in ranked_societies]
+def search_all(query, limit=SEARCH_ALL_LIMIT):
+    """Search societies, events and news at once: the query is corrected and embedded a single time."""
+    if not query:
+        return {group: [] for group in SEARCH_GROUPS}, None
 
-    # Step 6: Check approved Society Names (for name-based matches)
-    name_societies = Society.objects.filter(status="approved", name__icontains=completed_query)
+    completed_query, query_embedding = prepare_query(query)
+    groups = {}
+    for group, rank in SEARCH_GROUPS.items():
+        with stage(f"rank {group}"):
+            groups[group] = rank(completed_query, query_embedding)[:limit]
+    return groups, completed_query
 
-    # Step 7: Merge Name Matches + Sorted Description Matches (Avoid Duplicates)
-    final_results = list(name_societies) + [society for society in sorted_results if society not in name_societies]
 
-    return final_results, completed_query
+SEARCH_GROUPS = {
+    "societies": rank_societies,
+    "events": rank_events,
+    "news": rank_news,
+}
 
 
 def get_recent_news(count=5):
@@ -163,7 +163,7 @@ def create_dummy_events(societies, n=70):
         fee = 0.00 if is_free else round(random.randint(5, 100), 2)
 
         event = Event.objects.create(
-            event_type=random.choice([key for key in constants.EVENT_TYPE_CHOICES]),
+            event_type=random.choice([key for key, _ in constants.EVENT_TYPE_CHOICES]),
             name=fake.sentence(nb_words=5),
             location=location,
             date=future_date,  # Use timezone-aware datetime
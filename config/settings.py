@@ -76,7 +76,8 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.widgets',
     'apps.panels',
-    'apps.payments'
+    'apps.payments',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
@@ -86,6 +87,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.societies.middleware.MembershipResolverMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -228,3 +230,46 @@ CORS_ALLOWED_ORIGINS = [
 
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# AI search
+# The model and spelling dictionary are loaded on first use (apps/search/resources.py).
+SEARCH_MODEL_NAME = os.environ.get("SEARCH_MODEL_NAME", "all-MiniLM-L6-v2")
+# "minilm" (sentence-transformers, needs torch) or "hashing" (scikit-learn only, much smaller workers).
+# Embeddings are stored per backend, so after switching run `manage.py rebuild_search_index`.
+SEARCH_EMBEDDING_BACKEND = os.environ.get("SEARCH_EMBEDDING_BACKEND", "minilm")
+# Vector size of the hashing backend
+SEARCH_HASHING_FEATURES = 512
+# "int8" runs the MiniLM model with dynamically quantized linear layers (faster on CPU);
+# check what it changes with `manage.py check_search_precision`.
+SEARCH_INFERENCE_PRECISION = os.environ.get("SEARCH_INFERENCE_PRECISION", "float32")
+# numpy dtype new description vectors are stored as; large (IVF) indexes are also held in it
+SEARCH_VECTOR_DTYPE = os.environ.get("SEARCH_VECTOR_DTYPE", "float16")
+# Seconds a ranked search result list stays cached (it is also retired on any content change)
+SEARCH_RESULTS_CACHE_TIMEOUT = 600
+# Lookups a worker counts before adding its result cache hits and misses to the shared totals
+SEARCH_CACHE_STATS_FLUSH_EVERY = 100
+# Seconds a search result token (?results=...) keeps pointing at its ranked IDs
+SEARCH_RESULT_SET_TIMEOUT = 1800
+# Query encodings from concurrent requests are run together (apps/search/batching.py):
+# at most this many texts per forward pass, waiting at most this long for more to arrive.
+# A max size of 1 encodes every query directly on the request thread.
+SEARCH_BATCH_MAX_SIZE = int(os.environ.get("SEARCH_BATCH_MAX_SIZE", 32))
+SEARCH_BATCH_MAX_WAIT_MS = float(os.environ.get("SEARCH_BATCH_MAX_WAIT_MS", 5))
+# Above this many stored vectors of a kind, semantic candidates come from an IVF index
+# (apps/search/ivf.py) probing this many of its ~sqrt(n) lists instead of scoring every row
+SEARCH_IVF_MIN_ROWS = 5000
+SEARCH_IVF_PROBES = 8
+# Corrected spellings remembered per process (apps/search/spelling.py)
+SEARCH_SPELLING_MEMO_SIZE = 4096
+# Searches are logged in memory and written to SearchQueryLog in one batch once this many
+# are waiting or the oldest is this many seconds old (see `manage.py search_query_report`)
+SEARCH_QUERY_LOG_FLUSH_SIZE = int(os.environ.get("SEARCH_QUERY_LOG_FLUSH_SIZE", 50))
+SEARCH_QUERY_LOG_FLUSH_SECONDS = float(os.environ.get("SEARCH_QUERY_LOG_FLUSH_SECONDS", 30))
+
+# Seconds the top societies (home page and listings) stay cached; any society or
+# membership change drops them sooner
+TOP_SOCIETIES_CACHE_TIMEOUT = 3600
+
+# Seconds a rendered society page widget stays cached (it is also retired when the
+# society's widgets, comments, polls or gallery change)
+SOCIETY_WIDGET_CACHE_TIMEOUT = 86400
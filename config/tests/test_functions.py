@@ -1,47 +1,41 @@
 import json
-import torch
 from collections import namedtuple
 from django.test import TestCase
 from django.utils.timezone import now, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from config.functions import (
     correct_spelling, autocomplete, search_events, 
-    search_societies, get_recent_news
+    search_societies, search_all, get_recent_news
 )
 from symspellpy import Verbosity
 from apps.events.models import Event
 from apps.societies.models import Society
 from apps.news.models import News
 from django.contrib.auth import get_user_model
+from apps.search.index import SEARCHABLE_MODELS, index_missing
+from apps.search.tests.utils import FakeModelMixin, HashingBackendMixin
 
 
 class CorrectSpellingTest(TestCase):
-    @patch('config.functions.sym_spell.lookup')
-    def test_correct_spelling_found(self, mock_lookup):
-        mock_lookup.return_value = [MagicMock(term="hello")]
-        result = correct_spelling("helo")
-        self.assertEqual(result, "hello")
+    def test_correct_spelling_found(self):
+        result = correct_spelling("footbal clb")
+        self.assertEqual(result, "football club")
 
-    @patch('config.functions.sym_spell.lookup')
-    def test_correct_spelling_not_found(self, mock_lookup):
-        mock_lookup.return_value = []
-        result = correct_spelling("helo")
-        self.assertEqual(result, "helo")
+    def test_correct_spelling_not_found(self):
+        result = correct_spelling("zzzzqqqq")
+        self.assertEqual(result, "zzzzqqqq")
 
 
 class AutocompleteTest(TestCase):
-    @patch('config.functions.requests.get')
-    def test_autocomplete_found(self, mock_get):
-        fake_json = [{"word": "world"}]
-        mock_get.return_value.json.return_value = fake_json
-        result = autocomplete("hello")
+    @patch('config.functions.complete_query')
+    def test_autocomplete_found(self, mock_complete):
+        mock_complete.return_value = "world"
+        result = autocomplete("worl")
         self.assertEqual(result, "world")
 
-    @patch('config.functions.requests.get')
-    def test_autocomplete_not_found(self, mock_get):
-        mock_get.return_value.json.return_value = []
-        result = autocomplete("hello")
-        self.assertEqual(result, "hello")
+    def test_autocomplete_not_found(self):
+        result = autocomplete("qqqzz")
+        self.assertEqual(result, "qqqzz")
 
 
 class GetRecentNewsTest(TestCase):
@@ -69,8 +63,9 @@ class GetRecentNewsTest(TestCase):
         self.assertEqual(dates, sorted(dates, reverse=True))
 
 
-class SearchEventsTest(TestCase):
+class SearchEventsTest(FakeModelMixin, TestCase):
     def setUp(self):
+        super().setUp()
         from django.contrib.auth import get_user_model
         User = get_user_model()
         manager = User.objects.create_user(
@@ -80,7 +75,7 @@ class SearchEventsTest(TestCase):
         self.society = Society.objects.create(name="TestSociety", status="approved", manager=manager)
         self.event1 = Event.objects.create(
             name="Concert", 
-            event_type="music", 
+            event_type="arts", 
             description="awesome music",
             fee = 10,
             date=now().date()
@@ -89,7 +84,7 @@ class SearchEventsTest(TestCase):
 
         self.event2 = Event.objects.create(
             name="Festival", 
-            event_type="music", 
+            event_type="arts", 
             description="fun festival", 
             fee=20,
             date=now().date()
@@ -98,26 +93,23 @@ class SearchEventsTest(TestCase):
 
         self.event3 = Event.objects.create(
             name="Lecture", 
-            event_type="education", 
+            event_type="academic", 
             description="interesting lecture", 
             fee=0,
             date=now().date()
         )
         self.event3.society.add(self.society)
+        # the embeddings saving them would store once committed
+        index_missing("event")
 
-    @patch('config.functions.model.encode')
-    @patch('config.functions.util.pytorch_cos_sim')
-    def test_search_events_by_type_found(self, mock_cos_sim, mock_encode):
-        mock_encode.side_effect = lambda x, **kwargs: x  
-        mock_cos_sim.return_value = torch.tensor([1.0, 0.5])
-        results, suggestion = search_events("concert")
-        for event in results:
-            self.assertEqual(event.event_type, "music")
-        self.assertEqual(suggestion, "concert")
+    def test_search_events_by_type_found(self):
+        results, suggestion = search_events("arts")
+        self.assertTrue(results)
+        # events of the best-matching type come first; other types are no longer cut off
+        self.assertEqual([event.event_type for event in results], ["arts", "arts", "academic"])
+        self.assertEqual(suggestion, "arts")
 
-    @patch('config.functions.model.encode')
-    @patch('config.functions.util.pytorch_cos_sim')
-    def test_search_events_no_event_types(self, mock_cos_sim, mock_encode):
+    def test_search_events_no_event_types(self):
         Event.objects.all().delete()
         results, suggestion = search_events("concert")
         self.assertEqual(results, [])
@@ -129,8 +121,9 @@ class SearchEventsTest(TestCase):
         self.assertIsNone(suggestion)
 
 
-class SearchSocietiesTest(TestCase):
+class SearchSocietiesTest(FakeModelMixin, TestCase):
     def setUp(self):
+        super().setUp()
         from django.contrib.auth import get_user_model
         User = get_user_model()
         self.manager = User.objects.create_user(
@@ -138,31 +131,44 @@ class SearchSocietiesTest(TestCase):
             first_name="Soc", last_name="Manager", preferred_name="SManager"
         )
         self.society1 = Society.objects.create(
-            name="Alpha Society", status="approved", society_type="alpha",
-            description="first society", manager=self.manager
+            name="Alpha Society", status="approved", society_type="sports",
+            description="first society", manager=self.manager, visibility="Public"
         )
         self.society2 = Society.objects.create(
-            name="Beta Society", status="approved", society_type="beta",
-            description="second society", manager=self.manager
+            name="Beta Society", status="approved", society_type="arts",
+            description="second society", manager=self.manager, visibility="Public"
         )
         self.society3 = Society.objects.create(
-            name="Gamma Society", status="approved", society_type="alpha",
-            description="third society", manager=self.manager
+            name="Gamma Society", status="approved", society_type="sports",
+            description="third society", manager=self.manager, visibility="Public"
         )
-
-    @patch('config.functions.model.encode')
-    @patch('config.functions.util.pytorch_cos_sim')
-    def test_search_societies_found(self, mock_cos_sim, mock_encode):
-        mock_encode.side_effect = lambda x, **kwargs: x  
-        mock_cos_sim.return_value = torch.tensor([0.9, 0.5])
-        results, suggestion = search_societies("alpha")
-        for soc in results:
-            self.assertEqual(soc.society_type.lower(), "alpha")
-        self.assertEqual(suggestion, "alpha")
-
-    @patch('config.functions.model.encode')
-    @patch('config.functions.util.pytorch_cos_sim')
-    def test_search_societies_no_types(self, mock_cos_sim, mock_encode):
+        index_missing("society")
+
+    def test_search_societies_found(self):
+        results, suggestion = search_societies("sports")
+        self.assertTrue(results)
+        # societies of the best-matching type come first; other types are no longer cut off
+        self.assertEqual([soc.society_type.lower() for soc in results], ["sports", "sports", "arts"])
+        self.assertEqual(suggestion, "sports")
+
+    def test_search_societies_post_filters_status(self):
+        self.society1.status = "pending"
+        self.society1.save()
+        self.society3.status = "rejected"
+        self.society3.save()
+        results, suggestion = search_societies("sports")
+        self.assertEqual(results, [self.society2])
+
+    def test_search_societies_only_considers_types_in_use(self):
+        Society.objects.filter(society_type="sports").delete()
+        results, suggestion = search_societies("sports")
+        self.assertEqual(results, [self.society2])
+
+    def test_search_societies_includes_text_matches(self):
+        results, suggestion = search_societies("beta")
+        self.assertEqual(results[0], self.society2)
+
+    def test_search_societies_no_types(self):
         Society.objects.all().delete()
         results, suggestion = search_societies("alpha")
         self.assertEqual(results, [])
@@ -171,4 +177,64 @@ class SearchSocietiesTest(TestCase):
     def test_search_societies_empty_query(self):
         results, suggestion = search_societies("")
         self.assertEqual(results, [])
-        self.assertIsNone(suggestion)
\ No newline at end of file
+        self.assertIsNone(suggestion)
+
+
+class SearchAllTest(FakeModelMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        User = get_user_model()
+        manager = User.objects.create_user(
+            email="all@test.com", password="test",
+            first_name="All", last_name="Manager", preferred_name="AManager"
+        )
+        self.society = Society.objects.create(
+            name="Chess Society", status="approved", society_type="social",
+            description="chess every week", manager=manager, visibility="Public"
+        )
+        self.event = Event.objects.create(
+            name="Chess Tournament", event_type="social", description="chess games",
+            keyword="chess", date=now()
+        )
+        self.news = News.objects.create(
+            title="Chess champions", content="our chess team won", society=self.society, is_published=True
+        )
+        News.objects.create(title="Chess draft", content="unpublished", society=self.society)
+        for kind in SEARCHABLE_MODELS:
+            index_missing(kind)
+
+    def test_groups_every_type(self):
+        results, suggestion = search_all("chess")
+        self.assertEqual(results["societies"], [self.society])
+        self.assertEqual(results["events"], [self.event])
+        self.assertEqual(results["news"], [self.news])
+        self.assertEqual(suggestion, "chess")
+
+    @patch("config.functions.correct_spelling", side_effect=lambda query: query)
+    def test_query_is_prepared_once(self, mock_correct):
+        search_all("chess")
+        mock_correct.assert_called_once()
+
+    def test_limit_is_per_type(self):
+        Event.objects.create(name="Chess Social", event_type="social", description="chess", date=now())
+        results, _ = search_all("chess", limit=1)
+        self.assertEqual(len(results["events"]), 1)
+        self.assertEqual(len(results["societies"]), 1)
+
+    def test_empty_query(self):
+        results, suggestion = search_all("")
+        self.assertEqual(results, {"societies": [], "events": [], "news": []})
+        self.assertIsNone(suggestion)
+
+
+# The same search suite against the lightweight backend
+class HashingSearchEventsTest(HashingBackendMixin, SearchEventsTest):
+    pass
+
+
+class HashingSearchSocietiesTest(HashingBackendMixin, SearchSocietiesTest):
+    pass
+
+
+class HashingSearchAllTest(HashingBackendMixin, SearchAllTest):
+    pass
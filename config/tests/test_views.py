@@ -1,10 +1,17 @@
 import json
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
 from django.http import HttpRequest
 from unittest.mock import patch, MagicMock
 from config.views import home, ai_search
 from collections import namedtuple
 from django.urls import reverse
+from django.utils.timezone import now
+from apps.events.models import Event
+from apps.search.cache import result_cache
+from apps.search.models import SearchQueryLog
+from apps.search.querylog import query_log
+from apps.search.results import PAGE_SIZE, load_result_set
+from apps.societies.models import Membership, MembershipStatus, Society
 
 class HomeViewTest(TestCase):
     def setUp(self):
@@ -51,31 +58,262 @@ class HomeViewTest(TestCase):
 class AISearchViewTest(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+        manager = User.objects.create_user(
+            email="search@example.com", password="password",
+            first_name="Search", last_name="Manager", preferred_name="Search"
+        )
+        self.soc1 = Society.objects.create(
+            name="Soc1", description="first", society_type="arts",
+            status="approved", visibility="Public", manager=manager
+        )
+        self.soc2 = Society.objects.create(
+            name="Soc2", description="second", society_type="arts",
+            status="approved", visibility="Public", manager=manager
+        )
+        self.event1 = Event.objects.create(
+            name="Event1", description="concert", date=now(),
+            event_type="arts", keyword="music", location="London"
+        )
+        self.event2 = Event.objects.create(
+            name="Event2", description="gig", date=now(),
+            event_type="arts", keyword="music", location="London"
+        )
 
     @patch('config.views.search_societies')
     def test_ai_search_societies_default(self, mock_search_societies):
-        fake_results = ['soc1', 'soc2']
+        fake_results = [self.soc2, self.soc1]
         fake_suggestion = 'try another term'
         mock_search_societies.return_value = (fake_results, fake_suggestion)
 
         response = self.client.get(reverse('ai_search') + '?q=example')
         self.assertEqual(response.status_code, 200)
         self.assertIn('societies', response.context)
-        self.assertEqual(response.context['societies'], fake_results)
+        self.assertEqual(list(response.context['societies']), fake_results)
         self.assertIn('suggestion', response.context)
         self.assertEqual(response.context['suggestion'], fake_suggestion)
         self.assertIn('page', response.context)
         self.assertEqual(response.context['page'], 'Search')
 
-    @patch('apps.events.models.Event')
-    def test_ai_search_events(self, mock_event):
-        fake_queryset = MagicMock()
-        fake_queryset.filter.return_value = ['event1', 'event2']
-        mock_event.objects.filter.return_value = fake_queryset.filter.return_value
+    @patch('config.views.search_events')
+    def test_ai_search_events(self, mock_search_events):
+        mock_search_events.return_value = ([self.event1, self.event2], 'concert')
 
         response = self.client.get(reverse('ai_search') + '?q=concert&search_type=events')
         self.assertEqual(response.status_code, 200)
         self.assertIn('events', response.context)
-        self.assertEqual(response.context['events'], ['event1', 'event2'])
+        self.assertEqual(list(response.context['events']), [self.event1, self.event2])
         self.assertIn('page', response.context)
-        self.assertEqual(response.context['page'], 'Search Results')
\ No newline at end of file
+        self.assertEqual(response.context['page'], 'Search Results')
+
+    @patch('config.views.search_societies')
+    def test_repeated_query_is_served_from_cache(self, mock_search_societies):
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+        hits = result_cache.hits
+
+        self.client.get(reverse('ai_search') + '?q=Example')
+        response = self.client.get(reverse('ai_search') + '?q=  example ')
+
+        mock_search_societies.assert_called_once()
+        self.assertEqual(list(response.context['societies']), [self.soc2, self.soc1])
+        self.assertEqual(response.context['suggestion'], 'example')
+        self.assertEqual(result_cache.hits, hits + 1)
+
+    @patch('config.views.search_events')
+    @patch('config.views.search_societies')
+    def test_cache_is_per_search_type(self, mock_search_societies, mock_search_events):
+        mock_search_societies.return_value = ([self.soc1], 'music')
+        mock_search_events.return_value = ([self.event1], 'music')
+
+        self.client.get(reverse('ai_search') + '?q=music')
+        response = self.client.get(reverse('ai_search') + '?q=music&search_type=events')
+
+        self.assertEqual(list(response.context['events']), [self.event1])
+        mock_search_events.assert_called_once()
+
+    @patch('config.views.search_societies')
+    def test_content_changes_invalidate_cache(self, mock_search_societies):
+        mock_search_societies.return_value = ([self.soc1], 'example')
+
+        self.client.get(reverse('ai_search') + '?q=example')
+        self.soc2.description = "changed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.soc2.save()
+        self.client.get(reverse('ai_search') + '?q=example')
+
+        self.assertEqual(mock_search_societies.call_count, 2)
+
+    @patch('config.views.search_societies')
+    def test_results_are_not_stored_in_session(self, mock_search_societies):
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+
+        response = self.client.get(reverse('ai_search') + '?q=example')
+
+        self.assertNotIn('search_ids', self.client.session)
+        self.assertEqual(load_result_set(response.context['results_token'], 'societies').ids,
+                         [self.soc2.id, self.soc1.id])
+        self.assertIsNone(response.context['next_url'])
+
+    @patch('config.views.search_societies')
+    def test_repeated_search_reuses_the_stored_results(self, mock_search_societies):
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+
+        first = self.client.get(reverse('ai_search') + '?q=example').context['results_token']
+        second = self.client.get(reverse('ai_search') + '?q=Example ').context['results_token']
+
+        self.assertEqual(first, second)
+        mock_search_societies.assert_called_once()
+
+    @patch('config.views.search_societies')
+    def test_society_results_show_membership(self, mock_search_societies):
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+        from django.contrib.auth import get_user_model
+        member = get_user_model().objects.create_user(
+            email="member@example.com", password="password",
+            first_name="Search", last_name="Member", preferred_name="Member"
+        )
+        Membership.objects.create(user=member, society=self.soc1, status=MembershipStatus.APPROVED)
+        self.client.force_login(member)
+
+        response = self.client.get(reverse('ai_search') + '?q=example')
+
+        states = {society.name: society.membership_state for society in response.context['societies']}
+        self.assertEqual(states, {'Soc1': 'member', 'Soc2': None})
+
+    @patch('config.views.search_societies')
+    def test_later_pages_come_from_the_stored_ranking(self, mock_search_societies):
+        extra = [
+            Society.objects.create(
+                name=f"Extra{i}", description="extra", society_type="arts",
+                status="approved", visibility="Public", manager=self.soc1.manager
+            )
+            for i in range(PAGE_SIZE)
+        ]
+        ranking = [self.soc2] + extra + [self.soc1]
+        mock_search_societies.return_value = (ranking, 'example')
+
+        response = self.client.get(reverse('ai_search') + '?q=example')
+        self.assertEqual(list(response.context['societies']), ranking[:PAGE_SIZE])
+
+        response = self.client.get(response.context['next_url'])
+        self.assertEqual(list(response.context['societies']), ranking[PAGE_SIZE:])
+        self.assertIsNone(response.context['next_url'])
+        mock_search_societies.assert_called_once()
+
+    @patch('config.views.search_societies')
+    def test_societies_page_filters_within_search_results(self, mock_search_societies):
+        self.soc1.society_type = "sports"
+        self.soc1.save()
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+        token = self.client.get(reverse('ai_search') + '?q=example').context['results_token']
+
+        response = self.client.get(reverse('societiespage'), {'results': token})
+        self.assertEqual(list(response.context['societies']), [self.soc2, self.soc1])
+
+        response = self.client.get(reverse('societiespage'), {'results': token, 'society_type': 'sports'})
+        self.assertEqual(list(response.context['societies']), [self.soc1])
+
+    @patch('config.views.search_all')
+    def test_search_everything_groups_results(self, mock_search_all):
+        mock_search_all.return_value = ({'societies': [self.soc1], 'events': [self.event1], 'news': []}, 'music')
+
+        response = self.client.get(reverse('search_all') + '?q=music')
+
+        self.assertTemplateUsed(response, 'search_all.html')
+        self.assertEqual(response.context['societies'], [self.soc1])
+        self.assertEqual(response.context['events'], [self.event1])
+        self.assertEqual(response.context['news'], [])
+
+    @patch('config.views.search_all')
+    def test_search_type_all_uses_unified_search(self, mock_search_all):
+        mock_search_all.return_value = ({'societies': [], 'events': [], 'news': []}, 'music')
+        response = self.client.get(reverse('ai_search') + '?q=music&search_type=all')
+        self.assertTemplateUsed(response, 'search_all.html')
+
+    @patch('config.views.search_all')
+    def test_search_everything_api(self, mock_search_all):
+        mock_search_all.return_value = ({'societies': [self.soc2], 'events': [self.event2], 'news': []}, 'music')
+
+        response = self.client.get(reverse('search_all_api'), {'q': 'music', 'limit': '3'})
+        data = response.json()
+
+        self.assertEqual(data['suggestion'], 'music')
+        self.assertEqual([s['id'] for s in data['societies']], [self.soc2.id])
+        self.assertEqual(data['societies'][0]['url'], reverse('society_page', args=[self.soc2.id]))
+        self.assertEqual([e['id'] for e in data['events']], [self.event2.id])
+        self.assertEqual(data['news'], [])
+        mock_search_all.assert_called_once_with('music', 3)
+
+    @patch('config.views.search_all')
+    def test_search_everything_limit_is_bounded_and_cached(self, mock_search_all):
+        mock_search_all.return_value = ({'societies': [], 'events': [], 'news': []}, 'music')
+
+        self.client.get(reverse('search_all_api'), {'q': 'music', 'limit': '500'})
+        self.client.get(reverse('search_all_api'), {'q': 'music', 'limit': '500'})
+        self.client.get(reverse('search_all_api'), {'q': 'music', 'limit': 'x'})
+
+        self.assertEqual(mock_search_all.call_args_list[0].args, ('music', 20))
+        self.assertEqual(mock_search_all.call_args_list[1].args, ('music', 5))
+        self.assertEqual(mock_search_all.call_count, 2)
+
+    def test_cache_stats_are_staff_only(self):
+        from django.contrib.auth import get_user_model
+        staff = get_user_model().objects.create_user(
+            email="staff@example.com", password="password",
+            first_name="Staff", last_name="User", preferred_name="Staff"
+        )
+        response = self.client.get(reverse('search_cache_stats'))
+        self.assertEqual(response.status_code, 302)
+
+        staff.is_staff = True
+        staff.save()
+        self.client.force_login(staff)
+        response = self.client.get(reverse('search_cache_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {"hits", "misses", "hit_rate", "version", "timeout"})
+
+    def test_inference_stats_are_staff_only(self):
+        from django.contrib.auth import get_user_model
+        staff = get_user_model().objects.create_user(
+            email="inference@example.com", password="password",
+            first_name="Staff", last_name="User", preferred_name="Staff"
+        )
+        response = self.client.get(reverse('search_inference_stats'))
+        self.assertEqual(response.status_code, 302)
+
+        staff.is_staff = True
+        staff.save()
+        self.client.force_login(staff)
+        response = self.client.get(reverse('search_inference_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("queue_depth", response.json())
+        self.assertIn("batch_sizes", response.json())
+
+    @override_settings(SEARCH_QUERY_LOG_FLUSH_SIZE=2)
+    @patch('config.views.search_societies')
+    def test_searches_are_logged_in_batches(self, mock_search_societies):
+        query_log.clear()
+        mock_search_societies.return_value = ([self.soc2, self.soc1], 'example')
+
+        self.client.get(reverse('ai_search') + '?q=Exmple')
+        self.assertEqual(SearchQueryLog.objects.count(), 0)
+        response = self.client.get(reverse('ai_search') + '?q=exmple')
+        # paging through the stored results is not another search
+        self.client.get(reverse('ai_search'), {'results': response.context['results_token'], 'after': 1})
+
+        first, second = SearchQueryLog.objects.order_by('id')
+        self.assertEqual((first.query, first.corrected_query, first.search_type), ('Exmple', 'example', 'societies'))
+        self.assertEqual(first.result_count, 2)
+        self.assertFalse(first.cache_hit)
+        self.assertTrue(second.cache_hit)
+        self.assertEqual(len(query_log), 0)
+
+    @override_settings(SEARCH_QUERY_LOG_FLUSH_SIZE=1)
+    @patch('config.views.search_all')
+    def test_unified_search_is_logged(self, mock_search_all):
+        query_log.clear()
+        mock_search_all.return_value = ({'societies': [self.soc1], 'events': [self.event1], 'news': []}, 'music')
+        self.client.get(reverse('search_all_api'), {'q': 'music'})
+        log = SearchQueryLog.objects.get()
+        self.assertEqual((log.search_type, log.result_count), ('all', 2))
@@ -20,7 +20,7 @@ from django.contrib import admin
 from django.urls import path, include
 from .views import home
 from pathlib import Path
-from .views import ai_search
+from .views import ai_search, search_cache_stats, search_inference_stats, search_everything, search_everything_api
 from apps.events.views import event_list
 BASE_DIR = Path(__file__).resolve().parent.parent  # ✅ Define BASE_DIR
 
@@ -33,8 +33,12 @@ urlpatterns = [
     path('panels/', include('apps.panels.urls')),
     path('users/', include('apps.users.urls')),
     path('search/', ai_search, name='ai_search'),
+    path('search/all/', search_everything, name='search_all'),
+    path('search/stats/', search_cache_stats, name='search_cache_stats'),
+    path('search/stats/inference/', search_inference_stats, name='search_inference_stats'),
     path('payments/', include('apps.payments.urls')),
     path('api/events/', event_list, name='event_list'),
+    path('api/search/', search_everything_api, name='search_all_api'),
     path('widgets/', include('apps.widgets.urls') )
 ]
 
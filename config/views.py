@@ -1,6 +1,19 @@
+import time
+
+from django.contrib.auth.decorators import user_passes_test
+from django.http import JsonResponse
 from django.shortcuts import render
-from .functions import search_societies, get_recent_news
-from apps.societies.functions import top_societies
+from django.urls import reverse
+from .functions import search_events, search_societies, search_all, get_recent_news, SEARCH_ALL_LIMIT
+from apps.events.models import Event
+from apps.search.batching import batcher
+from apps.search.cache import cached_grouped_search, cached_search, result_cache
+from apps.search.querylog import collect_stages, record_search
+from apps.search.results import (
+    load_result_set, page_url, parse_cursor, result_page, result_set_token, store_result_set,
+)
+from apps.societies.functions import attach_membership_states, top_societies
+from apps.societies.models import Society
 from apps.news.models import News
 
 def home(request):
@@ -22,42 +35,135 @@ def ai_search(request):
     """Handle the AI-powered search request."""
     query = request.GET.get('q', '')
     search_type = request.GET.get('search_type', 'societies')
+    after = parse_cursor(request.GET.get('after'))
 
-    # Initialize top_context at the start
+    if search_type == 'all':
+        return search_everything(request)
+    if search_type != 'events':
+        search_type = 'societies'
+    search, model = (search_events, Event) if search_type == 'events' else (search_societies, Society)
 
-    if search_type == 'events':
-        # Handle event search using the AI search function
-        from .functions import search_events
-        results, suggestion = search_events(query)
+    # Later pages come from the stored ranking instead of running the search again
+    result_set = load_result_set(request.GET.get('results'), search_type)
+    if result_set is None:
+        # Repeated queries are served from the cache; every search is logged for analytics
+        start = time.perf_counter()
+        with collect_stages() as timings:
+            results, suggestion, cache_hit = cached_search(query, search_type, search, model)
+        record_search(query, suggestion, search_type, len(results), cache_hit,
+                      (time.perf_counter() - start) * 1000, timings)
+        # repeats of the search share one stored result set
+        result_set = store_result_set(search_type, [obj.id for obj in results], suggestion,
+                                      token=result_set_token(query, search_type))
 
-        request.session['search_type'] = 'events'
-        request.session['search_ids'] = [e.id for e in results]
+    page, next_after = result_page(model.objects.all(), result_set.ids, after)
+    next_url = None
+    if next_after is not None:
+        next_url = page_url(request.path, request.GET, result_set.token, next_after)
 
-        recent_news = get_recent_news()
-        top_context = top_societies(request.user)
+    recent_news = get_recent_news()
+    top_context = top_societies(request.user)
 
+    if search_type == 'events':
         return render(request, 'events_search.html', {
-            'events': results,
+            'events': page,
             'page': 'Search Results',
-            'suggestion': suggestion,
+            'suggestion': result_set.suggestion,
             'search_type': 'events',
+            'results_token': result_set.token,
+            'next_url': next_url,
             'news_list': recent_news,
             **top_context,
         })
     else:
-        # Handle society search (default)
-        results, suggestion = search_societies(query)
-
-        request.session['search_type'] = 'societies'  # changed
-        request.session['search_ids'] = [s.id for s in results]
-
-        recent_news = get_recent_news()
-        top_context = top_societies(request.user)
-
+        # Handle society search (default); the cards show the user's membership of each society
+        attach_membership_states(page, request.user)
         return render(request, 'societies.html', {
-            'societies': results,
+            'societies': page,
             'page': 'Search',
-            'suggestion': suggestion,
+            'suggestion': result_set.suggestion,
+            'results_token': result_set.token,
+            'next_url': next_url,
             'news_list': recent_news,
             **top_context,
         })
+
+
+SEARCH_ALL_MODELS = {
+    'societies': Society,
+    'events': Event,
+    'news': News,
+}
+# Largest per-type limit a client may ask the unified search for
+SEARCH_ALL_MAX_LIMIT = 20
+
+
+def _search_all_results(request):
+    """Grouped results of the unified search for request's ?q= and ?limit=."""
+    query = request.GET.get('q', '')
+    try:
+        limit = min(max(int(request.GET.get('limit', SEARCH_ALL_LIMIT)), 1), SEARCH_ALL_MAX_LIMIT)
+    except ValueError:
+        limit = SEARCH_ALL_LIMIT
+    start = time.perf_counter()
+    with collect_stages() as timings:
+        groups, suggestion, cache_hit = cached_grouped_search(
+            query, f'all:{limit}', lambda q: search_all(q, limit), SEARCH_ALL_MODELS
+        )
+    record_search(query, suggestion, 'all', sum(len(results) for results in groups.values()), cache_hit,
+                  (time.perf_counter() - start) * 1000, timings)
+    return query, groups, suggestion
+
+
+def search_everything(request):
+    """Search societies, events and news at once and show the results grouped by type."""
+    query, groups, suggestion = _search_all_results(request)
+    return render(request, 'search_all.html', {
+        'query': query,
+        'societies': groups['societies'],
+        'events': groups['events'],
+        'news': groups['news'],
+        'suggestion': suggestion,
+        'page': 'Search Results',
+        'news_list': get_recent_news(),
+    })
+
+
+def search_everything_api(request):
+    """JSON version of search_everything."""
+    query, groups, suggestion = _search_all_results(request)
+    return JsonResponse({
+        'query': query,
+        'suggestion': suggestion,
+        'societies': [{
+            'id': society.id,
+            'name': society.name,
+            'society_type': society.society_type,
+            'url': reverse('society_page', args=[society.id]),
+        } for society in groups['societies']],
+        'events': [{
+            'id': event.id,
+            'name': event.name,
+            'event_type': event.event_type,
+            'date': event.date,
+            'location': event.location,
+        } for event in groups['events']],
+        'news': [{
+            'id': article.id,
+            'title': article.title,
+            'date_posted': article.date_posted,
+            'url': reverse('news_detail', args=[article.id]),
+        } for article in groups['news']],
+    })
+
+
+@user_passes_test(lambda user: user.is_staff)
+def search_cache_stats(request):
+    """Hit/miss counters of the search result cache across all workers, for sizing it."""
+    return JsonResponse(result_cache.stats())
+
+
+@user_passes_test(lambda user: user.is_staff)
+def search_inference_stats(request):
+    """Queue depth and batch sizes of this worker's query-encoding batcher."""
+    return JsonResponse(batcher.stats())
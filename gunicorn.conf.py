@@ -0,0 +1,30 @@
+"""
+Gunicorn settings, picked up automatically from the project root.
+
+The app is imported once in the master (preload_app) and the search caches
+are warmed there before workers are forked (`manage.py warm_caches`: the
+model, spelling dictionary and description indexes, the top societies and
+the most frequent recent searches), so every worker shares those pages
+copy-on-write instead of loading its own. Set SEARCH_WARM_UP=0 to skip the
+warm-up and load them lazily per worker, and SEARCH_WARM_QUERIES to change
+how many popular searches are replayed.
+"""
+import os
+
+preload_app = True
+
+
+def when_ready(server):
+    if os.environ.get("SEARCH_WARM_UP", "1") != "1":
+        return
+    from django.core.management import call_command
+    from django.db import connections
+    server.log.info("Warming up search caches before forking workers")
+    try:
+        call_command("warm_caches", queries=int(os.environ.get("SEARCH_WARM_QUERIES", 20)))
+    except Exception:
+        # warming is only an optimisation: start the workers anyway and let them load lazily
+        server.log.exception("Search cache warm-up failed; workers will warm lazily")
+    finally:
+        # workers must open their own database connections
+        connections.close_all()